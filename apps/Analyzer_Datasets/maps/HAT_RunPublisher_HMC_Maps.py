@@ -120,6 +120,12 @@ def main():
 
         # -------------------------------------------------------------------------------------
         # Driver and methods of dynamic datasets
+        alg_parallel = None
+        if 'parallel' in list(data_settings['algorithm'].keys()):
+            alg_parallel = data_settings['algorithm']['parallel']
+        alg_tiles = None
+        if 'tiles' in list(data_settings['algorithm'].keys()):
+            alg_tiles = data_settings['algorithm']['tiles']
         driver_data_dynamic = DriverDynamic(
             time_step,
             static_data_collection=static_data_collection,
@@ -131,6 +137,7 @@ def main():
             tmp_dict=data_settings['tmp'],
             alg_info=data_settings['algorithm']['info'],
             alg_template=data_settings['algorithm']['template'],
+            alg_parallel=alg_parallel, alg_tiles=alg_tiles,
             flag_cleaning_dynamic_src=data_settings['algorithm']['flags']['cleaning_dynamic_source'],
             flag_cleaning_dynamic_anl=data_settings['algorithm']['flags']['cleaning_dynamic_analysis'],
             flag_cleaning_dynamic_dst=data_settings['algorithm']['flags']['cleaning_dynamic_destination'],
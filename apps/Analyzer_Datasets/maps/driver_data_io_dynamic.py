@@ -16,6 +16,7 @@ import pandas as pd
 import xarray as xr
 
 from copy import deepcopy
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 from lib_analysis_fx import var_cmp_accumulated, var_cmp_average, var_cmp_instantaneous
 
@@ -47,7 +48,7 @@ class DriverDynamic:
                  src_dict, anc_dict=None, anl_dict=None, dst_dict=None, tmp_dict=None,
                  static_data_collection=None,
                  registry_data_collection=None,
-                 alg_info=None, alg_template=None,
+                 alg_info=None, alg_template=None, alg_parallel=None, alg_tiles=None,
                  tag_terrain_data='terrain', tag_river_network_data='river_network',
                  tag_colormap_graph_data='colormap', tag_table_graph_data='table_graph_lut',
                  tag_static_source='source', tag_static_destination='destination',
@@ -268,6 +269,26 @@ class DriverDynamic:
         self.workspace_values = 'datasets'
         self.workspace_attrs = 'attributes'
 
+        # parallel info (graph mode: 'serial' or 'process')
+        self.graph_mode, self.graph_workers = 'serial', 1
+        if alg_parallel is not None:
+            if 'graph_mode' in list(alg_parallel.keys()):
+                self.graph_mode = alg_parallel['graph_mode']
+            if 'graph_workers' in list(alg_parallel.keys()):
+                self.graph_workers = alg_parallel['graph_workers']
+        if self.graph_mode not in ['serial', 'process']:
+            log_stream.error(' ===> Graph mode "' + self.graph_mode + '" is not supported')
+            raise NotImplemented('Case not implemented yet')
+
+        # tiles info (background cache folder, size [MB] and offline mode)
+        self.graph_tiles_attrs = {}
+        if alg_tiles is not None:
+            for tiles_key, attrs_key in zip(
+                    ['cache_folder', 'cache_size', 'offline'],
+                    ['var_background_cache_folder', 'var_background_cache_size', 'var_background_offline']):
+                if tiles_key in list(alg_tiles.keys()) and alg_tiles[tiles_key] is not None:
+                    self.graph_tiles_attrs[attrs_key] = alg_tiles[tiles_key]
+
         # -------------------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------------------
@@ -903,6 +924,9 @@ class DriverDynamic:
 
         log_stream.info(' ----> Dump dynamic datasets [' + time_str + '] ... ')
 
+        graph_job_list = []
+        graph_errors, graph_n = {}, 0
+
         for (dst_type_key, dst_type_plot), dst_type_info, dst_type_datasets in zip(
                 dst_file_collections_plot.items(), dst_file_collections_info.values(),
                 dst_file_collections_datasets.values()):
@@ -973,6 +997,10 @@ class DriverDynamic:
                                         dict_attr_base=anl_info_attrs,
                                         dict_attr_list=[dst_info_attrs], dict_name_list=[self.dst_attrs_tag])
 
+                                    for tiles_key, tiles_value in self.graph_tiles_attrs.items():
+                                        if tiles_key not in list(dst_attrs_info[self.dst_attrs_tag].keys()):
+                                            dst_attrs_info[self.dst_attrs_tag][tiles_key] = tiles_value
+
                                     if 'var_temporal_window' in list(anl_info_attrs[self.anl_attrs_tag].keys()):
                                         dst_attrs_info[self.anl_attrs_tag]['var_temporal_window'] = anl_var_t_period
                                     else:
@@ -998,7 +1026,15 @@ class DriverDynamic:
 
                                     if isinstance(anl_var_darray, xr.DataArray):
 
-                                        driver_graph = DriverGraph(
+                                        # select the fx lut only (the job carries the map slice and attributes)
+                                        dst_fx_map = dst_fx_info[self.dst_fx_map_tag]
+                                        if isinstance(static_data_table_graph, dict) and \
+                                                dst_fx_map in list(static_data_table_graph.keys()):
+                                            dst_fx_table = {dst_fx_map: static_data_table_graph[dst_fx_map]}
+                                        else:
+                                            dst_fx_table = static_data_table_graph
+
+                                        graph_job = dict(
                                             file_name_graph=dst_file_path_plot,
                                             file_name_info=dst_file_path_info,
                                             file_name_datasets=dst_file_path_datasets,
@@ -1008,17 +1044,33 @@ class DriverDynamic:
                                             map_var_name_geo_x=self.dim_name_geo_x,
                                             map_var_name_geo_y=self.dim_name_geo_y,
                                             fx_name=dst_fx_info[self.dst_fx_name_tag],
-                                            fx_map=dst_fx_info[self.dst_fx_map_tag],
-                                            fx_table=static_data_table_graph,
+                                            fx_map=dst_fx_map,
+                                            fx_table=dst_fx_table,
                                             tag_src_attributes=self.src_attrs_tag,
                                             tag_anl_attributes=self.anl_attrs_tag,
                                             tag_dst_attributes=self.dst_attrs_tag
                                         )
 
-                                        driver_graph.compute_data()
+                                        if self.graph_mode == 'process':
+
+                                            graph_job_list.append(graph_job)
+
+                                            log_stream.info(' -------> Period "' +
+                                                            anl_var_t_period + '"  ... QUEUED')
+                                        else:
 
-                                        log_stream.info(' -------> Period "' +
-                                                        anl_var_t_period + '"  ... DONE')
+                                            # render the graph (errors are collected for each file)
+                                            graph_error = render_graph_job(graph_job)
+                                            graph_n += 1
+                                            if graph_error is None:
+                                                log_stream.info(' -------> Period "' +
+                                                                anl_var_t_period + '"  ... DONE')
+                                            else:
+                                                log_stream.error(' ===> File "' + dst_file_path_plot +
+                                                                 '" failed: ' + graph_error)
+                                                log_stream.info(' -------> Period "' +
+                                                                anl_var_t_period + '"  ... FAILED')
+                                                graph_errors[dst_file_path_plot] = graph_error
                                     else:
                                         log_stream.warning(' ===> Plot data failed due to not completed data obj')
                                         log_stream.info(
@@ -1044,10 +1096,67 @@ class DriverDynamic:
                 log_stream.info(' -----> Dataset == Ref: "' + dst_type_key +
                                 '" ... SKIPPED. Datasets are not available')
 
+        # render the queued graph(s) (process mode) or report the rendered graph(s) (serial mode)
+        if graph_job_list:
+            self.render_graph_jobs(graph_job_list)
+        elif graph_n > 0:
+            self.report_graph_errors(graph_errors, graph_n)
+
         log_stream.info(' ----> Dump dynamic datasets [' + time_str + '] ... DONE')
 
     # -------------------------------------------------------------------------------------
 
+    # -------------------------------------------------------------------------------------
+    # Method to render graph jobs in a process pool (errors are collected for each file)
+    def render_graph_jobs(self, graph_job_list):
+
+        graph_workers = self.graph_workers
+        if graph_workers is None:
+            graph_workers = os.cpu_count()
+        graph_workers = max(1, min(graph_workers, len(graph_job_list)))
+
+        log_stream.info(' -----> Render graphs (' + str(len(graph_job_list)) + ' files - ' +
+                        str(graph_workers) + ' workers) ... ')
+
+        graph_errors = {}
+        with ProcessPoolExecutor(max_workers=graph_workers) as graph_pool:
+            graph_futures = {graph_pool.submit(render_graph_job, graph_job): graph_job['file_name_graph']
+                             for graph_job in graph_job_list}
+            for graph_future in as_completed(graph_futures):
+                graph_file = graph_futures[graph_future]
+                try:
+                    graph_error = graph_future.result()
+                except Exception as graph_exc:
+                    graph_error = repr(graph_exc)
+                if graph_error is None:
+                    log_stream.info(' ------> File "' + graph_file + '" ... DONE')
+                else:
+                    log_stream.error(' ===> File "' + graph_file + '" failed: ' + graph_error)
+                    log_stream.info(' ------> File "' + graph_file + '" ... FAILED')
+                    graph_errors[graph_file] = graph_error
+
+        self.report_graph_errors(graph_errors, len(graph_job_list))
+
+        return graph_errors
+
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to report the graph errors collected for each file (serial and process mode)
+    @staticmethod
+    def report_graph_errors(graph_errors, graph_n):
+
+        if graph_errors:
+            log_stream.warning(' ===> Render graphs failed for ' + str(len(graph_errors)) + ' of ' +
+                               str(graph_n) + ' files')
+            for graph_file, graph_error in graph_errors.items():
+                log_stream.warning(' ===> File "' + graph_file + '" :: ' + graph_error)
+            log_stream.info(' -----> Render graphs ... DONE WITH ERRORS')
+        else:
+            log_stream.info(' -----> Render graphs ... DONE')
+
+    # -------------------------------------------------------------------------------------
+
     # -------------------------------------------------------------------------------------
     # Method to merge attributes objects
     @staticmethod
@@ -1484,3 +1593,16 @@ class DriverDynamic:
     # -------------------------------------------------------------------------------------
 
 # -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to render a graph job (process worker; the error is returned instead of raised)
+def render_graph_job(graph_job):
+    try:
+        driver_graph = DriverGraph(**graph_job)
+        driver_graph.compute_data()
+        graph_error = None
+    except Exception as graph_exc:
+        graph_error = repr(graph_exc)
+    return graph_error
+# -------------------------------------------------------------------------------------
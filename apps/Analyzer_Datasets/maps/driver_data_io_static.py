@@ -215,8 +215,8 @@ class DriverStatic:
             log_stream.info(' ----> Organize static datasets ... DONE')
 
         else:
-            # Read info datasets
-            static_data_collections = read_obj(file_path_info)
+            # Read info datasets (grids mapped in memory and shared by the processes using the same file)
+            static_data_collections = read_obj(file_path_info, file_mmap=True)
             # Info end
             log_stream.info(' ----> Organize static datasets ... LOADED. Info datasets created previously')
 
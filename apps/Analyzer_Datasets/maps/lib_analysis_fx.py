@@ -104,10 +104,10 @@ def select_temporal_darray(time_reference, var_darray, var_time_period):
 
 
 # -------------------------------------------------------------------------------------
-# Method to compute accumulated variable
-def var_cmp_accumulated(var_time, var_darray_src, var_darray_terrain,
-                        var_temporal_window=None, var_temporal_direction=None,
-                        var_coord_time='time'):
+# Method to compute the temporal windows of a variable (sorted once and cumulated along time)
+def var_cmp_temporal_window(var_time, var_darray_src, var_darray_terrain,
+                            var_temporal_window=None, var_temporal_direction=None,
+                            var_coord_time='time', var_method='sum', var_tag='acc'):
 
     if var_temporal_window is None:
         var_temporal_window = ['3H']
@@ -115,118 +115,123 @@ def var_cmp_accumulated(var_time, var_darray_src, var_darray_terrain,
     if var_temporal_direction is None:
         var_temporal_direction = 'right'
 
-    var_collection_cmp = {}
+    if var_temporal_direction not in ['left', 'right']:
+        log_stream.error(' ===> Temporal direction "' + var_temporal_direction + '" flag is not allowed')
+        raise IOError('Available flags for temporal direction are: right and left')
+    if var_method not in ['sum', 'mean']:
+        log_stream.error(' ===> Temporal method "' + var_method + '" flag is not allowed')
+        raise IOError('Available flags for temporal method are: sum and mean')
+
+    # sort the datasets once (ascending time)
+    var_time_period = pd.DatetimeIndex(var_darray_src[var_coord_time].values)
+    if var_time_period.is_monotonic_increasing:
+        var_darray_sorted = var_darray_src
+    else:
+        var_darray_sorted = var_darray_src.sortby(var_coord_time, ascending=True)
+        var_time_period = pd.DatetimeIndex(var_darray_sorted[var_coord_time].values)
+
+    # define the time steps of each temporal window
+    var_window_collection = {}
     for var_t_win in var_temporal_window:
 
         var_t_period, var_t_frequency = split_temporal_window(var_t_win)
 
         if var_temporal_direction == 'left':
+            var_time_flag = verify_temporal_window(var_time, var_time_period[::-1], var_t_period)
+        else:
+            var_time_flag = verify_temporal_window(var_time, var_time_period, var_t_period)
 
-            var_darray_sorted = var_darray_src.sortby(var_coord_time, ascending=False)
-
-            # var_time_end = pd.Timestamp(var_darray_sorted[var_coord_time].values[0]).strftime(time_format_algorithm)
-            # var_time_range = pd.date_range(end=var_time_end, periods=var_t_period, freq=var_t_frequency)
-            # var_time_start = var_time_range[0].strftime(time_format_algorithm)
-
-            var_time_flag = verify_temporal_window(var_time, var_darray_sorted[var_coord_time].values, var_t_period)
-
-            if var_time_flag:
-
-                var_darray_selected = select_temporal_darray(var_time, var_darray_sorted,
-                                                             var_darray_sorted[var_coord_time].values)
-
-                if var_time_flag and (var_darray_selected is not None):
-
-                    var_time_end = pd.Timestamp(var_darray_selected[var_coord_time].values[0]).strftime(time_format_algorithm)
-                    var_time_range = pd.date_range(end=var_time_end, periods=var_t_period, freq=var_t_frequency)
-                    var_time_start = var_time_range[0].strftime(time_format_algorithm)
-                    var_darray_tmp = var_darray_sorted.sel(time=slice(var_time_end, var_time_start))
-                else:
-                    log_stream.warning(
-                        ' ===> Data array is not selected due to a temporal mismatch - acc case left')
-                    var_darray_tmp = None
+        if var_time_flag:
 
+            if var_temporal_direction == 'left':
+                var_time_end = pd.Timestamp(var_time).strftime(time_format_algorithm)
+                var_time_range = pd.date_range(end=var_time_end, periods=var_t_period, freq=var_t_frequency)
+                var_time_start = var_time_range[0].strftime(time_format_algorithm)
             else:
-                log_stream.warning(
-                    ' ===> Data array is not selected due to the lacking of some expected time steps - acc case left')
-                var_darray_tmp = None
+                var_time_start = pd.Timestamp(var_time).strftime(time_format_algorithm)
+                var_time_end = pd.date_range(start=var_time_start, periods=var_t_period,
+                                             freq=var_t_frequency)[-1].strftime(time_format_algorithm)
 
-        elif var_temporal_direction == 'right':
+            var_idx_start, var_idx_end, _ = var_time_period.slice_indexer(
+                var_time_start, var_time_end).indices(var_time_period.shape[0])
 
-            var_darray_sorted = var_darray_src.sortby(var_coord_time, ascending=True)
+            var_window_collection[var_t_win] = [var_time_start, var_time_end, var_idx_start, var_idx_end]
 
-            # var_time_start = pd.Timestamp(var_darray_sorted[var_coord_time].values[0]).strftime(time_format_algorithm)
-            # var_time_end = pd.date_range(
-            #    start=var_time_start, periods=var_t_period, freq=var_t_frequency)[-1].strftime(time_format_algorithm)#
+        else:
+            log_stream.warning(
+                ' ===> Data array is not selected due to the lacking of some expected time steps - ' +
+                var_tag + ' case ' + var_temporal_direction)
+            var_window_collection[var_t_win] = None
+
+    var_window_list = [var_window for var_window in var_window_collection.values() if var_window is not None]
+    if not var_window_list:
+        return var_window_collection
+
+    # compute the cumulative sums along time over the steps used by the windows
+    # (nan values are skipped as in the xarray sum and mean)
+    var_span_start = min([var_window[2] for var_window in var_window_list])
+    var_span_end = max([var_window[3] for var_window in var_window_list])
+
+    var_axis_time = var_darray_sorted.get_axis_num(var_coord_time)
+    var_values = np.moveaxis(var_darray_sorted.values, var_axis_time, 0)[var_span_start:var_span_end]
+
+    var_cumsum = np.zeros([var_values.shape[0] + 1] + list(var_values.shape[1:]), dtype=np.float64)
+    np.cumsum(np.nan_to_num(var_values, nan=0.0), axis=0, out=var_cumsum[1:])
+    var_cumcount = None
+    if var_method == 'mean':
+        var_cumcount = np.zeros(var_cumsum.shape, dtype=np.int32)
+        np.cumsum(~np.isnan(var_values), axis=0, out=var_cumcount[1:])
+
+    if np.issubdtype(var_darray_sorted.dtype, np.floating):
+        var_dtype = var_darray_sorted.dtype
+    else:
+        var_dtype = np.float64
 
-            var_time_flag = verify_temporal_window(var_time, var_darray_sorted[var_coord_time].values, var_t_period)
+    # define terrain mask and data array template once
+    var_mask_terrain = np.isfinite(var_darray_terrain.values)
+    var_darray_template = var_darray_sorted.isel({var_coord_time: 0}, drop=True)
 
-            if var_time_flag:
-                var_darray_selected = select_temporal_darray(var_time, var_darray_sorted,
-                                                             var_darray_sorted[var_coord_time].values)
+    var_collection_cmp = {}
+    for var_t_win, var_window in var_window_collection.items():
 
-                if var_time_flag and (var_darray_selected is not None):
-                    var_time_start = pd.Timestamp(var_darray_selected[var_coord_time].values[0]).strftime(time_format_algorithm)
-                    var_time_end = pd.date_range(start=var_time_start, periods=var_t_period,
-                                                 freq=var_t_frequency)[-1].strftime(time_format_algorithm)
+        if var_window is not None:
 
-                    var_darray_tmp = var_darray_sorted.sel(time=slice(var_time_start, var_time_end))
-                else:
-                    log_stream.warning(
-                        ' ===> Data array is not selected due to a temporal mismatch - acc case right')
-                    var_darray_tmp = None
+            var_time_start, var_time_end, var_idx_start, var_idx_end = var_window
+            var_idx_start, var_idx_end = var_idx_start - var_span_start, var_idx_end - var_span_start
 
-            else:
-                log_stream.warning(
-                    ' ===> Data array is not selected due to the lacking of some expected time steps - acc case right')
-                var_darray_tmp = None
+            # window as difference of two cumulative slices
+            var_values_win = var_cumsum[var_idx_end] - var_cumsum[var_idx_start]
+            if var_method == 'mean':
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    var_values_win = var_values_win / (var_cumcount[var_idx_end] - var_cumcount[var_idx_start])
+            var_values_win = np.where(var_mask_terrain, var_values_win.astype(var_dtype), np.nan)
 
-        else:
-            log_stream.error(' ===> Temporal direction "' + var_temporal_direction + '" flag is not allowed')
-            raise IOError('Available flags for temporal direction are: right, left and center')
+            var_darray_masked = var_darray_template.copy(data=var_values_win)
+
+            var_attrs_masked = var_darray_masked.attrs
+            var_attrs_time = {'time_from': pd.Timestamp(var_time_start), 'time_to': pd.Timestamp(var_time_end),
+                              'time_window': var_t_win, 'time_direction': var_temporal_direction}
+            var_darray_masked.attrs = {**var_attrs_masked, **var_attrs_time}
 
-        if var_darray_tmp is not None:
-            var_darray_accumulated = var_darray_tmp.sum('time')
-            var_darray_masked = var_darray_accumulated.where(np.isfinite(var_darray_terrain.values), np.nan)
         else:
             var_darray_masked = None
 
-        if var_darray_masked is not None:
-            if isinstance(var_darray_masked, xr.DataArray):
-
-                var_attrs_masked = var_darray_masked.attrs
-
-                var_attrs_time = {'time_from': pd.Timestamp(var_time_start), 'time_to': pd.Timestamp(var_time_end),
-                                  'time_window': var_t_win, 'time_direction': var_temporal_direction}
-                var_attrs_tmp = {**var_attrs_masked, **var_attrs_time}
-
-                var_darray_masked.attrs = var_attrs_tmp
+        var_collection_cmp[var_t_win] = var_darray_masked
 
-            else:
-                log_stream.error(' ===> Analysis object must be in DataArray format.')
-                raise RuntimeError('Check the procedure to analyze the datasets.')
+    return var_collection_cmp
+# -------------------------------------------------------------------------------------
 
-        var_collection_cmp[var_t_win] = var_darray_masked
 
-        '''
-        # Debug
-        import matplotlib.pylab as plt
-        plt.figure()
-        plt.imshow(var_darray_masked.values)
-        plt.colorbar()
+# -------------------------------------------------------------------------------------
+# Method to compute accumulated variable
+def var_cmp_accumulated(var_time, var_darray_src, var_darray_terrain,
+                        var_temporal_window=None, var_temporal_direction=None,
+                        var_coord_time='time'):
 
-        plt.figure()
-        plt.imshow(var_darray_terrain)
-        plt.colorbar()
-        plt.show()
-        
-        import matplotlib.pylab as plt
-        plt.figure()
-        plt.imshow(var_darray_masked.values)
-        plt.colorbar()
-        plt.clim(0, 100)
-        plt.show()
-        '''
+    var_collection_cmp = var_cmp_temporal_window(
+        var_time, var_darray_src, var_darray_terrain,
+        var_temporal_window=var_temporal_window, var_temporal_direction=var_temporal_direction,
+        var_coord_time=var_coord_time, var_method='sum', var_tag='acc')
 
     return var_collection_cmp
 # -------------------------------------------------------------------------------------
@@ -238,115 +243,10 @@ def var_cmp_average(var_time, var_darray_src, var_darray_terrain,
                     var_temporal_window=None, var_temporal_direction=None,
                     var_coord_time='time'):
 
-    if var_temporal_window is None:
-        var_temporal_window = ['3H']
-
-    if var_temporal_direction is None:
-        var_temporal_direction = 'right'
-
-    var_collection_cmp = {}
-    for var_t_win in var_temporal_window:
-
-        var_t_period, var_t_frequency = split_temporal_window(var_t_win)
-
-        if var_temporal_direction == 'left':
-
-            var_darray_sorted = var_darray_src.sortby(var_coord_time, ascending=False)
-
-            # var_time_end = pd.Timestamp(var_darray_sorted[var_coord_time].values[0]).strftime(time_format_algorithm)
-            # var_time_range = pd.date_range(end=var_time_end, periods=var_t_period, freq=var_t_frequency)
-            # var_time_start = var_time_range[0].strftime(time_format_algorithm)
-
-            var_time_flag = verify_temporal_window(var_time, var_darray_sorted[var_coord_time].values, var_t_period)
-
-            if var_time_flag:
-                var_darray_selected = select_temporal_darray(var_time, var_darray_sorted,
-                                                             var_darray_sorted[var_coord_time].values)
-
-                if var_time_flag and (var_darray_selected is not None):
-                    var_time_end = pd.Timestamp(
-                        var_darray_selected[var_coord_time].values[0]).strftime(time_format_algorithm)
-                    var_time_range = pd.date_range(end=var_time_end, periods=var_t_period, freq=var_t_frequency)
-                    var_time_start = var_time_range[0].strftime(time_format_algorithm)
-                    var_darray_tmp = var_darray_sorted.sel(time=slice(var_time_end, var_time_start))
-                else:
-                    log_stream.warning(
-                        ' ===> Data array is not selected due to a temporal mismatch - avg case - left')
-                    var_darray_tmp = None
-
-            else:
-                log_stream.warning(
-                    ' ===> Data array is not selected due to the lacking of some expected time steps - avg case left')
-                var_darray_tmp = None
-
-        elif var_temporal_direction == 'right':
-
-            var_darray_sorted = var_darray_src.sortby(var_coord_time, ascending=True)
-
-            # var_time_start = pd.Timestamp(var_darray_sorted[var_coord_time].values[0]).strftime(time_format_algorithm)
-            # var_time_end = pd.date_range(start=var_time_start, periods=var_t_period,
-            # freq=var_t_frequency)[-1].strftime(time_format_algorithm)
-
-            var_time_flag = verify_temporal_window(var_time, var_darray_sorted[var_coord_time].values, var_t_period)
-
-            if var_time_flag:
-                var_darray_selected = select_temporal_darray(var_time, var_darray_sorted,
-                                                             var_darray_sorted[var_coord_time].values)
-
-                if var_time_flag and (var_darray_selected is not None):
-                    var_time_start = pd.Timestamp(
-                        var_darray_selected[var_coord_time].values[0]).strftime(time_format_algorithm)
-                    var_time_end = pd.date_range(start=var_time_start, periods=var_t_period,
-                                                 freq=var_t_frequency)[-1].strftime(time_format_algorithm)
-
-                    var_darray_tmp = var_darray_sorted.sel(time=slice(var_time_start, var_time_end))
-                else:
-                    log_stream.warning(
-                        ' ===> Data array is not selected due to a temporal mismatch - avg case right')
-                    var_darray_tmp = None
-
-            else:
-                log_stream.warning(
-                    ' ===> Data array is not selected due to the lacking of some expected time steps - avg case right')
-                var_darray_tmp = None
-        else:
-            log_stream.error(' ===> Temporal direction "' + var_temporal_direction + '" flag is not allowed')
-            raise IOError('Available flags for temporal direction are: right and left')
-
-        if var_darray_tmp is not None:
-            var_darray_average = var_darray_tmp.mean('time')
-            var_darray_masked = var_darray_average.where(np.isfinite(var_darray_terrain.values), np.nan)
-        else:
-            var_darray_masked = None
-
-        if var_darray_masked is not None:
-            if isinstance(var_darray_masked, xr.DataArray):
-
-                var_attrs_masked = var_darray_masked.attrs
-
-                var_attrs_time = {'time_from': pd.Timestamp(var_time_start), 'time_to': pd.Timestamp(var_time_end),
-                                  'time_window': var_t_win, 'time_direction': var_temporal_direction}
-                var_attrs_tmp = {**var_attrs_masked, **var_attrs_time}
-
-                var_darray_masked.attrs = var_attrs_tmp
-
-            else:
-                log_stream.error(' ===> Analysis object must be in DataArray format.')
-                raise RuntimeError('Check the procedure to analyze the datasets.')
-
-        var_collection_cmp[var_t_win] = var_darray_masked
-
-        '''
-        # Debug
-        plt.figure()
-        plt.imshow(var_darray_masked.values)
-        plt.colorbar()
-
-        plt.figure()
-        plt.imshow(var_darray_terrain)
-        plt.colorbar()
-        plt.show()
-        '''
+    var_collection_cmp = var_cmp_temporal_window(
+        var_time, var_darray_src, var_darray_terrain,
+        var_temporal_window=var_temporal_window, var_temporal_direction=var_temporal_direction,
+        var_coord_time=var_coord_time, var_method='mean', var_tag='avg')
 
     return var_collection_cmp
 # -------------------------------------------------------------------------------------
@@ -10,6 +10,7 @@ Version:       '3.0.0'
 # Library
 import logging
 import gzip
+import shutil
 
 from lib_info_args import logger_name
 
@@ -19,17 +20,24 @@ log_stream = logging.getLogger(logger_name)
 
 
 # --------------------------------------------------------------------------------
-# Method to unzip file
-def unzip_filename(file_name_zip, file_name_unzip):
+# Method to unzip file (streamed in chunks to bound the memory footprint)
+def unzip_filename(file_name_zip, file_name_unzip, chunk_size=16 * 1024 * 1024):
 
-    file_handle_zip = gzip.GzipFile(file_name_zip, "rb")
-    file_handle_unzip = open(file_name_unzip, "wb")
+    with gzip.open(file_name_zip, 'rb') as file_handle_zip:
+        with open(file_name_unzip, 'wb') as file_handle_unzip:
+            shutil.copyfileobj(file_handle_zip, file_handle_unzip, chunk_size)
 
-    file_data_unzip = file_handle_zip.read()
-    file_handle_unzip.write(file_data_unzip)
+# --------------------------------------------------------------------------------
 
-    file_handle_zip.close()
-    file_handle_unzip.close()
+
+# --------------------------------------------------------------------------------
+# Method to unzip file in memory
+def unzip_filename_memory(file_name_zip):
+
+    with gzip.open(file_name_zip, 'rb') as file_handle_zip:
+        file_data_unzip = file_handle_zip.read()
+
+    return file_data_unzip
 
 # --------------------------------------------------------------------------------
 
@@ -13,13 +13,14 @@ import os
 
 from copy import deepcopy
 
+import netCDF4
 import numpy as np
 import xarray as xr
 import pandas as pd
 
 from lib_utils_io import read_obj
 from lib_data_io_generic import create_darray
-from lib_data_io_gzip import unzip_filename
+from lib_data_io_gzip import unzip_filename, unzip_filename_memory
 from lib_utils_zip import remove_zip_extension
 from lib_info_args import zip_extension, time_format_algorithm, logger_name
 
@@ -48,18 +49,43 @@ def merge_file_gridded(file_list_in,
     if var_dim_order_3d is None:
         var_dim_order_3d = [var_dim_y, var_dim_x, var_dim_time]
 
+    # collect the time axis of each file (buffers are sized from the sorted and unique time steps)
+    obj_collections = []
     time_collections = []
-    var_collections_obj = {}
-    var_collections_attrs = {}
-    var_terrain_darray = None
     for file_step_in in file_list_in:
 
         obj_in = read_obj(file_step_in)
 
+        time_obj_in = obj_in[tag_field_datasets][var_dim_time]
+        if time_obj_in.shape.__len__() == 0:
+            time_values_in = [time_obj_in.values]
+        elif time_obj_in.shape[0] > 0:
+            time_values_in = list(time_obj_in.values)
+        else:
+            log_stream.error(' ===> Variable time steps are equal to zero')
+            raise IOError('Variable time must be greater than 0')
+
+        obj_collections.append(obj_in)
+        time_collections.append(pd.DatetimeIndex(time_values_in))
+
+    # time index sorted and without duplicates (as aligned by the merge of the datasets)
+    datetime_idx_collections = time_collections[0].append(time_collections[1:]).unique().sort_values()
+    datetime_idx_duplicated = datetime_idx_collections.shape[0] < sum(
+        [time_idx.shape[0] for time_idx in time_collections])
+    time_n = datetime_idx_collections.shape[0]
+
+    # buffers (y, x, time) allocated once for each variable and filled at the time positions of each file
+    var_collections_buffer = {}
+    var_collections_obj = {}
+    var_collections_attrs = {}
+    var_terrain_darray = None
+    for obj_id, obj_in in enumerate(obj_collections):
+
         dset_in = obj_in[tag_field_datasets]
         attrs_in = obj_in[tag_field_attrs]
 
-        time_obj_in = dset_in[var_dim_time]
+        time_idx_in = time_collections[obj_id]
+        time_pos_in = datetime_idx_collections.get_indexer(time_idx_in)
 
         var_name_list = list(dset_in.data_vars)
 
@@ -80,57 +106,46 @@ def merge_file_gridded(file_list_in,
                 log_stream.error(' ===> Terrain variable is not defined in the DataSet')
                 raise IOError('Terrain variable must be defined in the DataSet')
 
-        if time_obj_in.shape[0] == 1:
-
-            time_values_in = time_obj_in.values[0]
-
-            time_stamp_in = pd.Timestamp(time_values_in).strftime(time_format_algorithm)
-            datetime_idx_in = pd.DatetimeIndex([time_values_in])
+        time_stamp_in = time_idx_in[0].strftime(time_format_algorithm)
+        if time_idx_in.shape[0] > 1:
+            time_stamp_in = time_stamp_in + ' :: ' + time_idx_in[-1].strftime(time_format_algorithm)
 
-            log_stream.info(' --------> Collect time "' + time_stamp_in + '" ... ')
+        log_stream.info(' --------> Collect time "' + time_stamp_in + '" ... ')
 
-            for var_name_step in var_name_list:
-                if var_name_step != var_name_terrain:
-
-                    var_darray = dset_in[var_name_step]
-                    var_darray = var_darray.expand_dims(time=datetime_idx_in, axis=-1)
-
-                    attr_darray = attrs_in[var_name_step]
-
-                    if var_name_step not in list(var_collections_obj):
-                        var_collections_obj[var_name_step] = var_darray
-                        var_collections_attrs[var_name_step] = attr_darray
-                    else:
-                        tmp_darray = var_collections_obj[var_name_step]
-                        merge_darray = xr.merge([tmp_darray, var_darray])
-                        var_collections_obj[var_name_step] = merge_darray
+        for var_name_step in var_name_list:
+            if var_name_step != var_name_terrain:
 
-            time_collections.append(time_values_in)
+                var_darray = dset_in[var_name_step]
+                attr_darray = attrs_in[var_name_step]
 
-            log_stream.info(' --------> Collect time "' + time_stamp_in + '" ... DONE')
-
-        elif time_obj_in.shape[0] > 1:
-
-            time_collections = []
-            for time_value in time_obj_in.values:
-                time_collections.append(time_value)
-
-            for var_name_step in var_name_list:
-                if var_name_step != var_name_terrain:
-
-                    var_darray = dset_in[var_name_step]
-                    attr_darray = attrs_in[var_name_step]
+                # time slice(s) of the file with time as last dimension
+                if var_dim_time in var_darray.dims:
+                    var_darray = var_darray.transpose(..., var_dim_time)
+                    var_values = var_darray.values
+                    var_darray = var_darray.isel({var_dim_time: 0}, drop=True)
+                else:
+                    var_values = var_darray.values[..., np.newaxis]
 
+                if var_name_step not in list(var_collections_buffer.keys()):
+                    var_buffer = np.zeros(shape=list(var_darray.shape) + [time_n], dtype=np.float32)
+                    var_buffer[...] = np.nan
+                    var_collections_buffer[var_name_step] = var_buffer
                     var_collections_obj[var_name_step] = var_darray
                     var_collections_attrs[var_name_step] = attr_darray
 
-        else:
-            log_stream.error(' ===> Variable time steps are equal to zero')
-            raise IOError('Variable time must be greater than 0')
+                # fill the time slice(s) (overlapping steps are filled only by the defined values)
+                var_buffer = var_collections_buffer[var_name_step]
+                if datetime_idx_duplicated:
+                    var_values = np.where(np.isnan(var_values), var_buffer[..., time_pos_in], var_values)
+                var_buffer[..., time_pos_in] = var_values
+
+        log_stream.info(' --------> Collect time "' + time_stamp_in + '" ... DONE')
+
+        # release the file datasets
+        obj_collections[obj_id] = None
 
     # Compose DataSet
     log_stream.info(' --------> Compose unique datasets  ... ')
-    datetime_idx_collections = pd.DatetimeIndex(time_collections)
 
     var_dset_collections = xr.Dataset(coords={var_coord_time: ([var_dim_time], datetime_idx_collections)})
     var_dset_collections.coords[var_coord_time] = var_dset_collections.coords[var_coord_time].astype('datetime64[ns]')
@@ -142,13 +157,13 @@ def merge_file_gridded(file_list_in,
     for var_key, var_obj in var_collections_obj.items():
         var_attrs = var_collections_attrs[var_key]
 
-        if isinstance(var_obj, xr.Dataset):
-            var_darray = var_obj[var_key]
-        elif isinstance(var_obj, xr.DataArray):
-            var_darray = deepcopy(var_obj)
-        else:
-            log_stream.error(' ===> Variable obj format is not allowed')
-            raise IOError('Variable obj format must be DataArray or DataSet')
+        # build the (y, x, time) DataArray from the buffer (one step for each collected time)
+        var_buffer = var_collections_buffer[var_key]
+        var_coords = {coord_key: coord_obj for coord_key, coord_obj in var_obj.coords.items()
+                      if var_dim_time not in coord_obj.dims and coord_key != var_coord_time}
+        var_coords[var_coord_time] = ([var_dim_time], datetime_idx_collections)
+        var_darray = xr.DataArray(var_buffer, dims=list(var_obj.dims) + [var_dim_time],
+                                  coords=var_coords, name=var_key)
 
         var_dset_collections[var_key] = var_darray
         var_dset_collections[var_key].attrs = var_attrs
@@ -381,13 +396,20 @@ def organize_file_gridded(data_time_step, data_file_dset, data_file_variables,
 
 # -------------------------------------------------------------------------------------
 # Method to read netcdf gridded file
-def read_file_gridded(file_path, folder_name_tmp=None, clean_tmp=True):
+def read_file_gridded(file_path, folder_name_tmp=None, clean_tmp=True, file_memory=True):
 
     if folder_name_tmp is None:
         folder_name_tmp = '/tmp'
 
     if os.path.exists(file_path):
         if file_path.endswith(zip_extension):
+
+            # decompress and open datasets in memory (no tmp file)
+            if file_memory:
+                file_dset_tmp = read_file_gridded_memory(file_path)
+                if file_dset_tmp is not None:
+                    return file_dset_tmp
+
             file_path_noext = remove_zip_extension(file_path)
             folder_name_noext, file_name_noext = os.path.split(file_path_noext)
             file_path_tmp = os.path.join(folder_name_tmp, file_name_noext)
@@ -411,3 +433,24 @@ def read_file_gridded(file_path, folder_name_tmp=None, clean_tmp=True):
     return file_dset_tmp
 
 # -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to read gridded file decompressed in memory (return None to use the tmp file)
+def read_file_gridded_memory(file_path):
+
+    try:
+        file_data = unzip_filename_memory(file_path)
+        file_handle = netCDF4.Dataset('memory.nc', mode='r', memory=file_data)
+        try:
+            file_dset = xr.open_dataset(xr.backends.NetCDF4DataStore(file_handle)).load()
+        finally:
+            file_handle.close()
+    except (IOError, OSError, MemoryError, ValueError) as file_error:
+        log_stream.warning(' ===> File "' + file_path + '" is not readable in memory (' + str(file_error) +
+                           '). Use the tmp file')
+        file_dset = None
+
+    return file_dset
+
+# -------------------------------------------------------------------------------------
@@ -0,0 +1,541 @@
+"""
+Library Features:
+
+Name:          lib_data_io_workspace
+Author(s):     Fabio Delogu (fabio.delogu@cimafoundation.org)
+Date:          '20261018'
+Version:       '1.0.0'
+"""
+#######################################################################################
+# Library
+import logging
+import os
+import json
+import pickle
+import struct
+import time
+import uuid
+import zipfile
+
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from lib_info_args import logger_name
+
+# Logging
+log_stream = logging.getLogger(logger_name)
+
+# Workspace format (zip archive with a json manifest and the array payloads stored as raw members)
+workspace_format = 'hat_workspace'
+workspace_version = '1.0.0'
+workspace_manifest = 'manifest.json'
+workspace_packed = 'arrays_packed'
+workspace_packed_size = 65536
+workspace_compression = zipfile.ZIP_DEFLATED
+workspace_compression_level = 1
+# large arrays are stored uncompressed by default (read in place, float grids are not compressed efficiently)
+workspace_compression_arrays = zipfile.ZIP_STORED
+# large numeric arrays stored uncompressed can be mapped in memory (copy on write, pages shared by the os cache)
+workspace_mmap_mode = 'c'
+workspace_mmap_kinds = 'biufc'
+# data of the stored members starts at an aligned offset (padding in the local header extra field)
+workspace_align = 64
+workspace_align_extra_id = 0xD935
+#######################################################################################
+
+
+# -------------------------------------------------------------------------------------
+# Method to check if a file is a workspace (zip archive with the manifest)
+def check_workspace(file_name):
+    if zipfile.is_zipfile(file_name):
+        try:
+            with zipfile.ZipFile(file_name, 'r') as file_handle:
+                return workspace_manifest in file_handle.namelist()
+        except zipfile.BadZipFile:
+            # truncated or corrupted archive (central directory not readable)
+            return False
+    return False
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to write a workspace (written in a tmp file and renamed in place)
+def write_workspace(file_name, file_data):
+
+    # tmp file created with the default permissions (process umask applied by the os)
+    folder_name = os.path.dirname(os.path.abspath(file_name))
+    file_name_tmp = os.path.join(folder_name, '.' + os.path.basename(file_name) + '.' + uuid.uuid4().hex + '.tmp')
+    os.close(os.open(file_name_tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+
+    try:
+        with zipfile.ZipFile(file_name_tmp, 'w', compression=workspace_compression,
+                             compresslevel=workspace_compression_level, allowZip64=True) as file_handle:
+
+            # small arrays are packed in a single member, large arrays are stored in their own member
+            file_arrays = {'packed': bytearray(), 'members': {}}
+            file_tree = encode_workspace_obj(file_data, file_arrays)
+
+            for member_name, member_data in file_arrays['members'].items():
+                member_info = zipfile.ZipInfo(member_name, date_time=time.localtime()[:6])
+                member_info.compress_type = workspace_compression_arrays
+                if member_info.compress_type == zipfile.ZIP_STORED:
+                    member_info.extra = define_workspace_padding(file_handle.fp.tell(), member_info)
+                with file_handle.open(member_info, 'w', force_zip64=True) as member_handle:
+                    member_handle.write(member_data)
+            file_handle.writestr(workspace_packed, bytes(file_arrays['packed']))
+
+            file_manifest = {'format': workspace_format, 'version': workspace_version,
+                             'time_created': datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S'),
+                             'library': {'numpy': np.__version__, 'pandas': pd.__version__,
+                                         'xarray': xr.__version__},
+                             'tree': file_tree}
+            file_handle.writestr(workspace_manifest, json.dumps(file_manifest))
+
+        os.replace(file_name_tmp, file_name)
+
+    finally:
+        if os.path.exists(file_name_tmp):
+            os.remove(file_name_tmp)
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to define the extra field padding the data of a stored member to the workspace alignment
+def define_workspace_padding(member_offset, member_info):
+
+    # local header size without padding (fixed fields, file name and zip64 extra field of the sizes)
+    member_header = 30 + member_info.filename.encode('utf-8').__len__() + 20
+
+    # padding record (id and size fields included) to align the data offset
+    member_padding = (-(member_offset + member_header + 4)) % workspace_align
+    return struct.pack('<HH', workspace_align_extra_id, member_padding) + bytes(member_padding)
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to read and check the workspace manifest (same format and same major version)
+def read_workspace_manifest(file_name, file_handle):
+
+    file_manifest = json.loads(file_handle.read(workspace_manifest))
+
+    file_format, file_version = None, None
+    if 'format' in list(file_manifest.keys()):
+        file_format = file_manifest['format']
+    if 'version' in list(file_manifest.keys()):
+        file_version = str(file_manifest['version'])
+
+    if file_format != workspace_format:
+        log_stream.error(' ===> Workspace format "' + str(file_format) + '" is not supported')
+        raise IOError('Workspace format not supported')
+    if (file_version is None) or (file_version.split('.')[0] != workspace_version.split('.')[0]):
+        log_stream.error(' ===> Workspace version "' + str(file_version) + '" of file "' + file_name +
+                         '" is not supported. Expected version "' + workspace_version + '" or compatible')
+        raise IOError('Workspace version not supported')
+
+    return file_manifest
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to read a workspace (all the datasets or only the variable selected)
+def read_workspace(file_name, var_name=None, file_mmap=False):
+
+    with zipfile.ZipFile(file_name, 'r') as file_handle:
+
+        file_manifest = read_workspace_manifest(file_name, file_handle)
+
+        # members are read only when an array needs them (regular index are shared as in the pickle memo)
+        file_obj = {'name': file_name, 'handle': file_handle, 'packed': None, 'index': {}, 'mmap': file_mmap}
+
+        file_tree = file_manifest['tree']
+        if var_name is not None:
+            if file_tree['type'] != 'dict':
+                log_stream.error(' ===> Workspace "' + file_name + '" is not organized by variable(s)')
+                raise IOError('Workspace variable selection is not available')
+            file_keys = [decode_workspace_obj(key_tree, file_obj) for key_tree in file_tree['keys']]
+            if var_name not in file_keys:
+                log_stream.error(' ===> Variable "' + str(var_name) + '" is not available in the workspace')
+                raise KeyError('Workspace variable not found')
+            file_tree = file_tree['values'][file_keys.index(var_name)]
+
+        file_data = decode_workspace_obj(file_tree, file_obj)
+
+    return file_data
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to store a buffer in the workspace arrays
+def store_workspace_buffer(buffer_data, file_arrays):
+
+    if isinstance(buffer_data, np.ndarray):
+        buffer_data = buffer_data.reshape(-1).view(np.uint8)
+    buffer_data = memoryview(buffer_data).cast('B')
+    if buffer_data.nbytes < workspace_packed_size:
+        buffer_tree = {'member': workspace_packed, 'offset': file_arrays['packed'].__len__(),
+                       'size': buffer_data.nbytes}
+        file_arrays['packed'].extend(buffer_data)
+    else:
+        buffer_tree = {'member': 'array_{:}'.format(file_arrays['members'].__len__()), 'offset': 0,
+                       'size': buffer_data.nbytes}
+        file_arrays['members'][buffer_tree['member']] = buffer_data
+
+    return buffer_tree
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to load a buffer from the workspace arrays
+def load_workspace_buffer(buffer_tree, file_obj, buffer_data):
+
+    if isinstance(buffer_data, np.ndarray):
+        buffer_view = memoryview(buffer_data.reshape(-1).view(np.uint8))
+    else:
+        buffer_view = memoryview(buffer_data).cast('B')
+    if buffer_tree['member'] == workspace_packed:
+        if file_obj['packed'] is None:
+            file_obj['packed'] = file_obj['handle'].read(workspace_packed)
+        buffer_offset = buffer_tree['offset']
+        buffer_view[:] = file_obj['packed'][buffer_offset:buffer_offset + buffer_tree['size']]
+    else:
+        member_info = file_obj['handle'].getinfo(buffer_tree['member'])
+        if member_info.compress_type == zipfile.ZIP_STORED:
+            # uncompressed members are read in place
+            with open(file_obj['name'], 'rb') as member_handle:
+                member_handle.seek(get_workspace_offset(file_obj, buffer_tree['member']))
+                buffer_read = 0
+                while buffer_read < buffer_tree['size']:
+                    buffer_read += member_handle.readinto(buffer_view[buffer_read:])
+        else:
+            with file_obj['handle'].open(buffer_tree['member'], 'r') as member_handle:
+                buffer_read = 0
+                while buffer_read < buffer_tree['size']:
+                    buffer_read += member_handle.readinto(buffer_view[buffer_read:])
+
+    return buffer_data
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to get the offset of an uncompressed member (None if the member is compressed or packed)
+def get_workspace_offset(file_obj, member_name):
+
+    if member_name == workspace_packed:
+        return None
+    member_info = file_obj['handle'].getinfo(member_name)
+    if member_info.compress_type != zipfile.ZIP_STORED:
+        return None
+
+    # offset defined by the member local header (fixed fields, file name and extra field)
+    with open(file_obj['name'], 'rb') as member_handle:
+        member_handle.seek(member_info.header_offset)
+        member_header = member_handle.read(30)
+
+    return member_info.header_offset + 30 + \
+        int.from_bytes(member_header[26:28], 'little') + int.from_bytes(member_header[28:30], 'little')
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to map an array of the workspace in memory (None if the array is not mappable)
+def map_workspace_array(array_tree, file_obj):
+
+    array_dtype = np.dtype(array_tree['dtype'])
+    if array_tree['object'] or ('pandas_dtype' in list(array_tree.keys())) or \
+            (array_dtype.kind not in workspace_mmap_kinds) or (array_tree['size'] == 0):
+        return None
+
+    array_offset = get_workspace_offset(file_obj, array_tree['member'])
+    if array_offset is None:
+        return None
+
+    return np.memmap(file_obj['name'], dtype=array_dtype, mode=workspace_mmap_mode,
+                     offset=array_offset, shape=tuple(array_tree['shape']))
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to add an array to the workspace arrays
+def encode_workspace_array(array_data, file_arrays):
+
+    array_tree = {'type': 'array', 'object': False}
+
+    # string arrays (pandas) are stored as object arrays and restored with the pandas dtype
+    if isinstance(getattr(array_data, 'dtype', None), pd.StringDtype):
+        array_tree['pandas_dtype'] = str(array_data.dtype)
+        array_data = np.asarray(array_data, dtype=object)
+    array_data = np.asarray(array_data, order='C')
+
+    # object arrays of strings are stored as unicode arrays (other object arrays are stored by pickle)
+    if array_data.dtype == object:
+        array_flat = array_data.ravel()
+        if array_flat.size > 0 and all([isinstance(array_value, str) for array_value in array_flat]):
+            array_data = np.asarray(array_data.astype(str), order='C')
+            array_tree['object'] = True
+        else:
+            array_tree['type'] = 'array_pickle'
+            array_tree.update(store_workspace_buffer(
+                pickle.dumps(array_data, protocol=pickle.HIGHEST_PROTOCOL), file_arrays))
+            return array_tree
+
+    array_tree['dtype'] = array_data.dtype.str
+    array_tree['shape'] = list(array_data.shape)
+    array_tree.update(store_workspace_buffer(array_data, file_arrays))
+
+    return array_tree
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to add an index to the workspace arrays
+def encode_workspace_index(index_data, file_arrays):
+
+    index_name = encode_workspace_obj(index_data.name, file_arrays)
+
+    if type(index_data) is pd.RangeIndex:
+        return {'type': 'range_index', 'start': int(index_data.start), 'stop': int(index_data.stop),
+                'step': int(index_data.step), 'name': index_name}
+
+    if type(index_data) is pd.DatetimeIndex:
+        # regular index are defined by start, periods and frequency
+        if (index_data.freq is not None) and (index_data.__len__() > 0):
+            return {'type': 'datetime_range', 'start': encode_workspace_obj(index_data[0], file_arrays),
+                    'periods': index_data.__len__(), 'freq': index_data.freqstr, 'name': index_name}
+        index_tz = None if index_data.tz is None else str(index_data.tz)
+        index_values = index_data.tz_convert(None).values if index_tz is not None else index_data.values
+        return {'type': 'datetime_index', 'values': encode_workspace_array(index_values, file_arrays),
+                'tz': index_tz, 'name': index_name}
+
+    return {'type': 'index', 'values': encode_workspace_array(index_data.values, file_arrays), 'name': index_name}
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to add a variable (data array or dataset variable) to the workspace arrays
+def encode_workspace_variable(var_data, file_arrays):
+    return {'dims': list(var_data.dims), 'values': encode_workspace_array(var_data.values, file_arrays),
+            'attrs': encode_workspace_obj(dict(var_data.attrs), file_arrays)}
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to check if a dtype is stored by numpy arrays
+def check_workspace_dtype(obj_dtype):
+    return isinstance(obj_dtype, (np.dtype, pd.StringDtype))
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to check if a pandas index is stored by numpy arrays
+def check_workspace_index(index_data):
+    if type(index_data) in [pd.Index, pd.RangeIndex]:
+        return check_workspace_dtype(index_data.dtype)
+    return type(index_data) is pd.DatetimeIndex
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to check if a pandas obj is stored by numpy arrays
+def check_workspace_pandas(obj_data):
+    if type(obj_data) is pd.DataFrame:
+        obj_dtypes, obj_index = list(obj_data.dtypes.values), [obj_data.index, obj_data.columns]
+    else:
+        obj_dtypes, obj_index = [obj_data.dtype], [obj_data.index]
+    return all([check_workspace_dtype(obj_dtype) for obj_dtype in obj_dtypes]) and \
+        all([check_workspace_index(index_data) for index_data in obj_index])
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to encode an obj in the workspace tree (arrays are collected and stored apart)
+def encode_workspace_obj(obj_data, file_arrays):
+
+    if obj_data is None:
+        return {'type': 'none'}
+    elif type(obj_data) in [bool, int, float, str]:
+        return {'type': 'value', 'value': obj_data}
+    elif obj_data is pd.NaT:
+        return {'type': 'nat'}
+    elif type(obj_data) is pd.Timestamp:
+        return {'type': 'timestamp', 'value': int(obj_data.value), 'unit': getattr(obj_data, 'unit', 'ns'),
+                'tz': None if obj_data.tz is None else str(obj_data.tz)}
+    elif type(obj_data) is pd.Timedelta:
+        return {'type': 'timedelta', 'value': int(obj_data.value), 'unit': getattr(obj_data, 'unit', 'ns')}
+    elif type(obj_data) is datetime and obj_data.tzinfo is None:
+        return {'type': 'datetime', 'value': obj_data.isoformat()}
+    elif isinstance(obj_data, np.generic) and obj_data.dtype != object:
+        return {'type': 'scalar', 'values': encode_workspace_array(obj_data, file_arrays)}
+    elif type(obj_data) in [list, tuple]:
+        return {'type': type(obj_data).__name__,
+                'items': [encode_workspace_obj(obj_item, file_arrays) for obj_item in obj_data]}
+    elif type(obj_data) is dict:
+        return {'type': 'dict',
+                'keys': [encode_workspace_obj(obj_key, file_arrays) for obj_key in obj_data.keys()],
+                'values': [encode_workspace_obj(obj_value, file_arrays) for obj_value in obj_data.values()]}
+    elif type(obj_data) is np.ndarray:
+        return encode_workspace_array(obj_data, file_arrays)
+    elif check_workspace_index(obj_data):
+        return encode_workspace_index(obj_data, file_arrays)
+    elif type(obj_data) is pd.Series and check_workspace_pandas(obj_data):
+        return {'type': 'series', 'values': encode_workspace_array(obj_data.values, file_arrays),
+                'index': encode_workspace_index(obj_data.index, file_arrays),
+                'name': encode_workspace_obj(obj_data.name, file_arrays),
+                'attrs': encode_workspace_obj(dict(obj_data.attrs), file_arrays)}
+    elif type(obj_data) is pd.DataFrame and check_workspace_pandas(obj_data):
+        return {'type': 'dataframe',
+                'columns': [encode_workspace_array(obj_data.iloc[:, column_id].values, file_arrays)
+                            for column_id in range(obj_data.shape[1])],
+                'index': encode_workspace_index(obj_data.index, file_arrays),
+                'names': encode_workspace_index(obj_data.columns, file_arrays),
+                'attrs': encode_workspace_obj(dict(obj_data.attrs), file_arrays)}
+    elif type(obj_data) is xr.DataArray:
+        return {'type': 'data_array', 'name': encode_workspace_obj(obj_data.name, file_arrays),
+                'variable': encode_workspace_variable(obj_data.variable, file_arrays),
+                'coords': [[coord_name, encode_workspace_variable(coord_data.variable, file_arrays)]
+                           for coord_name, coord_data in obj_data.coords.items()]}
+    elif type(obj_data) is xr.Dataset:
+        return {'type': 'dataset',
+                'variables': [[var_name, encode_workspace_variable(var_data.variable, file_arrays)]
+                              for var_name, var_data in obj_data.data_vars.items()],
+                'coords': [[coord_name, encode_workspace_variable(coord_data.variable, file_arrays)]
+                           for coord_name, coord_data in obj_data.coords.items()],
+                'attrs': encode_workspace_obj(dict(obj_data.attrs), file_arrays)}
+
+    # obj(s) without a workspace layout (e.g. geometries) are stored by pickle
+    obj_tree = {'type': 'pickle'}
+    obj_tree.update(store_workspace_buffer(pickle.dumps(obj_data, protocol=pickle.HIGHEST_PROTOCOL), file_arrays))
+    return obj_tree
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to get an array from the workspace (only the member selected is read)
+def decode_workspace_array(array_tree, file_obj):
+
+    if array_tree['type'] == 'array_pickle':
+        array_data = pickle.loads(load_workspace_buffer(array_tree, file_obj, bytearray(array_tree['size'])))
+    else:
+        array_data = map_workspace_array(array_tree, file_obj) if file_obj['mmap'] else None
+        if array_data is None:
+            array_data = np.empty(array_tree['shape'], dtype=np.dtype(array_tree['dtype']))
+            if array_data.nbytes > 0:
+                load_workspace_buffer(array_tree, file_obj, array_data)
+
+    if array_tree['object']:
+        array_data = array_data.astype(object)
+    if 'pandas_dtype' in list(array_tree.keys()):
+        array_data = pd.array(array_data, dtype=array_tree['pandas_dtype'])
+    return array_data
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to get an index from the workspace
+def decode_workspace_index(index_tree, file_obj):
+
+    index_name = decode_workspace_obj(index_tree['name'], file_obj)
+
+    if index_tree['type'] == 'range_index':
+        return pd.RangeIndex(index_tree['start'], index_tree['stop'], index_tree['step'], name=index_name)
+    elif index_tree['type'] == 'datetime_range':
+        index_key = json.dumps(index_tree, sort_keys=True)
+        if index_key not in file_obj['index']:
+            index_start = decode_workspace_obj(index_tree['start'], file_obj)
+            index_data = pd.date_range(start=index_start, periods=index_tree['periods'], freq=index_tree['freq'],
+                                       name=index_name)
+            if index_tree['start']['unit'] != 'ns':
+                index_data = index_data.as_unit(index_tree['start']['unit'])
+            file_obj['index'][index_key] = index_data
+        return file_obj['index'][index_key]
+
+    index_values = decode_workspace_array(index_tree['values'], file_obj)
+    if index_tree['type'] == 'datetime_index':
+        index_data = pd.DatetimeIndex(index_values, name=index_name)
+        if index_tree['tz'] is not None:
+            index_data = index_data.tz_localize('UTC').tz_convert(index_tree['tz'])
+        return index_data
+
+    return pd.Index(index_values, name=index_name, dtype=index_values.dtype)
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to get a variable from the workspace
+def decode_workspace_variable(var_tree, file_obj):
+    return xr.Variable(var_tree['dims'], decode_workspace_array(var_tree['values'], file_obj),
+                       attrs=decode_workspace_obj(var_tree['attrs'], file_obj))
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to decode an obj from the workspace tree
+def decode_workspace_obj(obj_tree, file_obj):
+
+    obj_type = obj_tree['type']
+    if obj_type == 'none':
+        return None
+    elif obj_type == 'value':
+        return obj_tree['value']
+    elif obj_type == 'nat':
+        return pd.NaT
+    elif obj_type == 'timestamp':
+        obj_data = pd.Timestamp(obj_tree['value'])
+        if obj_tree['unit'] != 'ns':
+            obj_data = obj_data.as_unit(obj_tree['unit'])
+        if obj_tree['tz'] is not None:
+            obj_data = obj_data.tz_localize('UTC').tz_convert(obj_tree['tz'])
+        return obj_data
+    elif obj_type == 'timedelta':
+        obj_data = pd.Timedelta(obj_tree['value'])
+        if obj_tree['unit'] != 'ns':
+            obj_data = obj_data.as_unit(obj_tree['unit'])
+        return obj_data
+    elif obj_type == 'datetime':
+        return datetime.fromisoformat(obj_tree['value'])
+    elif obj_type == 'scalar':
+        return decode_workspace_array(obj_tree['values'], file_obj)[()]
+    elif obj_type == 'list':
+        return [decode_workspace_obj(obj_item, file_obj) for obj_item in obj_tree['items']]
+    elif obj_type == 'tuple':
+        return tuple([decode_workspace_obj(obj_item, file_obj) for obj_item in obj_tree['items']])
+    elif obj_type == 'dict':
+        return {decode_workspace_obj(obj_key, file_obj): decode_workspace_obj(obj_value, file_obj)
+                for obj_key, obj_value in zip(obj_tree['keys'], obj_tree['values'])}
+    elif obj_type in ['array', 'array_pickle']:
+        return decode_workspace_array(obj_tree, file_obj)
+    elif obj_type in ['index', 'range_index', 'datetime_index', 'datetime_range']:
+        return decode_workspace_index(obj_tree, file_obj)
+    elif obj_type == 'series':
+        obj_data = pd.Series(decode_workspace_array(obj_tree['values'], file_obj),
+                             index=decode_workspace_index(obj_tree['index'], file_obj),
+                             name=decode_workspace_obj(obj_tree['name'], file_obj))
+        obj_data.attrs = decode_workspace_obj(obj_tree['attrs'], file_obj)
+        return obj_data
+    elif obj_type == 'dataframe':
+        obj_data = pd.DataFrame(
+            {column_id: decode_workspace_array(column_tree, file_obj)
+             for column_id, column_tree in enumerate(obj_tree['columns'])},
+            index=decode_workspace_index(obj_tree['index'], file_obj))
+        obj_data.columns = decode_workspace_index(obj_tree['names'], file_obj)
+        obj_data.attrs = decode_workspace_obj(obj_tree['attrs'], file_obj)
+        return obj_data
+    elif obj_type == 'data_array':
+        obj_variable = decode_workspace_variable(obj_tree['variable'], file_obj)
+        obj_coords = {coord_name: decode_workspace_variable(coord_tree, file_obj)
+                      for coord_name, coord_tree in obj_tree['coords']}
+        return xr.DataArray(obj_variable, coords=obj_coords, name=decode_workspace_obj(obj_tree['name'], file_obj))
+    elif obj_type == 'dataset':
+        obj_variables = {var_name: decode_workspace_variable(var_tree, file_obj)
+                         for var_name, var_tree in obj_tree['variables']}
+        obj_coords = {coord_name: decode_workspace_variable(coord_tree, file_obj)
+                      for coord_name, coord_tree in obj_tree['coords']}
+        return xr.Dataset(obj_variables, coords=obj_coords, attrs=decode_workspace_obj(obj_tree['attrs'], file_obj))
+    elif obj_type == 'pickle':
+        return pickle.loads(load_workspace_buffer(obj_tree, file_obj, bytearray(obj_tree['size'])))
+
+    log_stream.error(' ===> Workspace obj type "' + str(obj_type) + '" is not supported')
+    raise NotImplementedError('Case not implemented yet')
+# -------------------------------------------------------------------------------------
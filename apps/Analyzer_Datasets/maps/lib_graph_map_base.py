@@ -11,6 +11,8 @@ Version:       '1.1.0'
 # Libraries
 import logging
 import os
+import hashlib
+import tempfile
 import cartopy
 import numpy as np
 import pandas as pd
@@ -36,9 +38,91 @@ logging.getLogger('rasterio').setLevel(logging.WARNING)
 logging.getLogger('matplotlib').setLevel(logging.WARNING)
 logging.getLogger('PIL').setLevel(logging.WARNING)
 log_stream = logging.getLogger(logger_name)
+
+# map background cache (rgba arrays for each extent, zoom, dpi and style)
+map_background_cache = {}
 #######################################################################################
 
 
+# -------------------------------------------------------------------------------------
+# Method to define the map background key (extent, zoom, dpi, style and figure layout)
+def define_map_background_key(map_extent, map_zoom, fig_dpi, fig_background,
+                              fig_size=(12, 10), fig_axes=(0.1, 0.1, 0.8, 0.8)):
+    map_key = '_'.join([
+        ','.join(['{:.6f}'.format(float(value)) for value in map_extent]), str(map_zoom), str(fig_dpi),
+        str(fig_background), ','.join([str(value) for value in fig_size]), ','.join([str(value) for value in fig_axes])])
+    return hashlib.md5(map_key.encode('utf-8')).hexdigest()
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to render the map background (stock image and tiles) as an rgba array
+def render_map_background(map_background, map_extent, map_zoom, plot_crs, data_crs,
+                          fig_dpi=150, fig_size=(12, 10), fig_axes=(0.1, 0.1, 0.8, 0.8)):
+
+    fig = plt.figure(figsize=fig_size, dpi=fig_dpi)
+    ax = fig.add_axes(list(fig_axes), projection=plot_crs)
+    ax.stock_img()
+    ax.set_extent(map_extent, crs=data_crs)
+    ax.add_image(map_background, map_zoom)
+    ax.axis('off')
+
+    fig.canvas.draw()
+
+    # select the axes region (display origin is lower-left, array origin is upper-left)
+    fig_rgba = np.asarray(fig.canvas.buffer_rgba())
+    ax_x0, ax_y0, ax_x1, ax_y1 = [int(round(value)) for value in ax.bbox.extents]
+    fig_height = fig_rgba.shape[0]
+    map_rgba = np.array(fig_rgba[fig_height - ax_y1:fig_height - ax_y0, ax_x0:ax_x1, :], dtype=np.uint8)
+    map_rgba_extent = np.array(ax.get_extent(crs=plot_crs), dtype=np.float64)
+
+    plt.close(fig)
+
+    return map_rgba, map_rgba_extent
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to get the map background (memory cache, disk cache or rendering)
+def get_map_background(map_background, map_extent, map_zoom, plot_crs, data_crs,
+                       fig_dpi=150, fig_background='osm', fig_background_cache_folder=None):
+
+    map_key = define_map_background_key(map_extent, map_zoom, fig_dpi, fig_background)
+
+    if map_key in list(map_background_cache.keys()):
+        return map_background_cache[map_key]
+
+    file_path = None
+    if fig_background_cache_folder is not None:
+        file_path = os.path.join(fig_background_cache_folder, 'background', fig_background + '_' + map_key + '.npz')
+
+    if file_path is not None and os.path.exists(file_path):
+        with np.load(file_path) as file_obj:
+            map_rgba, map_rgba_extent = file_obj['rgba'], file_obj['extent']
+    else:
+        map_rgba, map_rgba_extent = render_map_background(
+            map_background, map_extent, map_zoom, plot_crs, data_crs, fig_dpi=fig_dpi)
+
+        if file_path is not None:
+            # write the background with an atomic rename (shared by processes)
+            file_folder = os.path.dirname(file_path)
+            make_folder(file_folder)
+            file_handle, file_tmp = tempfile.mkstemp(dir=file_folder, prefix='.background_', suffix='.tmp')
+            try:
+                with os.fdopen(file_handle, 'wb') as file_obj:
+                    np.savez(file_obj, rgba=map_rgba, extent=map_rgba_extent)
+                os.replace(file_tmp, file_path)
+            finally:
+                # remove the temporary file if the write is not completed
+                if os.path.exists(file_tmp):
+                    os.remove(file_tmp)
+
+    map_background_cache[map_key] = (map_rgba, map_rgba_extent)
+
+    return map_rgba, map_rgba_extent
+# -------------------------------------------------------------------------------------
+
+
 # -------------------------------------------------------------------------------------
 # Method to plot map variable in png format
 def plot_map_var(file_path, var_darray, var_time, var_limit_min=None, var_limit_max=None,
@@ -47,6 +131,7 @@ def plot_map_var(file_path, var_darray, var_time, var_limit_min=None, var_limit_
                  var_time_window='NA', var_time_type='UTC',
                  var_name_geo_x='longitude', var_name_geo_y='latitude',
                  tag_sep=' ', fig_background='osm',
+                 fig_background_cache_folder=None, fig_background_cache_size=None, fig_background_offline=False,
                  fig_color_map_type=None, fig_color_map_label=None,
                  fig_dpi=150, fig_show=False):
     
@@ -171,17 +256,33 @@ def plot_map_var(file_path, var_darray, var_time, var_limit_min=None, var_limit_
         '''
 
         map_background = cimgt_custom.OSM()
+
+        # set tiles cache (size in MB; offline mode uses the cached tiles only)
+        if fig_background_cache_folder is not None:
+            if fig_background_cache_size is not None:
+                fig_background_cache_size = int(float(fig_background_cache_size) * 1024 * 1024)
+            map_background.set_cache(
+                cache_folder=fig_background_cache_folder, cache_size_max=fig_background_cache_size,
+                cache_offline=str(fig_background_offline).lower() in ['true', '1'])
     elif fig_background == 'google':
         map_background = cimgt.GoogleTiles()
     else:
         raise NotImplementedError('Variable background case not implemented yet')
 
+    # Get the background layer (rendered once for each extent, zoom, dpi and style)
+    map_extent, map_zoom = [map_lon_west, map_lon_east, map_lat_south, map_lat_north], 8
+    map_rgba, map_rgba_extent = get_map_background(
+        map_background, map_extent, map_zoom, plot_crs, data_crs,
+        fig_dpi=fig_dpi, fig_background=fig_background,
+        fig_background_cache_folder=fig_background_cache_folder)
+
     fig = plt.figure(figsize=(12, 10))
     ax = fig.add_axes([0.1, 0.1, 0.8, 0.8], projection=plot_crs)
     ax.set_title(figure_title, size=12, color='black', weight='bold')
     # ax.coastlines(resolution='10m', color='black')
-    ax.stock_img()
-    ax.set_extent([map_lon_west, map_lon_east, map_lat_south, map_lat_north])
+    ax.imshow(map_rgba, extent=list(map_rgba_extent), transform=plot_crs, origin='upper',
+              interpolation='nearest', zorder=0)
+    ax.set_extent(map_extent)
 
     gl = ax.gridlines(crs=data_crs, draw_labels=True,
                       linewidth=2, color='gray', alpha=0.5, linestyle='--')
@@ -194,9 +295,6 @@ def plot_map_var(file_path, var_darray, var_time, var_limit_min=None, var_limit_
     gl.xlabel_style = {'size': 8, 'color': 'gray', 'weight': 'bold'}
     gl.ylabel_style = {'size': 8, 'color': 'gray', 'weight': 'bold'}
 
-    # Add the Stamen data at zoom level 8.
-    ax.add_image(map_background, 8)
-
     if (fig_color_vmin is not None) and (fig_color_vmax is not None):
         sc = ax.pcolormesh(map_lons_2d, map_lats_2d, map_data, zorder=3,
                            cmap=fig_color_map_obj, transform=data_crs, vmin=fig_color_vmin, vmax=fig_color_vmax)
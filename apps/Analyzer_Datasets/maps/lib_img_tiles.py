@@ -31,6 +31,8 @@ using tiles in this way can be found at the
 from __future__ import (absolute_import, division, print_function)
 
 from abc import ABCMeta, abstractmethod
+import os
+import tempfile
 import warnings
 
 from PIL import Image
@@ -47,27 +49,125 @@ class GoogleWTS(six.with_metaclass(ABCMeta, object)):
 
     A "tile" in this class refers to the coordinates (x, y, z).
 
+    Tiles can be stored in an on-disk cache keyed by (provider, z, x, y).
+    The cache is bounded in size (least recently used tiles are removed
+    first) and can be used in offline mode (tiles are never downloaded).
+
     """
-    def __init__(self, desired_tile_form='RGB'):
+    def __init__(self, desired_tile_form='RGB', cache_folder=None,
+                 cache_size_max=None, cache_offline=False):
+        """
+        Parameters
+        ----------
+        desired_tile_form: optional
+            Defaults to 'RGB'.
+        cache_folder: optional
+            Folder of the on-disk tile cache. Defaults to None (no cache).
+        cache_size_max: optional
+            Maximum size of the tile cache in bytes. Defaults to None
+            (unbounded cache).
+        cache_offline: optional
+            If True, tiles are read from the cache only and missing tiles
+            are skipped. Defaults to False.
+
+        """
         self.imgs = []
         self.crs = ccrs.Mercator.GOOGLE
         self.desired_tile_form = desired_tile_form
+        self.set_cache(cache_folder=cache_folder,
+                       cache_size_max=cache_size_max,
+                       cache_offline=cache_offline)
+
+    def set_cache(self, cache_folder=None, cache_size_max=None,
+                  cache_offline=False):
+        """Set the on-disk tile cache (folder, maximum size and mode)."""
+        if cache_offline and cache_folder is None:
+            raise ValueError('The offline mode requires a cache folder.')
+        self.cache_folder = cache_folder
+        self.cache_size_max = cache_size_max
+        self.cache_offline = cache_offline
+        self.cache_updated = False
 
     def image_for_domain(self, target_domain, target_z):
         tiles = []
+        tiles_missing = 0
         for tile in self.find_images(target_domain, target_z):
             try:
                 img, extent, origin = self.get_image(tile)
             except IOError:
+                tiles_missing += 1
                 continue
             img = np.array(img)
             x = np.linspace(extent[0], extent[1], img.shape[1])
             y = np.linspace(extent[2], extent[3], img.shape[0])
             tiles.append([img, x, y, origin])
 
+        self.evict_cache()
+
+        if not tiles:
+            if self.cache_offline:
+                raise IOError('No tiles (zoom %s, %d requested) are available in '
+                              'the offline cache "%s". Seed the cache for the '
+                              'domain (hat_tool_maps_tiles_seed.py) or disable '
+                              'the offline mode.' % (target_z, tiles_missing,
+                                                     self.cache_folder))
+            raise IOError('No tiles (zoom %s, %d requested) could be '
+                          'retrieved for the domain.' % (target_z,
+                                                         tiles_missing))
+
         img, extent, origin = _merge_tiles(tiles)
         return img, extent, origin
 
+    def seed_cache(self, extent, target_z, extent_crs=None):
+        """
+        Fill the tile cache for the given extent and zoom level(s).
+
+        Parameters
+        ----------
+        extent
+            The ``(x0, x1, y0, y1)`` extent of the domain.
+        target_z
+            The zoom level (or a list of zoom levels) to seed.
+        extent_crs: optional
+            The crs of the extent. Defaults to PlateCarree (lon/lat).
+
+        Returns
+        -------
+        A dictionary with the number of tiles already cached, downloaded
+        and failed.
+
+        """
+        if self.cache_folder is None:
+            raise ValueError('The seeding of the tiles requires a cache '
+                             'folder.')
+        if extent_crs is None:
+            extent_crs = ccrs.PlateCarree()
+        if isinstance(target_z, int):
+            target_z = [target_z]
+
+        x0, x1, y0, y1 = extent
+        points = self.crs.transform_points(
+            extent_crs, np.array([x0, x1, x0, x1], dtype=np.float64),
+            np.array([y0, y0, y1, y1], dtype=np.float64))
+        target_domain = sgeom.box(np.min(points[:, 0]), np.min(points[:, 1]),
+                                  np.max(points[:, 0]), np.max(points[:, 1]))
+
+        counts = {'cached': 0, 'downloaded': 0, 'failed': 0}
+        for z in target_z:
+            for tile in self.find_images(target_domain, z):
+                if os.path.exists(self.cache_path(tile)):
+                    counts['cached'] += 1
+                    continue
+                try:
+                    self.get_image_data(tile)
+                    counts['downloaded'] += 1
+                except IOError:
+                    counts['failed'] += 1
+
+        self.evict_cache()
+
+        return counts
+
     def _find_images(self, target_domain, target_z, start_tile=(0, 0, 0)):
         """Target domain is a shapely polygon in native coordinates."""
 
@@ -155,7 +255,68 @@ class GoogleWTS(six.with_metaclass(ABCMeta, object)):
     def _image_url(self, tile):
         pass
 
-    def get_image(self, tile):
+    def cache_provider(self):
+        """Return the provider name used in the tile cache."""
+        provider = self.__class__.__name__
+        style = getattr(self, 'style', None)
+        if style is not None:
+            provider = provider + '_' + str(style)
+        return provider
+
+    def cache_path(self, tile):
+        """Return the cache file path of a tile (provider/z/x/y)."""
+        if isinstance(tile, tuple):
+            x, y, z = tile
+            tile_path = os.path.join(str(z), str(x), str(y))
+        else:
+            tile_path = str(tile)
+        return os.path.join(self.cache_folder, self.cache_provider(),
+                            tile_path + '.tile')
+
+    def evict_cache(self):
+        """Remove the least recently used tiles over the cache size."""
+        if self.cache_folder is None or self.cache_size_max is None or \
+                not self.cache_updated:
+            return
+
+        cache_files = []
+        for root, _, file_names in os.walk(self.cache_folder):
+            for file_name in file_names:
+                if file_name.endswith('.tile'):
+                    file_path = os.path.join(root, file_name)
+                    try:
+                        file_stat = os.stat(file_path)
+                    except OSError:
+                        continue
+                    cache_files.append((file_stat.st_mtime, file_stat.st_size,
+                                        file_path))
+
+        cache_size = sum([file_size for _, file_size, _ in cache_files])
+        for _, file_size, file_path in sorted(cache_files):
+            if cache_size <= self.cache_size_max:
+                break
+            try:
+                os.remove(file_path)
+            except OSError:
+                continue
+            cache_size -= file_size
+
+        self.cache_updated = False
+
+    def get_image_data(self, tile):
+        """Return the raw data of a tile (cache first, then network)."""
+        if self.cache_folder is not None:
+            file_path = self.cache_path(tile)
+            if os.path.exists(file_path):
+                with open(file_path, 'rb') as file_handle:
+                    im_data = file_handle.read()
+                # update the access time for the lru eviction
+                os.utime(file_path, None)
+                return im_data
+            if self.cache_offline:
+                raise IOError('Tile %s is not available in the offline '
+                              'cache.' % str(tile))
+
         if six.PY3:
             from urllib.request import urlopen, Request
         else:
@@ -169,8 +330,30 @@ class GoogleWTS(six.with_metaclass(ABCMeta, object)):
         req.add_header('User-agent', 'your bot 0.1')
         fh = urlopen(req)
 
-        im_data = six.BytesIO(fh.read())
+        im_data = fh.read()
         fh.close()
+
+        if self.cache_folder is not None:
+            # write the tile with an atomic rename (shared by processes)
+            file_folder = os.path.dirname(file_path)
+            if not os.path.exists(file_folder):
+                os.makedirs(file_folder, exist_ok=True)
+            file_handle, file_tmp = tempfile.mkstemp(dir=file_folder,
+                                                     suffix='.tmp')
+            try:
+                with os.fdopen(file_handle, 'wb') as file_obj:
+                    file_obj.write(im_data)
+                os.replace(file_tmp, file_path)
+            finally:
+                # remove the temporary file if the write is not completed
+                if os.path.exists(file_tmp):
+                    os.remove(file_tmp)
+            self.cache_updated = True
+
+        return im_data
+
+    def get_image(self, tile):
+        im_data = six.BytesIO(self.get_image_data(tile))
         img = Image.open(im_data)
 
         img = img.convert(self.desired_tile_form)
@@ -93,11 +93,15 @@ def main():
 
     # -------------------------------------------------------------------------------------
     # Driver and methods of static datasets
+    alg_parallel = None
+    if 'parallel' in list(data_settings['algorithm'].keys()):
+        alg_parallel = data_settings['algorithm']['parallel']
     driver_data_static = DriverStatic(
         src_dict=data_settings['data']['static']['source'],
         dst_dict=data_settings['data']['static']['destination'],
         alg_info=data_settings['algorithm']['info'],
         alg_template=data_settings['algorithm']['template'],
+        alg_parallel=alg_parallel,
         flag_cleaning_static=data_settings['algorithm']['flags']['cleaning_static']
     )
     static_data_collection = driver_data_static.organize_static()
@@ -762,6 +762,7 @@ class DriverDynamic:
 
         if run_time_reference is not None:
 
+            run_time_reference = run_time_reference.rename(self.coord_name_time)
             run_time_dict = {self.coord_name_time: run_time_reference}
             run_dframe_reference = pd.DataFrame(index=run_time_reference)
 
@@ -778,6 +779,13 @@ class DriverDynamic:
             run_analysis_collections = {}
             if not os.path.exists(run_file_path):
 
+                # index the section attributes by domain and name (first row if duplicated)
+                section_collections = {}
+                for section_dict in static_data_section.reset_index().to_dict('records'):
+                    section_key = (section_dict['section_domain'], section_dict['section_name'])
+                    if section_key not in section_collections:
+                        section_collections[section_key] = section_dict
+
                 for run_type_key, run_type_fields in run_data_collections.items():
 
                     log_stream.info(' -----> Run "' + run_type_key + '"  ... ')
@@ -798,6 +806,16 @@ class DriverDynamic:
 
                         log_stream.info(' -----> Description: "' + run_description + '" ')
 
+                        # map the run time steps onto the reference time range (once for all the variables)
+                        run_var_timeidx = pd.DatetimeIndex(run_type_time)
+                        run_var_timepos = run_time_reference.get_indexer(run_var_timeidx)
+                        if run_var_timeidx.is_unique and np.all(run_var_timepos >= 0):
+                            run_var_aligned = True
+                        else:
+                            log_stream.warning(' ===> Run time steps are not aligned with the reference time range. '
+                                               'Time-series will be merged using the union of the time steps')
+                            run_var_aligned = False
+
                         for run_domain_key, run_domain_fields in run_type_workspace.items():
 
                             log_stream.info(' ------> Domain: "' + run_domain_key + '" ... ')
@@ -806,10 +824,11 @@ class DriverDynamic:
 
                                 if run_domain_key in self.run_point_name:
                                     section_domain, section_name = run_domain_key.split(self.str_delimiter)
-                                    section_data = static_data_section.loc[
-                                        (static_data_section['section_domain'] == section_domain) &
-                                        (static_data_section['section_name'] == section_name)]
-                                    section_dict = section_data.reset_index().to_dict('r')[0]
+                                    if (section_domain, section_name) not in section_collections:
+                                        log_stream.error(' ===> Section "' + run_domain_key +
+                                                         '" is not available in the static datasets')
+                                        raise IOError('Section must be defined in the static datasets')
+                                    section_dict = section_collections[(section_domain, section_name)]
                                 else:
                                     section_dict = {}
 
@@ -828,19 +847,21 @@ class DriverDynamic:
                                     if run_var_limits[1] is not None:
                                         run_var_array[run_var_array > run_var_limits[1]] = np.nan
 
-                                    if run_var_array.shape[0] == 1:
-                                        run_var_list = run_var_array.tolist()[0]
-                                    elif run_var_array.shape[0] > 1:
-                                        run_var_list = run_var_array.T.tolist()
-                                    run_var_timeidx = pd.DatetimeIndex(run_type_time)
-                                    run_dframe_var = pd.DataFrame(data=run_var_list, index=run_var_timeidx)
+                                    if run_var_array.ndim == 1:
+                                        run_var_array = run_var_array.reshape([1, run_var_array.shape[0]])
 
-                                    run_dframe_filled = pd.merge(run_dframe_reference, run_dframe_var,
-                                                                 how='outer', left_index=True, right_index=True)
-                                    run_dframe_filled.index.name = self.coord_name_time
-
-                                    run_datetimeidx_filled = run_dframe_filled.index
-                                    run_values_filled = run_dframe_filled.values
+                                    if run_var_aligned:
+                                        # scatter the values in the reference time range
+                                        run_values_filled = np.zeros(
+                                            [run_time_reference.shape[0], run_var_array.shape[0]], dtype=np.float64)
+                                        run_values_filled[:, :] = np.nan
+                                        run_values_filled[run_var_timepos, :] = run_var_array.T
+                                    else:
+                                        run_dframe_var = pd.DataFrame(data=run_var_array.T.astype(np.float64),
+                                                                      index=run_var_timeidx)
+                                        run_dframe_filled = pd.merge(run_dframe_reference, run_dframe_var,
+                                                                     how='outer', left_index=True, right_index=True)
+                                        run_values_filled = run_dframe_filled.values
 
                                     if run_domain_key not in list(run_analysis_collections.keys()):
                                         run_analysis_collections[run_domain_key] = {}
@@ -14,7 +14,8 @@ import os
 
 from lib_data_geo_ascii import read_data_grid
 from lib_data_geo_shapefile import read_data_section
-from lib_utils_geo import compute_section_mask, compute_section_area, order_section_area
+from lib_utils_geo import compute_section_mask, compute_section_area, compute_section_area_accumulation, \
+    order_section_area
 from lib_utils_io import read_obj, write_obj
 from lib_utils_system import fill_tags2string, make_folder, join_path
 
@@ -38,11 +39,11 @@ class DriverStatic:
     # Initialize class
     def __init__(self, src_dict, dst_dict=None,
                  alg_ancillary=None,
-                 alg_info=None, alg_template=None,
+                 alg_info=None, alg_template=None, alg_parallel=None,
                  flag_terrain_data='terrain',
                  flag_river_network_data='river_network', flag_flow_directions_data='flow_directions',
                  flag_section_data='sections', flag_table_graph_data='table_graph_lut',
-                 flag_info_data='info',
+                 flag_info_data='info', flag_section_cache_data='section_cache',
                  flag_static_source='source', flag_static_destination='destination',
                  flag_cleaning_static=True):
 
@@ -52,6 +53,7 @@ class DriverStatic:
         self.flag_flow_directions_data = flag_flow_directions_data
         self.flag_table_graph_data = flag_table_graph_data
         self.flag_info_data = flag_info_data
+        self.flag_section_cache_data = flag_section_cache_data
 
         self.flag_static_source = flag_static_source
         self.flag_static_destination = flag_static_destination
@@ -97,8 +99,27 @@ class DriverStatic:
         file_path_info_dst = join_path(folder_name_info_dst, file_name_info_dst)
         self.file_path_info_dst = self.define_static_file_name(file_path_info_dst)
 
+        # section catchments cache (kept when the static info datasets are cleaned)
+        if self.flag_section_cache_data in list(dst_dict.keys()):
+            folder_name_section_cache_dst = dst_dict[self.flag_section_cache_data][self.folder_name_tag]
+            file_name_section_cache_dst = dst_dict[self.flag_section_cache_data][self.file_name_tag]
+            file_path_section_cache_dst = join_path(folder_name_section_cache_dst, file_name_section_cache_dst)
+            self.file_path_section_cache_dst = self.define_static_file_name(file_path_section_cache_dst)
+        else:
+            self.file_path_section_cache_dst = os.path.splitext(self.file_path_info_dst)[0] + '.section_cache'
+
         self.flag_cleaning_static = flag_cleaning_static
 
+        self.section_area_method = 'catchment'
+        if alg_info is not None:
+            if 'section_area_method' in list(alg_info.keys()):
+                self.section_area_method = alg_info['section_area_method']
+
+        self.section_workers = 1
+        if alg_parallel is not None:
+            if 'section_workers' in list(alg_parallel.keys()):
+                self.section_workers = alg_parallel['section_workers']
+
         self.str_delimited = ':'
 
     # -------------------------------------------------------------------------------------
@@ -147,8 +168,30 @@ class DriverStatic:
             # terrain_da=da_terrain, section_dframe=df_section)
 
             # Compute section area
-            df_section_selected = compute_section_area(
-                da_flow_directions, terrain_da=da_terrain, section_dframe=df_section_selected)
+            if self.section_area_method == 'accumulation':
+                # Compute section area using the flow accumulation
+                df_section_selected = compute_section_area_accumulation(
+                    da_flow_directions, terrain_da=da_terrain, section_dframe=df_section_selected)
+
+            elif self.section_area_method == 'catchment':
+                # Read section catchments cache
+                obj_section_cache = read_obj(self.file_path_section_cache_dst)
+                if obj_section_cache is None:
+                    obj_section_cache = {}
+
+                # Compute section area using the section catchments
+                df_section_selected = compute_section_area(
+                    da_flow_directions, terrain_da=da_terrain, section_dframe=df_section_selected,
+                    section_cache=obj_section_cache, section_workers=self.section_workers)
+
+                # Write section catchments cache
+                folder_name_section_cache, file_name_section_cache = os.path.split(self.file_path_section_cache_dst)
+                make_folder(folder_name_section_cache)
+                write_obj(self.file_path_section_cache_dst, obj_section_cache)
+
+            else:
+                log_stream.error(' ===> Section area method "' + self.section_area_method + '" is not supported')
+                raise NotImplementedError('Case not implemented yet')
             # Order section area (using a area rule)
             df_section_selected = order_section_area(df_section_selected)
 
@@ -168,8 +211,8 @@ class DriverStatic:
             log_stream.info(' ----> Organize static datasets ... DONE')
 
         else:
-            # Read info datasets
-            static_data_collections = read_obj(file_path_info)
+            # Read info datasets (grids mapped in memory and shared by the processes using the same file)
+            static_data_collections = read_obj(file_path_info, file_mmap=True)
             # Info end
             log_stream.info(' ----> Organize static datasets ... LOADED. Info datasets created previously')
 
@@ -80,7 +80,7 @@ def read_file_hydrograph_ts(file_name, file_sep=',',
                             tag_time_out='time_period',
                             tag_discharge_obs_out='discharge_observed',
                             tag_discharge_sim_out='discharge_simulated',
-                            tag_index='time_period'):
+                            tag_index='time_period', time_format='%Y-%m-%d %H:%M'):
 
     if os.path.exists(file_name):
         with open(file_name) as file_handle:
@@ -96,20 +96,14 @@ def read_file_hydrograph_ts(file_name, file_sep=',',
         if tag_discharge_sim_in in keys_step:
             tag_discharge_sim_in_select.append(keys_step)
 
-            tag_diff_tmp = [li for li in difflib.ndiff(keys_step, tag_discharge_sim_in) if li[0] != ' ']
-            tag_diff_element = ''.join([tag_step[1:].strip() for tag_step in tag_diff_tmp])
-            tag_diff_idx = keys_step.find(tag_diff_element)
-
-            if tag_discharge_sim_out.__len__() == tag_diff_idx:
-                tag_discharge_sim_out_step = tag_discharge_sim_out[:tag_diff_idx] + tag_diff_element
-            elif tag_discharge_sim_out.__len__() > tag_diff_idx:
-                tag_discharge_sim_out_step = tag_discharge_sim_out + tag_diff_element
-            elif tag_discharge_sim_out.__len__() < tag_diff_idx:
-                tag_discharge_sim_out_step = tag_discharge_sim_out + tag_diff_element
+            # get the ensemble suffix (e.g. "_001") from the key prefix; use difflib only for unexpected keys
+            if keys_step.startswith(tag_discharge_sim_in):
+                tag_diff_element = keys_step[tag_discharge_sim_in.__len__():]
             else:
-                log_stream.error(' ===> Error in create tags for outcome variable')
-                raise NotImplementedError('Case not implemented yet')
+                tag_diff_tmp = [li for li in difflib.ndiff(keys_step, tag_discharge_sim_in) if li[0] != ' ']
+                tag_diff_element = ''.join([tag_step[1:].strip() for tag_step in tag_diff_tmp])
 
+            tag_discharge_sim_out_step = tag_discharge_sim_out + tag_diff_element
             tag_discharge_sim_out_select.append(tag_discharge_sim_out_step)
 
     variable_list_in = [tag_time_in, tag_discharge_obs_in]
@@ -130,9 +124,9 @@ def read_file_hydrograph_ts(file_name, file_sep=',',
     for file_key, file_value_tmp in file_data_dict.items():
         file_list_tmp = file_value_tmp.split(file_sep)
         if file_key == tag_time_out:
-            file_list_converted = pd.DatetimeIndex(file_list_tmp)
+            file_list_converted = convert_time_series(file_list_tmp, time_format=time_format)
         else:
-            file_list_converted = list(map(float, file_list_tmp))
+            file_list_converted = np.array(file_list_tmp, dtype=np.float64)
         file_data_dict[file_key] = file_list_converted
 
     file_data_df = pd.DataFrame(data=file_data_dict)
@@ -143,6 +137,19 @@ def read_file_hydrograph_ts(file_name, file_sep=',',
 # -------------------------------------------------------------------------------------
 
 
+# -------------------------------------------------------------------------------------
+# Method to convert time series (using a fixed format and the generic parser as fallback)
+def convert_time_series(time_list, time_format='%Y-%m-%d %H:%M'):
+    if time_format is not None:
+        try:
+            return pd.DatetimeIndex(pd.to_datetime(time_list, format=time_format))
+        except (ValueError, TypeError):
+            log_stream.warning(' ===> Time series is not in the "' + time_format +
+                               '" format. Generic time parser will be used')
+    return pd.DatetimeIndex(time_list)
+# -------------------------------------------------------------------------------------
+
+
 # -------------------------------------------------------------------------------------
 # Method to read file settings
 def read_file_settings(file_name):
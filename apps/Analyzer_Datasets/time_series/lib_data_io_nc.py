@@ -13,6 +13,7 @@ import os
 
 from copy import deepcopy
 
+import netCDF4
 import numpy as np
 import xarray as xr
 import pandas as pd
@@ -130,48 +131,98 @@ def read_file_collections(file_name_list, variable_name_common=None, attr_name_c
     if attr_name_common is None:
         attr_name_common = ['run_var', 'run_mode']
 
-    file_header_collections = {}
-    file_data_collections = {}
-    file_attrs_collections = {}
+    # scan file(s) to get the rows of the variable(s) stacked over the file(s) (as in np.vstack)
+    file_name_valid = []
+    variable_rows_collections = {}
     for file_name_step in file_name_list:
 
-        if os.path.exists(file_name_step):
-            file_dset = xr.open_dataset(file_name_step)
-            attrs_dset = file_dset.attrs
-        else:
+        if not os.path.exists(file_name_step):
             log_stream.warning(' ===> File ' + file_name_step + ' not found!')
-
-        # Iterate over file attributes
-        for attr_key, attr_value in attrs_dset.items():
-
-            if attr_key not in list(file_attrs_collections.keys()):
-                file_attrs_collections[attr_key] = attr_value
-            elif (attr_key in list(file_attrs_collections.keys())) and (attr_key in attr_name_common):
-                tmp_value = file_attrs_collections[attr_key]
-                if not isinstance(tmp_value, list):
-                    tmp_value = [tmp_value, attr_value]
-                elif isinstance(tmp_value, list):
-                    tmp_value.append(attr_value)
-                file_attrs_collections[attr_key] = tmp_value
-
-        # Iterate over file variable(s)
-        variable_name_list = list(file_dset.data_vars)
-        for variable_name_step in variable_name_list:
-
-            variable_data_step = file_dset[variable_name_step].values
-
-            if variable_name_step in variable_name_common:
-                if variable_name_step not in list(file_header_collections.keys()):
-                    file_header_collections[variable_name_step] = variable_data_step
-
-            if (variable_name_step not in list(file_data_collections.keys())) and \
-                    (variable_name_step not in variable_name_common):
-                file_data_collections[variable_name_step] = variable_data_step
-            elif (variable_name_step in list(file_data_collections.keys())) and \
-                    (variable_name_step not in variable_name_common):
-                variable_data_tmp = deepcopy(file_data_collections[variable_name_step])
-                variable_data_stack = np.vstack((variable_data_tmp, variable_data_step))
-                file_data_collections[variable_name_step] = variable_data_stack
+            continue
+        file_name_valid.append(file_name_step)
+
+        with netCDF4.Dataset(file_name_step, mode='r') as file_handle:
+            for variable_name_step, variable_handle in file_handle.variables.items():
+                if variable_name_step in variable_name_common:
+                    continue
+                if variable_handle.dtype == str or variable_handle.dtype == np.dtype('S1'):
+                    variable_rows_step = None
+                elif variable_handle.ndim >= 2:
+                    variable_rows_step = variable_handle.shape[0]
+                else:
+                    variable_rows_step = 1
+                if variable_name_step not in list(variable_rows_collections.keys()):
+                    variable_rows_collections[variable_name_step] = []
+                variable_rows_collections[variable_name_step].append(variable_rows_step)
+
+    # fill the variable(s) in preallocated array(s) (one file opened at a time)
+    file_header_collections = {}
+    file_data_collections = {}
+    file_attrs_collections = {}
+    variable_stack_collections = {}
+    for file_name_step in file_name_valid:
+
+        with xr.open_dataset(file_name_step) as file_dset:
+
+            # Iterate over file attributes
+            for attr_key, attr_value in file_dset.attrs.items():
+
+                if attr_key not in list(file_attrs_collections.keys()):
+                    file_attrs_collections[attr_key] = attr_value
+                elif (attr_key in list(file_attrs_collections.keys())) and (attr_key in attr_name_common):
+                    tmp_value = file_attrs_collections[attr_key]
+                    if not isinstance(tmp_value, list):
+                        tmp_value = [tmp_value, attr_value]
+                    elif isinstance(tmp_value, list):
+                        tmp_value.append(attr_value)
+                    file_attrs_collections[attr_key] = tmp_value
+
+            # Iterate over file variable(s)
+            variable_name_list = set(file_dset.data_vars)
+            for variable_name_step, variable_obj_step in file_dset.variables.items():
+
+                if variable_name_step not in variable_name_list:
+                    continue
+
+                variable_data_step = variable_obj_step.values
+
+                if variable_name_step in variable_name_common:
+                    if variable_name_step not in list(file_header_collections.keys()):
+                        file_header_collections[variable_name_step] = variable_data_step
+                    continue
+
+                variable_rows_list = variable_rows_collections[variable_name_step]
+                if len(variable_rows_list) == 1:
+                    file_data_collections[variable_name_step] = variable_data_step
+                    continue
+
+                variable_data_step = np.atleast_2d(variable_data_step)
+                if None in variable_rows_list:
+                    # rows are not known before decoding the variable (stacked at the end)
+                    if variable_name_step not in list(variable_stack_collections.keys()):
+                        variable_stack_collections[variable_name_step] = []
+                    variable_stack_collections[variable_name_step].append(variable_data_step)
+                    continue
+
+                if variable_name_step not in list(file_data_collections.keys()):
+                    file_data_collections[variable_name_step] = np.empty(
+                        (sum(variable_rows_list), ) + variable_data_step.shape[1:], dtype=variable_data_step.dtype)
+                    variable_stack_collections[variable_name_step] = 0
+
+                variable_data_stack = file_data_collections[variable_name_step]
+                if variable_data_stack.dtype != np.result_type(variable_data_stack.dtype, variable_data_step.dtype):
+                    variable_data_stack = variable_data_stack.astype(
+                        np.result_type(variable_data_stack.dtype, variable_data_step.dtype))
+                    file_data_collections[variable_name_step] = variable_data_stack
+
+                variable_row_start = variable_stack_collections[variable_name_step]
+                variable_row_end = variable_row_start + variable_data_step.shape[0]
+                variable_data_stack[variable_row_start:variable_row_end] = variable_data_step
+                variable_stack_collections[variable_name_step] = variable_row_end
+
+    for variable_name_step, variable_stack_step in variable_stack_collections.items():
+        if isinstance(variable_stack_step, list):
+            file_data_collections[variable_name_step] = np.vstack(variable_stack_step)
 
     return file_header_collections, file_data_collections, file_attrs_collections
 # -------------------------------------------------------------------------------------
@@ -10,8 +10,11 @@ Version:       '1.0.0'
 #################################################################################
 # Libraries
 import logging
+import hashlib
 import pyproj
 
+from concurrent.futures import ProcessPoolExecutor
+
 from pysheds.grid import Grid
 
 import numpy as np
@@ -22,28 +25,20 @@ pd.options.mode.chained_assignment = None
 
 from lib_info_args import logger_name
 
+# Logging
+log_stream = logging.getLogger(logger_name)
+
+# Grid used by the catchment workers (initialized once per process)
+section_grid_obj = None
+
 # Debug
 import matplotlib.pylab as plt
 #################################################################################
 
 
 # --------------------------------------------------------------------------------
-# Method to define section mask
-def compute_section_mask(fdir_da, fdir_map=None, fdir_nodata=0, terrain_da=None, section_dframe=None,
-                         str_delimiter=':'):
-
-    fdir_values = fdir_da.values
-
-    if fdir_map is None:
-        fdir_map = [8, 9, 6, 3, 2, 1, 4, 7]
-
-    geo_values = terrain_da.values
-    geo_longitude = terrain_da['west_east'].values
-    geo_latitude = terrain_da['south_north'].values
-    geo_transform = terrain_da.attrs['transform']
-    geo_crs = terrain_da.attrs['crs']
-
-    grid_longitude, grid_latitude = np.meshgrid(geo_longitude, geo_latitude)
+# Method to define the flow directions grid
+def define_section_grid(fdir_values, geo_transform, geo_crs, fdir_nodata=0):
 
     mask_values = np.zeros([fdir_values.shape[0], fdir_values.shape[1]], dtype=bool)
     mask_values[:, :] = True
@@ -58,31 +53,141 @@ def compute_section_mask(fdir_da, fdir_map=None, fdir_nodata=0, terrain_da=None,
                           crs=pyproj.Proj(geo_crs),
                           nodata=False)
 
+    return grid
+
+# --------------------------------------------------------------------------------
+
+
+# --------------------------------------------------------------------------------
+# Method to initialize the catchment worker
+def init_section_worker(fdir_values, geo_transform, geo_crs, fdir_nodata=0):
+    global section_grid_obj
+    section_grid_obj = define_section_grid(fdir_values, geo_transform, geo_crs, fdir_nodata=fdir_nodata)
+# --------------------------------------------------------------------------------
+
+
+# --------------------------------------------------------------------------------
+# Method to compute section catchment (flat indexes of the catchment cells)
+def compute_section_catchment(section_args):
+
+    section_x, section_y, fdir_map = section_args
+
+    grid = section_grid_obj
+    grid.catchment(data=grid.fdir, x=section_x, y=section_y,
+                   dirmap=fdir_map, out_name='section_mask',
+                   recursionlimit=15000, nodata_out=0, ytype='index')
+
+    section_values = np.array(grid.section_mask)
+    section_idx = np.flatnonzero(section_values >= 1).astype(np.int32)
+
+    return section_idx
+
+# --------------------------------------------------------------------------------
+
+
+# --------------------------------------------------------------------------------
+# Method to define the hash of the flow directions grid
+def define_section_hash(fdir_values, fdir_map, geo_transform):
+
+    fdir_hash = hashlib.sha1()
+    fdir_hash.update(np.ascontiguousarray(fdir_values).tobytes())
+    fdir_hash.update(str(fdir_values.shape).encode('utf-8'))
+    fdir_hash.update(str(list(fdir_map)).encode('utf-8'))
+    fdir_hash.update(str(list(geo_transform)[:6]).encode('utf-8'))
+
+    return fdir_hash.hexdigest()
+
+# --------------------------------------------------------------------------------
+
+
+# --------------------------------------------------------------------------------
+# Method to compute section catchments (using the cache and a process pool for the missing sections)
+def compute_section_catchments(fdir_da, fdir_map=None, fdir_nodata=0, terrain_da=None, section_dframe=None,
+                               section_cache=None, section_workers=1):
+
+    fdir_values = fdir_da.values
+
+    if fdir_map is None:
+        fdir_map = [8, 9, 6, 3, 2, 1, 4, 7]
+    if section_cache is None:
+        section_cache = {}
+
+    geo_transform = terrain_da.attrs['transform']
+    geo_crs = terrain_da.attrs['crs']
+
+    # remove the sections computed with a different flow directions grid
+    fdir_hash = define_section_hash(fdir_values, fdir_map, geo_transform)
+    for section_key in list(section_cache.keys()):
+        if section_key[0] != fdir_hash:
+            section_cache.pop(section_key)
+
+    section_list = []
+    for section_id, section_fields in section_dframe.iterrows():
+        section_x = int(section_fields['hmc_idx_y']) - 1
+        section_y = int(section_fields['hmc_idx_x']) - 1
+        if (section_x, section_y) not in section_list:
+            section_list.append((section_x, section_y))
+
+    section_list_missing = [section_xy for section_xy in section_list
+                            if (fdir_hash, ) + section_xy not in section_cache]
+
+    log_stream.info(' -----> Section catchments: ' + str(len(section_list) - len(section_list_missing)) +
+                    ' cached, ' + str(len(section_list_missing)) + ' to compute ... ')
+
+    if section_list_missing:
+        section_args = [(section_x, section_y, fdir_map) for section_x, section_y in section_list_missing]
+        if section_workers is None or section_workers <= 1:
+            init_section_worker(fdir_values, geo_transform, geo_crs, fdir_nodata=fdir_nodata)
+            section_idx_list = [compute_section_catchment(section_arg) for section_arg in section_args]
+        else:
+            section_chunk = max(1, len(section_args) // (section_workers * 4))
+            with ProcessPoolExecutor(max_workers=section_workers, initializer=init_section_worker,
+                                     initargs=(fdir_values, geo_transform, geo_crs, fdir_nodata)) as executor:
+                section_idx_list = list(executor.map(compute_section_catchment, section_args,
+                                                     chunksize=section_chunk))
+
+        for section_xy, section_idx in zip(section_list_missing, section_idx_list):
+            section_cache[(fdir_hash, ) + section_xy] = section_idx
+
+    log_stream.info(' -----> Section catchments: ' + str(len(section_list) - len(section_list_missing)) +
+                    ' cached, ' + str(len(section_list_missing)) + ' to compute ... DONE')
+
+    section_catchments = {}
+    for section_xy in section_list:
+        section_catchments[section_xy] = section_cache[(fdir_hash, ) + section_xy]
+
+    return section_catchments
+
+# --------------------------------------------------------------------------------
+
+
+# --------------------------------------------------------------------------------
+# Method to define section mask
+def compute_section_mask(fdir_da, fdir_map=None, fdir_nodata=0, terrain_da=None, section_dframe=None,
+                         str_delimiter=':', section_cache=None, section_workers=1):
+
+    geo_values = terrain_da.values
+    geo_longitude = terrain_da['west_east'].values
+    geo_latitude = np.flipud(terrain_da['south_north'].values)
+
+    section_catchments = compute_section_catchments(
+        fdir_da, fdir_map=fdir_map, fdir_nodata=fdir_nodata, terrain_da=terrain_da, section_dframe=section_dframe,
+        section_cache=section_cache, section_workers=section_workers)
+
     section_obj = {}
     for section_id, section_fields in section_dframe.iterrows():
 
-        section_idx_y = section_fields['hmc_idx_x']
-        section_idx_x = section_fields['hmc_idx_y']
         section_name = section_fields['section_name']
         section_domain = section_fields['section_domain']
-        # section_drained_area_db = section_fields['section_drained_area']
         section_tag = str_delimiter.join([section_domain, section_name])
 
-        section_x = section_idx_x - 1
-        section_y = section_idx_y - 1
-        section_mask = 'section_mask'
-
-        grid.catchment(data=grid.fdir, x=section_x, y=section_y,
-                       dirmap=fdir_map, out_name=section_mask,
-                       recursionlimit=15000, nodata_out=0, ytype='index')
+        section_x = int(section_fields['hmc_idx_y']) - 1
+        section_y = int(section_fields['hmc_idx_x']) - 1
+        section_idx = section_catchments[(section_x, section_y)]
 
-        section_mask = np.array(grid.section_mask).astype(np.float32)
-
-        section_mask[section_mask == 0] = 0
+        section_mask = np.zeros(geo_values.shape, dtype=np.float32)
+        section_mask.flat[section_idx] = 1
         section_mask[geo_values < 0] = 0
-        section_mask[section_mask >= 1] = 1
-
-        geo_latitude = np.flipud(geo_latitude)
 
         section_da = create_darray_2d(section_mask, geo_longitude, geo_latitude,
                                       coord_name_x='Longitude', coord_name_y='Latitude',
@@ -102,63 +207,35 @@ def compute_section_mask(fdir_da, fdir_map=None, fdir_nodata=0, terrain_da=None,
 def compute_section_area(fdir_da, fdir_map=None, fdir_nodata=0, terrain_da=None, section_dframe=None,
                          drainage_area_tag='section_drainage_area_cmp',
                          drainage_area_units='Km^2', drainage_area_rounding=1,
-                         str_delimiter=':'):
-
-    fdir_values = fdir_da.values
-
-    if fdir_map is None:
-        fdir_map = [8, 9, 6, 3, 2, 1, 4, 7]
+                         str_delimiter=':', section_cache=None, section_workers=1):
 
     geo_values = terrain_da.values
     geo_longitude = terrain_da['west_east'].values
     geo_latitude = terrain_da['south_north'].values
     geo_transform = terrain_da.attrs['transform']
-    geo_crs = terrain_da.attrs['crs']
 
     grid_longitude, grid_latitude = np.meshgrid(geo_longitude, geo_latitude)
     area_cell_values = compute_cell_area(grid_longitude, grid_latitude,
                                          np.abs(geo_transform[0]), np.abs(geo_transform[4]))
+    area_cell_values = np.where(geo_values < 0, 0.0, area_cell_values).ravel()
 
-    mask_values = np.zeros([fdir_values.shape[0], fdir_values.shape[1]], dtype=bool)
-    mask_values[:, :] = True
-
-    grid = Grid()
-    grid.add_gridded_data(data=fdir_values, data_name='fdir',
-                          affine=geo_transform,
-                          crs=pyproj.Proj(geo_crs),
-                          nodata=fdir_nodata)
-    grid.add_gridded_data(data=mask_values, data_name='mask',
-                          affine=geo_transform,
-                          crs=pyproj.Proj(geo_crs),
-                          nodata=False)
+    section_catchments = compute_section_catchments(
+        fdir_da, fdir_map=fdir_map, fdir_nodata=fdir_nodata, terrain_da=terrain_da, section_dframe=section_dframe,
+        section_cache=section_cache, section_workers=section_workers)
 
     section_data_default = np.zeros([section_dframe.shape[0]])
     section_data_default[:] = np.nan
     section_dframe[drainage_area_tag] = section_data_default
     for section_id, section_fields in section_dframe.iterrows():
 
-        section_idx_y = int(section_fields['hmc_idx_x'])
-        section_idx_x = int(section_fields['hmc_idx_y'])
         section_name = section_fields['section_name']
         section_domain = section_fields['section_domain']
-        section_drainage_area_db = section_fields['section_drained_area']
-        section_tag = str_delimiter.join([section_domain, section_name])
-
-        section_x = section_idx_x - 1
-        section_y = section_idx_y - 1
-        section_mask = 'section_mask'
-
-        grid.catchment(data=grid.fdir, x=section_x, y=section_y,
-                       dirmap=fdir_map, out_name=section_mask,
-                       recursionlimit=15000, nodata_out=0, ytype='index')
-
-        section_mask = np.array(grid.section_mask).astype(np.float32)
 
-        section_mask[section_mask == 0] = 0
-        section_mask[geo_values < 0] = 0
-        section_mask[section_mask >= 1] = 1
+        section_x = int(section_fields['hmc_idx_y']) - 1
+        section_y = int(section_fields['hmc_idx_x']) - 1
+        section_idx = section_catchments[(section_x, section_y)]
 
-        section_drained_area_cmp = np.sum(area_cell_values * section_mask)
+        section_drained_area_cmp = np.sum(area_cell_values[section_idx])
 
         if drainage_area_units == 'Km^2':
             section_drained_area_cmp = np.float32(section_drained_area_cmp / 1000000)
@@ -178,6 +255,96 @@ def compute_section_area(fdir_da, fdir_map=None, fdir_nodata=0, terrain_da=None,
 # --------------------------------------------------------------------------------
 
 
+# --------------------------------------------------------------------------------
+# Method to compute flow accumulation (weighted by the cell values and ordered upstream to downstream)
+def compute_flow_accumulation(fdir_values, fdir_map=None, weight_values=None):
+
+    if fdir_map is None:
+        fdir_map = [8, 9, 6, 3, 2, 1, 4, 7]
+    # offsets (row, col) of the directions in the order N, NE, E, SE, S, SW, W, NW (pysheds dirmap)
+    fdir_offsets = [(-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1)]
+
+    fdir_rows, fdir_cols = fdir_values.shape
+    fdir_n = fdir_rows * fdir_cols
+    if weight_values is None:
+        weight_values = np.ones([fdir_rows, fdir_cols])
+
+    # define downstream cell of each cell (-1 for outlets, outside cells and nodata)
+    cell_rows, cell_cols = np.indices([fdir_rows, fdir_cols])
+    cell_down = np.zeros([fdir_n], dtype=np.int64)
+    cell_down[:] = -1
+    for fdir_value, (fdir_off_y, fdir_off_x) in zip(fdir_map, fdir_offsets):
+        fdir_select = fdir_values == fdir_value
+        down_rows, down_cols = cell_rows[fdir_select] + fdir_off_y, cell_cols[fdir_select] + fdir_off_x
+        down_valid = (down_rows >= 0) & (down_rows < fdir_rows) & (down_cols >= 0) & (down_cols < fdir_cols)
+        cell_down[np.flatnonzero(fdir_select)[down_valid]] = down_rows[down_valid] * fdir_cols + down_cols[down_valid]
+
+    # accumulate from the cells without upstream cells to the outlets (one vectorized step per front)
+    flow_acc = np.array(weight_values, dtype=np.float64).ravel()
+    cell_indegree = np.bincount(cell_down[cell_down >= 0], minlength=fdir_n)
+    cell_front = np.flatnonzero(cell_indegree == 0)
+    cell_count = 0
+    while cell_front.size > 0:
+        cell_count += cell_front.size
+        cell_front = cell_front[cell_down[cell_front] >= 0]
+        cell_front_down = cell_down[cell_front]
+        np.add.at(flow_acc, cell_front_down, flow_acc[cell_front])
+        np.subtract.at(cell_indegree, cell_front_down, 1)
+        cell_front_down = np.unique(cell_front_down)
+        cell_front = cell_front_down[cell_indegree[cell_front_down] == 0]
+
+    if cell_count < fdir_n:
+        log_stream.warning(' ===> Flow directions include ' + str(fdir_n - cell_count) +
+                           ' cells in loops. The accumulation is not defined downstream the loops')
+
+    flow_acc = flow_acc.reshape([fdir_rows, fdir_cols])
+
+    return flow_acc
+
+# --------------------------------------------------------------------------------
+
+
+# --------------------------------------------------------------------------------
+# Method to define section area using the flow accumulation (one grid pass for all the sections)
+def compute_section_area_accumulation(fdir_da, fdir_map=None, terrain_da=None, section_dframe=None,
+                                      drainage_area_tag='section_drainage_area_cmp',
+                                      drainage_area_units='Km^2', drainage_area_rounding=1):
+
+    fdir_values = fdir_da.values
+
+    geo_values = terrain_da.values
+    geo_longitude = terrain_da['west_east'].values
+    geo_latitude = terrain_da['south_north'].values
+    geo_transform = terrain_da.attrs['transform']
+
+    grid_longitude, grid_latitude = np.meshgrid(geo_longitude, geo_latitude)
+    area_cell_values = compute_cell_area(grid_longitude, grid_latitude,
+                                         np.abs(geo_transform[0]), np.abs(geo_transform[4]))
+    area_cell_values = np.where(geo_values < 0, 0.0, area_cell_values)
+
+    area_acc_values = compute_flow_accumulation(fdir_values, fdir_map=fdir_map, weight_values=area_cell_values)
+
+    section_x = section_dframe['hmc_idx_y'].values.astype(int) - 1
+    section_y = section_dframe['hmc_idx_x'].values.astype(int) - 1
+    section_drained_area_cmp = area_acc_values[section_y, section_x]
+
+    if drainage_area_units == 'Km^2':
+        section_drained_area_cmp = [
+            float(str(round(np.float32(section_area / 1000000), drainage_area_rounding)))
+            for section_area in section_drained_area_cmp]
+    elif drainage_area_units == 'm^2':
+        pass
+    else:
+        logging.error(' ===> Drainage area units are not allowed')
+        raise IOError('Drainage area units are wrongly defined. Check your settings.')
+
+    section_dframe[drainage_area_tag] = section_drained_area_cmp
+
+    return section_dframe
+
+# --------------------------------------------------------------------------------
+
+
 # -------------------------------------------------------------------------------------
 # Method to order section area (according with domain and area values)
 def order_section_area(section_df,
@@ -100,6 +100,19 @@ def main():
     static_data_collection = driver_data_static.organize_static()
     # -------------------------------------------------------------------------------------
 
+    # -------------------------------------------------------------------------------------
+    # Get parallel and incremental flags (optional in the settings file)
+    alg_flags = data_settings['algorithm']['flags']
+    flag_parallel_dynamic_source, parallel_dynamic_workers = False, None
+    if 'parallel_dynamic_source' in list(alg_flags.keys()):
+        flag_parallel_dynamic_source = alg_flags['parallel_dynamic_source']
+    if 'parallel_dynamic_workers' in list(alg_flags.keys()):
+        parallel_dynamic_workers = alg_flags['parallel_dynamic_workers']
+    flag_incremental_dynamic = False
+    if 'incremental_dynamic' in list(alg_flags.keys()):
+        flag_incremental_dynamic = alg_flags['incremental_dynamic']
+    # -------------------------------------------------------------------------------------
+
     # -------------------------------------------------------------------------------------
     # Iterate over time range
     for time_step in time_range:
@@ -121,7 +134,10 @@ def main():
             flag_cleaning_dynamic_source=data_settings['algorithm']['flags']['cleaning_dynamic_source'],
             flag_cleaning_dynamic_analysis=data_settings['algorithm']['flags']['cleaning_dynamic_analysis'],
             flag_cleaning_dynamic_destination=data_settings['algorithm']['flags']['cleaning_dynamic_destination'],
-            flag_cleaning_dynamic_tmp=data_settings['algorithm']['flags']['cleaning_dynamic_tmp'])
+            flag_cleaning_dynamic_tmp=data_settings['algorithm']['flags']['cleaning_dynamic_tmp'],
+            flag_parallel_dynamic_source=flag_parallel_dynamic_source,
+            parallel_dynamic_workers=parallel_dynamic_workers,
+            flag_incremental_dynamic=flag_incremental_dynamic)
 
         dynamic_data_collection, \
             time_last_run_collection, time_period_collection = driver_data_dynamic.organize_dynamic_data()
@@ -15,14 +15,15 @@ import os
 import pandas as pd
 
 from copy import deepcopy
+from concurrent.futures import ThreadPoolExecutor
 
 from lib_utils_time import define_time_boundaries
 
 from lib_utils_io import read_obj, write_obj
-from lib_utils_system import fill_tags2string, make_folder
+from lib_utils_system import fill_tags2string, make_folder, exists_file, stat_file, refresh_file_index
 
 from lib_utils_exec import read_file_execution_info
-from lib_data_io_json import read_file_hydrograph_ts, read_file_hydrograph_info
+from lib_data_io_json import read_file_hydrograph, organize_file_hydrograph_info, define_file_hydrograph_cache
 
 from lib_bulletin_data_analysis import organize_bulletin_info
 from lib_bulletin_data_analysis import organize_bulletin_warnings_generic, organize_bulletin_warnings_section
@@ -57,11 +58,14 @@ class DriverDynamic:
                  tag_section_data='section_data', tag_execution_data='execution_data',
                  tag_src_reference_start='run_reference_start', tag_src_reference_end='run_reference_end',
                  tag_anc_source='run_source', tag_anc_analysis='run_analysis', tag_anc_destination='run_destination',
+                 tag_anc_incremental='run_incremental',
                  tag_dest_summary='run_summary',
                  tag_dest_warnings_maximum='run_warnings_maximum', tag_dest_warnings_daily='run_warnings_daily',
                  tag_section_name='section_name', tag_section_catchment='section_catchment',
                  flag_cleaning_dynamic_source=True, flag_cleaning_dynamic_analysis=True,
                  flag_cleaning_dynamic_destination=True, flag_cleaning_dynamic_tmp=True,
+                 flag_parallel_dynamic_source=False, parallel_dynamic_workers=None,
+                 flag_incremental_dynamic=False,
                  string_sep=':'):
 
         self.time_now = time_now
@@ -78,6 +82,7 @@ class DriverDynamic:
         self.tag_anc_source = tag_anc_source
         self.tag_anc_analysis = tag_anc_analysis
         self.tag_anc_destination = tag_anc_destination
+        self.tag_anc_incremental = tag_anc_incremental
         self.tag_dest_summary = tag_dest_summary
         self.tag_dest_warnings_maximum = tag_dest_warnings_maximum
         self.tag_dest_warnings_daily = tag_dest_warnings_daily
@@ -207,6 +212,11 @@ class DriverDynamic:
         self.file_name_anc_analysis = anc_dict[self.tag_anc_analysis][self.file_name_tag]
         self.folder_name_anc_destination = anc_dict[self.tag_anc_destination][self.folder_name_tag]
         self.file_name_anc_destination = anc_dict[self.tag_anc_destination][self.file_name_tag]
+        if self.tag_anc_incremental in list(anc_dict.keys()):
+            self.folder_name_anc_incremental = anc_dict[self.tag_anc_incremental][self.folder_name_tag]
+            self.file_name_anc_incremental = anc_dict[self.tag_anc_incremental][self.file_name_tag]
+        else:
+            self.folder_name_anc_incremental, self.file_name_anc_incremental = None, None
 
         # destination folder(s), file(s) and status
         self.folder_name_dest_summary = dest_dict[self.tag_dest_summary][self.folder_name_tag]
@@ -242,6 +252,12 @@ class DriverDynamic:
         self.file_path_anc_destination = self.define_file_string(
             self.time_run, os.path.join(self.folder_name_anc_destination, self.file_name_anc_destination),
             file_extra_variables=None, file_extra_collections=None)
+        if (self.folder_name_anc_incremental is not None) and (self.file_name_anc_incremental is not None):
+            self.file_path_anc_incremental = self.define_file_string(
+                self.time_run, os.path.join(self.folder_name_anc_incremental, self.file_name_anc_incremental),
+                file_extra_variables=None, file_extra_collections=None)
+        else:
+            self.file_path_anc_incremental = None
 
         # define file destination reference
         self.file_path_dest_summary = self.define_file_string(
@@ -267,6 +283,17 @@ class DriverDynamic:
         self.flag_cleaning_dynamic_analysis = flag_cleaning_dynamic_analysis
         self.flag_cleaning_dynamic_destination = flag_cleaning_dynamic_destination
         self.flag_cleaning_dynamic_tmp = flag_cleaning_dynamic_tmp
+        self.flag_parallel_dynamic_source = flag_parallel_dynamic_source
+        self.parallel_dynamic_workers = parallel_dynamic_workers
+        self.flag_incremental_dynamic = flag_incremental_dynamic
+        if self.flag_incremental_dynamic and (self.file_path_anc_incremental is None):
+            log_stream.warning(' ===> Incremental mode needs the "' + self.tag_anc_incremental +
+                               '" ancillary file. Incremental mode is disabled')
+            self.flag_incremental_dynamic = False
+
+        # incremental workspace (previous run) and manifest of the source file(s)
+        self.incremental_workspace = None
+        self.manifest_workspace = None
 
         # tags
         self.tag_time_period = 'time_period'
@@ -302,6 +329,8 @@ class DriverDynamic:
         self.tag_data = 'data'
         self.tag_time_ref_start = 'time_start'
         self.tag_time_ref_end = 'time_end'
+        self.tag_file_ref_start = 'file_start'
+        self.tag_file_ref_end = 'file_end'
 
         self.tag_file_time_reference = 'time_modified'
 
@@ -456,19 +485,38 @@ class DriverDynamic:
                         list_tmp.extend([key_step, value_step])
                         file_collections[id] = list_tmp
 
-            file_path_obj = []
-            for file_fields in file_collections.values():
-                file_keys = file_fields[0::2]
-                file_values = file_fields[1::2]
+            # fill all the collections at once (if aligned and without list or null values)
+            file_batch = (file_n is not None) and (file_n > 0) and all(
+                [(file_values.__len__() == file_n) and (None not in list(file_values))
+                 for file_values in file_values_list]) and not any(
+                [isinstance(file_value, list) for file_value in file_extra_variables.values()])
+
+            if file_batch:
+
+                alg_template_values = {**alg_template_values_raw,
+                                       **{file_key: list(file_values) for file_key, file_values in zip(
+                                           file_extra_collections.keys(), file_values_list)},
+                                       **file_extra_variables}
+
+                file_path_obj = fill_tags2string(file_path_raw, alg_template_tags, alg_template_values)
+                if not isinstance(file_path_obj, list):
+                    file_path_obj = [file_path_obj]
 
-                alg_template_values_def = deepcopy(alg_template_values_raw)
-                for file_key, file_value in zip(file_keys, file_values):
-                    alg_template_values_def[file_key] = file_value
+            else:
+
+                file_path_obj = []
+                for file_fields in file_collections.values():
+                    file_keys = file_fields[0::2]
+                    file_values = file_fields[1::2]
+
+                    alg_template_values_def = dict(alg_template_values_raw)
+                    for file_key, file_value in zip(file_keys, file_values):
+                        alg_template_values_def[file_key] = file_value
 
-                alg_template_values = {**alg_template_values_def, **file_extra_variables}
+                    alg_template_values = {**alg_template_values_def, **file_extra_variables}
 
-                file_path_def = fill_tags2string(file_path_raw, alg_template_tags, alg_template_values)
-                file_path_obj.append(file_path_def)
+                    file_path_def = fill_tags2string(file_path_raw, alg_template_tags, alg_template_values)
+                    file_path_obj.append(file_path_def)
         else:
 
             file_path_obj = fill_tags2string(file_path_raw, alg_template_tags, alg_template_values_raw)
@@ -872,6 +920,113 @@ class DriverDynamic:
 
     # -------------------------------------------------------------------------------------
 
+    # -------------------------------------------------------------------------------------
+    # Method to define the manifest of a file (path, modification time and size; None if not available)
+    @staticmethod
+    def define_file_manifest(file_path, file_stat):
+        if file_stat is not None:
+            return [file_path, file_stat.st_mtime_ns, file_stat.st_size]
+        return [file_path, None, None]
+
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to get the incremental workspace (datasets of the previous run)
+    def get_incremental_workspace(self):
+
+        if self.incremental_workspace is None:
+            file_path_anc = self.file_path_anc_incremental
+            if self.flag_incremental_dynamic and os.path.exists(file_path_anc):
+                self.incremental_workspace = read_obj(file_path_anc)
+                log_stream.info(' ----> Incremental workspace "' + file_path_anc + '" ... LOADED')
+            else:
+                self.incremental_workspace = {}
+
+        return self.incremental_workspace
+
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to get an execution obj from the incremental workspace (None if not available)
+    def get_incremental_execution(self, domain_name_step, exec_name_step, obj_name='manifest_workspace'):
+
+        incremental_workspace = self.get_incremental_workspace()
+        if obj_name in list(incremental_workspace.keys()):
+            obj_workspace = incremental_workspace[obj_name]
+            if (domain_name_step in list(obj_workspace.keys())) and \
+                    (exec_name_step in list(obj_workspace[domain_name_step].keys())):
+                return obj_workspace[domain_name_step][exec_name_step]
+        return None
+
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to get the run_end datasets of the previous run (if the source file(s) are not changed)
+    def get_incremental_datasets(self, domain_name_step, exec_name_step, time_step, file_manifest_end):
+
+        exec_manifest = self.get_incremental_execution(domain_name_step, exec_name_step, 'manifest_workspace')
+        exec_workspace = self.get_incremental_execution(domain_name_step, exec_name_step, 'file_workspace')
+
+        if (exec_manifest is None) or (exec_workspace is None):
+            return None, None
+        if exec_workspace[self.tag_info][self.tag_run_ref_end] is None:
+            return None, None
+        if (exec_manifest[self.tag_time_ref_end] != time_step) or \
+                (exec_manifest[self.tag_file_ref_end] != file_manifest_end):
+            return None, None
+
+        return dict(exec_workspace[self.tag_info][self.tag_run_ref_end]), dict(exec_workspace[self.tag_data])
+
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to get the analysis of the previous run (if the source file(s) and the time window are not changed)
+    def get_incremental_analysis(self, domain_name_step, exec_name_step):
+
+        if (not self.flag_incremental_dynamic) or (self.manifest_workspace is None):
+            return None
+
+        incremental_workspace = self.get_incremental_workspace()
+        if 'time_select_workspace' not in list(incremental_workspace.keys()):
+            return None
+        if incremental_workspace['time_select_workspace'] != [self.time_select_start, self.time_select_end]:
+            return None
+
+        exec_manifest = self.get_incremental_execution(domain_name_step, exec_name_step, 'manifest_workspace')
+        exec_analysis = self.get_incremental_execution(domain_name_step, exec_name_step, 'analysis_workspace')
+        if (exec_manifest is None) or (exec_analysis is None):
+            return None
+        if (domain_name_step not in list(self.manifest_workspace.keys())) or \
+                (exec_name_step not in list(self.manifest_workspace[domain_name_step].keys())):
+            return None
+        if self.manifest_workspace[domain_name_step][exec_name_step] != exec_manifest:
+            return None
+
+        return exec_analysis
+
+    # -------------------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------------------
+    # Method to dump the incremental workspace (datasets, manifest and analysis of the run)
+    def dump_incremental_workspace(self, file_workspace, analyze_datasets_collections):
+
+        file_path_anc = self.file_path_anc_incremental
+        if (not self.flag_incremental_dynamic) or (self.manifest_workspace is None):
+            return
+
+        log_stream.info(' ----> Freeze incremental workspace ... ')
+        folder_name_anc, file_name_anc = os.path.split(file_path_anc)
+        make_folder(folder_name_anc)
+
+        incremental_workspace = {'file_workspace': file_workspace,
+                                 'manifest_workspace': self.manifest_workspace,
+                                 'analysis_workspace': analyze_datasets_collections,
+                                 'time_select_workspace': [self.time_select_start, self.time_select_end]}
+        write_obj(file_path_anc, incremental_workspace)
+        log_stream.info(' ----> Freeze incremental workspace ... DONE')
+
+    # -------------------------------------------------------------------------------------
+
     # -------------------------------------------------------------------------------------
     # Method to analyze dynamic data
     def analyze_dynamic_data(self, file_workspace):
@@ -941,7 +1096,19 @@ class DriverDynamic:
                     exec_run_var_obs = exec_data[self.tag_run_var_obs].values[0]
 
                     analyze_datasets_collections[domain_name_step][exec_name_step] = {}
-                    if exec_name_step in list(domain_workspace.keys()):
+                    exec_analysis_incremental = self.get_incremental_analysis(domain_name_step, exec_name_step)
+                    if exec_analysis_incremental is not None:
+
+                        # info execution end (source file(s) and time window not changed)
+                        analysis_time_reference_start = exec_analysis_incremental[self.tag_run_ref_start]
+                        analysis_time_reference_end = exec_analysis_incremental[self.tag_run_ref_end]
+                        analysis_time_reference_elapsed = exec_analysis_incremental[self.tag_run_ref_elapsed]
+                        analysis_datasets_section = exec_analysis_incremental[self.tag_run_datasets_section]
+                        attrs_datasets_section = exec_analysis_incremental[self.tag_run_datasets_attrs]
+                        log_stream.info(' ----> Execution reference "' + exec_name_step + '" ... DONE. '
+                                        'Analysis reused from the incremental workspace')
+
+                    elif exec_name_step in list(domain_workspace.keys()):
 
                         exec_workspace = domain_workspace[exec_name_step]
 
@@ -1006,6 +1173,9 @@ class DriverDynamic:
             analyze_collections = {self.tag_data: analyze_datasets_collections}
             write_obj(file_path_anc, analyze_collections)
 
+            # dump incremental obj to file (used by the next run)
+            self.dump_incremental_workspace(file_workspace, analyze_datasets_collections)
+
         else:
             # get ancillary obj from file
             analyze_collections = read_obj(file_path_anc)
@@ -1018,6 +1188,269 @@ class DriverDynamic:
 
     # -------------------------------------------------------------------------------------
 
+    # -------------------------------------------------------------------------------------
+    # Method to organize dynamic data for a pair of domain and execution
+    def organize_dynamic_execution(self, domain_name_step, exec_name_step):
+
+        # get reference time(s)
+        time = self.time_run
+
+        # get outlet obj
+        outlet_name_list = self.outlet_name_obj[domain_name_step]
+        # execution dframe
+        exec_dframe = self.exec_dframe
+
+        # get source obj
+        file_collections_src_ref_start = self.file_obj_src_ref_start[domain_name_step]
+        file_collections_src_ref_end = self.file_obj_src_ref_end[domain_name_step]
+
+        # info execution start
+        log_stream.info(' -----> Execution reference "' + exec_name_step + '" ... ')
+
+        file_path_src_ref_start = file_collections_src_ref_start[exec_name_step]
+        file_path_src_ref_end = file_collections_src_ref_end[exec_name_step]
+
+        exec_data = exec_dframe[exec_dframe.index == exec_name_step]
+        exec_time_period = exec_data[self.tag_time_period].values[0]
+        exec_time_frequency = exec_data[self.tag_time_frequency].values[0]
+        exec_time_rounding = exec_data[self.tag_time_rounding].values[0]
+
+        time_search = self.define_time_search(
+            time, time_period=exec_time_period, time_frequency=exec_time_frequency,
+            time_rounding=exec_time_rounding, time_reverse=True)
+
+        # initialize file workspace
+        exec_file_workspace = {}
+        exec_file_workspace[self.tag_info] = {}
+        exec_file_workspace[self.tag_data] = {}
+        exec_file_workspace[self.tag_info][self.tag_run_ref_start] = None
+        exec_file_workspace[self.tag_info][self.tag_time_ref_start] = None
+        exec_file_workspace[self.tag_info][self.tag_run_ref_end] = None
+        exec_file_workspace[self.tag_info][self.tag_time_ref_end] = None
+        exec_file_workspace[self.tag_data] = None
+        # initialize history workspace
+        exec_history_time_last = {}
+        exec_history_time_period = {}
+        # initialize manifest workspace (source file(s) selected)
+        exec_manifest_workspace = {self.tag_time_ref_start: None, self.tag_file_ref_start: None,
+                                   self.tag_time_ref_end: None, self.tag_file_ref_end: None}
+
+        # iterate to find actual running experiments
+        for time_step in time_search:
+
+            # info time start
+            log_stream.info(' ------> Time  "' + str(time_step) + '" ... ')
+
+            log_stream.info(' -------> Reference run_start datasets ... ')
+            if exec_file_workspace['info']['run_start'] is None:
+
+                if file_path_src_ref_start.__len__() == 1:
+
+                    file_path_src_start_raw = file_path_src_ref_start[0]
+                    file_path_src_start_def = self.define_file_string(time_step, file_path_src_start_raw)
+
+                    if file_path_src_start_def.endswith('.x'):
+                        if exists_file(file_path_src_start_def):
+                            file_info_start = read_file_execution_info(file_path_src_start_def)
+                        else:
+                            file_info_start = None
+                    elif file_path_src_start_def.endswith('.txt'):
+                        if exists_file(file_path_src_start_def):
+                            file_info_start = read_file_execution_info(file_path_src_start_def)
+                        else:
+                            file_info_start = None
+                    else:
+                        log_stream.error(' ===> Reference run_start datasets ... FAILED')
+                        raise NotImplementedError('Case not implemented in source reference type start')
+
+                    file_manifest_start = self.define_file_manifest(
+                        file_path_src_start_def, stat_file(file_path_src_start_def))
+
+                    file_check_start = all(elem is None for elem in list([file_info_start]))
+                    if file_check_start:
+                        file_insert_start = False
+                        log_stream.info(' -------> Reference run_start datasets ... SKIPPED. '
+                                        'Some Datasets are not defined')
+                    else:
+                        file_insert_start = True
+                        log_stream.info(' -------> Reference run_start datasets ... DONE')
+                else:
+                    file_info_start, file_insert_start, file_manifest_start = None, False, None
+                    log_stream.info(' -------> Reference run_start datasets ... SKIPPED. '
+                                    'All Datasets are not defined')
+            else:
+                log_stream.info(' -------> Reference run_start datasets ... SKIPPED. '
+                                'Datasets already selected')
+                file_info_start, file_insert_start, file_manifest_start = None, False, None
+
+            log_stream.info(' -------> Reference run_end datasets ... ')
+            if exec_file_workspace['info']['run_end'] is None:
+
+                file_info_end, file_data_end, file_manifest_end = {}, {}, []
+                if file_path_src_ref_end.__len__() >= 1:
+
+                    if file_path_src_ref_end[0].endswith('.json'):
+
+                        # fill the time of all the outlets at once
+                        file_path_src_end_list = self.define_file_string(time_step, file_path_src_ref_end)
+
+                        # check the files using the folder index (no probe for the missing files)
+                        file_stat_end = {}
+                        for outlet_name_step, file_path_src_end_def in zip(outlet_name_list,
+                                                                           file_path_src_end_list):
+
+                            file_stat_src_ref_end = stat_file(file_path_src_end_def)
+
+                            file_stat_end[outlet_name_step] = (file_path_src_end_def, file_stat_src_ref_end)
+                            file_manifest_end.append(
+                                [outlet_name_step] + self.define_file_manifest(
+                                    file_path_src_end_def, file_stat_src_ref_end))
+
+                        # reuse the datasets of the previous run if the files are not changed (incremental mode)
+                        file_info_end, file_data_end = self.get_incremental_datasets(
+                            domain_name_step, exec_name_step, time_step, file_manifest_end)
+                        if file_info_end is not None:
+                            log_stream.info(' -------> Reference run_end datasets ... '
+                                            'reused from the incremental workspace')
+                        else:
+                            file_info_end, file_data_end = {}, {}
+                            for outlet_name_step, (file_path_src_end_def, file_stat_src_ref_end) in \
+                                    file_stat_end.items():
+
+                                if file_stat_src_ref_end is not None:
+                                    file_info_src_ref_end, file_data_src_ref_end = read_file_hydrograph(
+                                        file_path_src_end_def, file_mandatory=False,
+                                        file_stat=file_stat_src_ref_end)
+                                else:
+                                    file_info_src_ref_end, file_data_src_ref_end = None, None
+
+                                file_info_end[outlet_name_step] = file_info_src_ref_end
+                                file_data_end[outlet_name_step] = file_data_src_ref_end
+
+                        file_check_end = all(elem is None for elem in list(file_info_end.values()))
+                        if file_check_end:
+                            file_insert_end = False
+                            log_stream.info(' -------> Reference run_end datasets ... SKIPPED. '
+                                            'Some datasets are not defined')
+                        else:
+                            file_insert_end = True
+                            log_stream.info(' -------> Reference run_end datasets ... DONE')
+                    else:
+                        log_stream.error(' ===> Reference run_end datasets ... FAILED')
+                        raise NotImplementedError('Case not implemented in source reference type end')
+                else:
+
+                    file_info_end, file_data_end = None, None
+                    file_insert_end = False
+                    log_stream.info(' -------> Reference run_end datasets ... SKIPPED. '
+                                    'All datasets are not defined')
+
+            else:
+                log_stream.info(' -------> Reference run_end datasets ... SKIPPED. '
+                                'Datasets already selected')
+                file_info_end, file_data_end, file_insert_end, file_manifest_end = None, None, False, None
+
+            log_stream.info(' -------> Search available datasets ... ')
+            history_time_list = []
+            if file_path_src_ref_end.__len__() >= 1:
+
+                if file_path_src_ref_end[0].endswith('.json'):
+
+                    file_path_history_list = None
+                    for outlet_id, outlet_name_step in zip(range(file_path_src_ref_end.__len__()), outlet_name_list):
+
+                        # reuse the file information already read for the run_end datasets (if any)
+                        if (file_info_end is not None) and (outlet_name_step in list(file_info_end.keys())):
+                            file_info_history = file_info_end[outlet_name_step]
+                        else:
+                            if file_path_history_list is None:
+                                file_path_history_list = self.define_file_string(time_step, file_path_src_ref_end)
+                            file_path_history = file_path_history_list[outlet_id]
+                            file_stat_history = stat_file(file_path_history)
+                            if file_stat_history is not None:
+                                file_info_history = organize_file_hydrograph_info(file_stat_history)
+                            else:
+                                file_info_history = None
+
+                        if file_info_history is not None:
+                            time_reference = file_info_history['time_modified']
+                        else:
+                            time_reference = None
+
+                        history_time_list.append(time_reference)
+
+                    check_history = all(elem is None for elem in history_time_list)
+                    if check_history:
+                        history_time_ref = None
+                        log_stream.info(' -------> Search available datasets  ... ALL NOT FOUND')
+                    else:
+                        history_time_tmp = [elem for elem in history_time_list if elem is not None]
+                        history_time_idx = pd.DatetimeIndex(history_time_tmp)
+                        history_time_ref = history_time_idx.max().ceil(freq='min')
+                        log_stream.info(' -------> Search available datasets ... DONE')
+                else:
+                    log_stream.error(' ===> Search available datasets ... FAILED')
+                    raise NotImplementedError('Case not implemented in source reference type end')
+            else:
+                history_time_ref = None
+                log_stream.info(' -------> Search available datasets ... ALL NOT AVAILABLE.')
+
+            # Store history time last information
+            log_stream.info(' -------> Update history time last information ... ')
+            if not exec_history_time_last:
+                exec_history_time_last = [history_time_ref]
+            else:
+                history_time_tmp = exec_history_time_last
+                history_time_tmp.append(history_time_ref)
+                exec_history_time_last = history_time_tmp
+            log_stream.info(' -------> Update history time last information ... DONE')
+            # Store history information
+            log_stream.info(' -------> Update history time period information ... ')
+            if not exec_history_time_period:
+                time_search = sorted(time_search)
+                time_from, time_to = time_search[0], time_search[-1]
+                exec_history_time_period = [time_from, time_to]
+            log_stream.info(' -------> Update history time period information ... DONE')
+
+            # Store reference source information and datasets for start step
+            log_stream.info(' -------> Update start process information ... ')
+            if file_insert_start:
+                exec_file_workspace[
+                    self.tag_info][self.tag_run_ref_start] = file_info_start
+                exec_file_workspace[
+                    self.tag_info][self.tag_time_ref_start] = time_step
+                exec_manifest_workspace[self.tag_time_ref_start] = time_step
+                exec_manifest_workspace[self.tag_file_ref_start] = file_manifest_start
+                log_stream.info(' -------> Update start process information ... DONE')
+            else:
+                log_stream.info(' -------> Update start process information ... SKIPPED. '
+                                'Information are not available')
+            # Store reference source information and datasets for end step
+            log_stream.info(' -------> Update end process information ... ')
+            if file_insert_end:
+                exec_file_workspace[
+                    self.tag_info][self.tag_run_ref_end] = file_info_end
+                exec_file_workspace[
+                    self.tag_info][self.tag_time_ref_end] = time_step
+                exec_file_workspace[
+                    self.tag_data] = file_data_end
+                exec_manifest_workspace[self.tag_time_ref_end] = time_step
+                exec_manifest_workspace[self.tag_file_ref_end] = file_manifest_end
+                log_stream.info(' -------> Update end process information ... DONE')
+            else:
+                log_stream.info(' -------> Update end process information ... SKIPPED. '
+                                'Information are not available')
+
+            # info time end
+            log_stream.info(' ------> Time  "' + str(time_step) + '" ... DONE')
+
+        # info execution end
+        log_stream.info(' -----> Execution reference "' + exec_name_step + '" ... DONE')
+
+        return exec_file_workspace, exec_history_time_last, exec_history_time_period, exec_manifest_workspace
+
+    # -------------------------------------------------------------------------------------
+
     # -------------------------------------------------------------------------------------
     # Method to organize dynamic data
     def organize_dynamic_data(self):
@@ -1027,24 +1460,22 @@ class DriverDynamic:
 
         # get domain list
         domain_name_list = self.domain_name_list
-        # get execution and view object(s)
+        # get execution obj
         exec_name_obj = self.exec_name_obj
-        view_warn_obj, view_exec_obj = self.view_warn_obj, self.view_exec_obj
-        # get outlet obj
-        outlet_name_obj = self.outlet_name_obj
-        # execution dframe
-        exec_dframe = self.exec_dframe
 
-        # get source obj
-        file_obj_src_ref_start = self.file_obj_src_ref_start
-        file_obj_src_ref_end = self.file_obj_src_ref_end
         # get ancillary obj
         file_path_anc = self.file_path_anc_source
         flag_clean_anc = self.flag_cleaning_dynamic_source
+        # get parallel obj
+        flag_parallel = self.flag_parallel_dynamic_source
+        parallel_workers = self.parallel_dynamic_workers
 
         # info routine start
         log_stream.info(' ---> Organize dynamic datasets [' + str(time) + '] ... ')
 
+        # refresh the folder index (files of the runs can appear between the time steps)
+        refresh_file_index()
+
         # check ancillary flag and file
         if flag_clean_anc:
             if os.path.exists(file_path_anc):
@@ -1055,16 +1486,10 @@ class DriverDynamic:
 
             # cycles over domain name(s)
             file_workspace, history_time_last_workspace, history_time_period_workspace = None, None, None
+            manifest_workspace = None
+            exec_task_list = []
             for domain_name_step in domain_name_list:
 
-                # info domain start
-                log_stream.info(' ----> Domain reference "' + domain_name_step + '" ... ')
-
-                # get domain information
-                outlet_name_list = outlet_name_obj[domain_name_step]
-                file_collections_src_ref_start = file_obj_src_ref_start[domain_name_step]
-                file_collections_src_ref_end = file_obj_src_ref_end[domain_name_step]
-
                 # check domain availability in the execution obj
                 if domain_name_step in list(exec_name_obj.keys()):
                     exec_name_list = exec_name_obj[domain_name_step]
@@ -1083,214 +1508,51 @@ class DriverDynamic:
                 if history_time_period_workspace is None:
                     history_time_period_workspace = {}
                 history_time_period_workspace[domain_name_step] = {}
+                # init manifest workspace using domain tag
+                if manifest_workspace is None:
+                    manifest_workspace = {}
+                manifest_workspace[domain_name_step] = {}
 
-                # cycles over execution name(s)
+                # define the (domain, execution) task(s)
                 for exec_name_step in exec_name_list:
+                    exec_task_list.append((domain_name_step, exec_name_step))
 
-                    # info execution start
-                    log_stream.info(' -----> Execution reference "' + exec_name_step + '" ... ')
+            # size the hydrograph cache to hold the outlets of all the executions
+            define_file_hydrograph_cache(sum([
+                self.outlet_name_obj[domain_name_step].__len__() * exec_name_obj[domain_name_step].__len__()
+                for domain_name_step in domain_name_list]))
 
-                    file_path_src_ref_start = file_collections_src_ref_start[exec_name_step]
-                    file_path_src_ref_end = file_collections_src_ref_end[exec_name_step]
+            # get the incremental workspace (loaded once before the search tasks)
+            self.get_incremental_workspace()
 
-                    exec_data = exec_dframe[exec_dframe.index == exec_name_step]
-                    exec_time_period = exec_data[self.tag_time_period].values[0]
-                    exec_time_frequency = exec_data[self.tag_time_frequency].values[0]
-                    exec_time_rounding = exec_data[self.tag_time_rounding].values[0]
-
-                    time_search = self.define_time_search(
-                        time, time_period=exec_time_period, time_frequency=exec_time_frequency,
-                        time_rounding=exec_time_rounding, time_reverse=True)
-
-                    # initialize file workspace
-                    file_workspace[domain_name_step][exec_name_step] = {}
-                    file_workspace[domain_name_step][exec_name_step][self.tag_info] = {}
-                    file_workspace[domain_name_step][exec_name_step][self.tag_data] = {}
-                    file_workspace[domain_name_step][exec_name_step][self.tag_info][self.tag_run_ref_start] = None
-                    file_workspace[domain_name_step][exec_name_step][self.tag_info][self.tag_time_ref_start] = None
-                    file_workspace[domain_name_step][exec_name_step][self.tag_info][self.tag_run_ref_end] = None
-                    file_workspace[domain_name_step][exec_name_step][self.tag_info][self.tag_time_ref_end] = None
-                    file_workspace[domain_name_step][exec_name_step][self.tag_data] = None
-                    # initialize history workspace
-                    history_time_last_workspace[domain_name_step][exec_name_step] = {}
-                    history_time_period_workspace[domain_name_step][exec_name_step] = {}
-
-                    # iterate to find actual running experiments
-                    for time_step in time_search:
-
-                        # info time start
-                        log_stream.info(' ------> Time  "' + str(time_step) + '" ... ')
-
-                        log_stream.info(' -------> Reference run_start datasets ... ')
-                        if file_workspace[domain_name_step][exec_name_step]['info']['run_start'] is None:
-
-                            if file_path_src_ref_start.__len__() == 1:
-
-                                file_path_src_start_raw = file_path_src_ref_start[0]
-                                file_path_src_start_def = self.define_file_string(time_step, file_path_src_start_raw)
-
-                                if file_path_src_start_def.endswith('.x'):
-                                    if os.path.exists(file_path_src_start_def):
-                                        file_info_start = read_file_execution_info(file_path_src_start_def)
-                                    else:
-                                        file_info_start = None
-                                elif file_path_src_start_def.endswith('.txt'):
-                                    if os.path.exists(file_path_src_start_def):
-                                        file_info_start = read_file_execution_info(file_path_src_start_def)
-                                    else:
-                                        file_info_start = None
-                                else:
-                                    log_stream.error(' ===> Reference run_start datasets ... FAILED')
-                                    raise NotImplementedError('Case not implemented in source reference type start')
-
-                                file_check_start = all(elem is None for elem in list([file_info_start]))
-                                if file_check_start:
-                                    file_insert_start = False
-                                    log_stream.info(' -------> Reference run_start datasets ... SKIPPED. '
-                                                    'Some Datasets are not defined')
-                                else:
-                                    file_insert_start = True
-                                    log_stream.info(' -------> Reference run_start datasets ... DONE')
-                            else:
-                                file_info_start, file_insert_start = None, False
-                                log_stream.info(' -------> Reference run_start datasets ... SKIPPED. '
-                                                'All Datasets are not defined')
-                        else:
-                            log_stream.info(' -------> Reference run_start datasets ... SKIPPED. '
-                                            'Datasets already selected')
-                            file_info_start, file_insert_start = None, False
-
-                        log_stream.info(' -------> Reference run_end datasets ... ')
-                        if file_workspace[domain_name_step][exec_name_step]['info']['run_end'] is None:
-
-                            file_info_end, file_data_end = {}, {}
-                            if file_path_src_ref_end.__len__() >= 1:
-
-                                if file_path_src_ref_end[0].endswith('.json'):
+            # search datasets for each (domain, execution) task
+            if flag_parallel and exec_task_list.__len__() > 1:
 
-                                    for outlet_name_step, file_path_src_end_raw in zip(outlet_name_list,
-                                                                                       file_path_src_ref_end):
+                if parallel_workers is None:
+                    parallel_workers = min(exec_task_list.__len__(), os.cpu_count() or 1)
 
-                                        file_path_src_end_def = self.define_file_string(
-                                            time_step, file_path_src_end_raw)
-
-                                        if os.path.exists(file_path_src_end_def):
-                                            file_info_src_ref_end = read_file_hydrograph_info(file_path_src_end_def)
-                                            file_data_src_ref_end = read_file_hydrograph_ts(file_path_src_end_def)
-                                        else:
-                                            file_info_src_ref_end = None
-                                            file_data_src_ref_end = None
-
-                                        file_info_end[outlet_name_step] = file_info_src_ref_end
-                                        file_data_end[outlet_name_step] = file_data_src_ref_end
-
-                                    file_check_end = all(elem is None for elem in list(file_info_end.values()))
-                                    if file_check_end:
-                                        file_insert_end = False
-                                        log_stream.info(' -------> Reference run_end datasets ... SKIPPED. '
-                                                        'Some datasets are not defined')
-                                    else:
-                                        file_insert_end = True
-                                        log_stream.info(' -------> Reference run_end datasets ... DONE')
-                                else:
-                                    log_stream.error(' ===> Reference run_end datasets ... FAILED')
-                                    raise NotImplementedError('Case not implemented in source reference type end')
-                            else:
-
-                                file_info_end, file_data_end = None, None
-                                file_insert_end = False
-                                log_stream.info(' -------> Reference run_end datasets ... SKIPPED. '
-                                                'All datasets are not defined')
-
-                        else:
-                            log_stream.info(' -------> Reference run_end datasets ... SKIPPED. '
-                                            'Datasets already selected')
-                            file_info_end, file_data_end, file_insert_end = None, None, False
+                log_stream.info(' ----> Search datasets in parallel mode [workers: ' + str(parallel_workers) + '] ... ')
+                with ThreadPoolExecutor(max_workers=parallel_workers) as exec_pool:
+                    exec_result_list = list(exec_pool.map(
+                        lambda exec_task: self.organize_dynamic_execution(*exec_task), exec_task_list))
+                log_stream.info(' ----> Search datasets in parallel mode [workers: ' + str(parallel_workers) +
+                                '] ... DONE')
 
-                        log_stream.info(' -------> Search available datasets ... ')
-                        history_time_list = []
-                        if file_path_src_ref_end.__len__() >= 1:
-
-                            if file_path_src_ref_end[0].endswith('.json'):
-
-                                for outlet_name_step, file_path_raw in zip(outlet_name_list, file_path_src_ref_end):
-
-                                    file_path_history = self.define_file_string(time_step, file_path_raw)
-
-                                    if os.path.exists(file_path_history):
-                                        file_info_history = read_file_hydrograph_info(file_path_history)
-                                        time_reference = file_info_history['time_modified']
-                                    else:
-                                        time_reference = None
-
-                                    history_time_list.append(time_reference)
-
-                                check_history = all(elem is None for elem in history_time_list)
-                                if check_history:
-                                    history_time_ref = None
-                                    log_stream.info(' -------> Search available datasets  ... ALL NOT FOUND')
-                                else:
-                                    history_time_tmp = [elem for elem in history_time_list if elem is not None]
-                                    history_time_idx = pd.DatetimeIndex(history_time_tmp)
-                                    history_time_ref = history_time_idx.max().ceil(freq='min')
-                                    log_stream.info(' -------> Search available datasets ... DONE')
-                            else:
-                                log_stream.error(' ===> Search available datasets ... FAILED')
-                                raise NotImplementedError('Case not implemented in source reference type end')
-                        else:
-                            history_time_ref = None
-                            log_stream.info(' -------> Search available datasets ... ALL NOT AVAILABLE.')
+            else:
 
-                        # Store history time last information
-                        log_stream.info(' -------> Update history time last information ... ')
-                        if not history_time_last_workspace[domain_name_step][exec_name_step]:
-                            history_time_last_workspace[domain_name_step][exec_name_step] = [history_time_ref]
-                        else:
-                            history_time_tmp = history_time_last_workspace[domain_name_step][exec_name_step]
-                            history_time_tmp.append(history_time_ref)
-                            history_time_last_workspace[domain_name_step][exec_name_step] = history_time_tmp
-                        log_stream.info(' -------> Update history time last information ... DONE')
-                        # Store history information
-                        log_stream.info(' -------> Update history time period information ... ')
-                        if not history_time_period_workspace[domain_name_step][exec_name_step]:
-                            time_search = sorted(time_search)
-                            time_from, time_to = time_search[0], time_search[-1]
-                            history_time_period_workspace[domain_name_step][exec_name_step] = [time_from, time_to]
-                        log_stream.info(' -------> Update history time period information ... DONE')
-
-                        # Store reference source information and datasets for start step
-                        log_stream.info(' -------> Update start process information ... ')
-                        if file_insert_start:
-                            file_workspace[domain_name_step][exec_name_step][
-                                self.tag_info][self.tag_run_ref_start] = file_info_start
-                            file_workspace[domain_name_step][exec_name_step][
-                                self.tag_info][self.tag_time_ref_start] = time_step
-                            log_stream.info(' -------> Update start process information ... DONE')
-                        else:
-                            log_stream.info(' -------> Update start process information ... SKIPPED. '
-                                            'Information are not available')
-                        # Store reference source information and datasets for end step
-                        log_stream.info(' -------> Update end process information ... ')
-                        if file_insert_end:
-                            file_workspace[domain_name_step][exec_name_step][
-                                self.tag_info][self.tag_run_ref_end] = file_info_end
-                            file_workspace[domain_name_step][exec_name_step][
-                                self.tag_info][self.tag_time_ref_end] = time_step
-                            file_workspace[domain_name_step][exec_name_step][
-                                self.tag_data] = file_data_end
-                            log_stream.info(' -------> Update end process information ... DONE')
-                        else:
-                            log_stream.info(' -------> Update end process information ... SKIPPED. '
-                                            'Information are not available')
+                exec_result_list = []
+                for domain_name_step, exec_name_step in exec_task_list:
+                    exec_result_list.append(self.organize_dynamic_execution(domain_name_step, exec_name_step))
 
-                        # info time end
-                        log_stream.info(' ------> Time  "' + str(time_step) + '" ... DONE')
+            # collect datasets in the domain workspace(s) (tasks order is preserved)
+            for (domain_name_step, exec_name_step), exec_result_step in zip(exec_task_list, exec_result_list):
+                exec_file_workspace, exec_history_time_last, exec_history_time_period, \
+                    exec_manifest_workspace = exec_result_step
 
-                    # info execution end
-                    log_stream.info(' -----> Execution reference "' + exec_name_step + '" ... DONE')
-
-                # info domain end
-                log_stream.info(' ----> Domain reference "' + domain_name_step + '" ... DONE')
+                file_workspace[domain_name_step][exec_name_step] = exec_file_workspace
+                history_time_last_workspace[domain_name_step][exec_name_step] = exec_history_time_last
+                history_time_period_workspace[domain_name_step][exec_name_step] = exec_history_time_period
+                manifest_workspace[domain_name_step][exec_name_step] = exec_manifest_workspace
 
             # store data in a workspace file
             log_stream.info(' ----> Freeze dynamic datasets ... ')
@@ -1300,7 +1562,8 @@ class DriverDynamic:
                 # merge file and history workspace
                 data_collections = {'file_workspace': file_workspace,
                                     'history_time_last_workspace': history_time_last_workspace,
-                                    'history_time_period_workspace': history_time_period_workspace}
+                                    'history_time_period_workspace': history_time_period_workspace,
+                                    'manifest_workspace': manifest_workspace}
                 # save data collections
                 write_obj(file_path_anc, data_collections)
                 log_stream.info(' ----> Freeze dynamic datasets ... DONE')
@@ -1313,6 +1576,14 @@ class DriverDynamic:
             file_workspace = data_collections['file_workspace']
             history_time_last_workspace = data_collections['history_time_last_workspace']
             history_time_period_workspace = data_collections['history_time_period_workspace']
+            # get manifest workspace (not available in the workspace created without the manifest)
+            if 'manifest_workspace' in list(data_collections.keys()):
+                manifest_workspace = data_collections['manifest_workspace']
+            else:
+                manifest_workspace = None
+
+        # store manifest workspace (used by the incremental mode)
+        self.manifest_workspace = manifest_workspace
 
         # info routine end
         log_stream.info(' ---> Organize dynamic datasets [' + str(time) + '] ... DONE')
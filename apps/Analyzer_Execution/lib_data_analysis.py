@@ -83,6 +83,50 @@ def filter_discharge_ts_by_limits(section_dframe_generic, section_attrs, dischar
 # -------------------------------------------------------------------------------------
 
 
+# -------------------------------------------------------------------------------------
+# Method to compute the daily maximum (and its position(s)) of discharge values in a threshold range
+def compute_discharge_thr_daily(ts_values, ts_days_idx, ts_days_n,
+                                thr_lower=None, thr_upper=None, thr_lower_strict=False):
+
+    # ts_values: [time, run] array; ts_days_idx: day position of each time step (-1 if not selected)
+    # a time step is selected only if all the runs are in the threshold range (NaN values are never selected)
+    days_max, days_idx = [None] * ts_days_n, [[] for _ in range(ts_days_n)]
+    if ts_values.size == 0 or ts_days_n == 0:
+        return days_max, days_idx
+
+    with np.errstate(invalid='ignore'):
+        if thr_lower is None:
+            ts_mask = ~np.isnan(ts_values)
+        elif thr_lower_strict:
+            ts_mask = ts_values > thr_lower
+        else:
+            ts_mask = ts_values >= thr_lower
+        if thr_upper is not None:
+            ts_mask &= ts_values < thr_upper
+
+    ts_select = np.all(ts_mask, axis=1) & (ts_days_idx >= 0)
+    if not np.any(ts_select):
+        return days_max, days_idx
+
+    # group the selected time steps by day (maximum value for each day)
+    ts_row_max = np.max(ts_values[ts_select], axis=1)
+    ts_row_day = ts_days_idx[ts_select]
+    days_value = np.full(ts_days_n, -np.inf, dtype=np.float64)
+    np.maximum.at(days_value, ts_row_day, ts_row_max)
+
+    # find all the (time, run) position(s) equal to the daily maximum (row-major order)
+    ts_rows = np.flatnonzero(ts_select)
+    hit_i, hit_j = np.nonzero(ts_values[ts_select] == days_value[ts_row_day][:, np.newaxis])
+    for step_i, step_j in zip(ts_rows[hit_i], hit_j):
+        days_idx[ts_days_idx[step_i]].append((step_i, step_j))
+
+    for day_id in np.unique(ts_row_day):
+        days_max[day_id] = days_value[day_id]
+
+    return days_max, days_idx
+# -------------------------------------------------------------------------------------
+
+
 # -------------------------------------------------------------------------------------
 # Method to analyze discharge time series
 def analyze_discharge_ts(run_name, file_datasets, time_start=None, time_end=None,
@@ -172,131 +216,62 @@ def analyze_discharge_ts(run_name, file_datasets, time_start=None, time_end=None
                 # filter dframe by limits and nans
                 section_dframe_simulated = filter_discharge_ts_by_limits(section_dframe_simulated, section_attrs)
 
-                section_thr_collections = {}
-                for section_ts_step in section_ts_days:
+                # get values, times and runs of the simulated dframe
+                section_ts_values = section_dframe_simulated.values.astype(np.float64)
+                section_ts_index = section_dframe_simulated.index
+                section_ts_runs = section_dframe_simulated.columns
+                # map each time step to the position of its day (-1 if the day is not selected)
+                section_ts_days_idx = section_ts_days.get_indexer(section_ts_index.normalize())
 
-                    # info time start
-                    log_stream.info(' ------> Time "' + str(section_ts_step) + '" ... ')
+                # compute the alert and alarm daily values for all the days at once
+                log_stream.info(' ------> Compute alert and alarm daily values ... ')
+                if (data_thr_alert is not None) and (data_thr_alarm is not None):
+                    section_alert_max, section_alert_idx = compute_discharge_thr_daily(
+                        section_ts_values, section_ts_days_idx, section_ts_days.__len__(),
+                        thr_lower=data_thr_alert, thr_upper=data_thr_alarm, thr_lower_strict=False)
+                else:
+                    section_alert_max, section_alert_idx = None, None
+                if data_thr_alarm is not None:
+                    section_alarm_max, section_alarm_idx = compute_discharge_thr_daily(
+                        section_ts_values, section_ts_days_idx, section_ts_days.__len__(),
+                        thr_lower=data_thr_alarm, thr_upper=None, thr_lower_strict=True)
+                else:
+                    section_alarm_max, section_alarm_idx = None, None
+                log_stream.info(' ------> Compute alert and alarm daily values ... DONE')
 
-                    # init the alert and alarm data selection
-                    section_thr_collections[section_ts_step] = {}
-                    section_thr_collections[section_ts_step][tag_discharge_max_alert_value] = {}
-                    section_thr_collections[section_ts_step][tag_discharge_max_alert_index] = {}
-                    section_thr_collections[section_ts_step][tag_discharge_max_alert_run] = {}
-                    section_thr_collections[section_ts_step][tag_discharge_max_alarm_value] = {}
-                    section_thr_collections[section_ts_step][tag_discharge_max_alarm_index] = {}
-                    section_thr_collections[section_ts_step][tag_discharge_max_alarm_run] = {}
-
-                    # select dframe by day
-                    ts_day, ts_month, ts_year = section_ts_step.day, section_ts_step.month, section_ts_step.year
-                    section_dframe_day = section_dframe_simulated.loc[
-                                         (section_dframe_simulated.index.day == ts_day) &
-                                         (section_dframe_simulated.index.month == ts_month) &
-                                         (section_dframe_simulated.index.year == ts_year), :]
-
-                    # check alert thr
-                    log_stream.info(' -------> Select alert value, time and run ... ')
+                section_thr_collections = {}
+                for section_ts_id, section_ts_step in enumerate(section_ts_days):
+
+                    # get the alert data selection
                     section_thr_alert_max = None
                     section_thr_alert_idxmax_list, section_thr_alert_run_list = None, None
-                    # section_thr_alert_idxmax_str, section_thr_alert_run_str = None, None
-                    if (data_thr_alert is not None) and (data_thr_alarm is not None):
-
-                        # select dataframe based on threshold value(s)
-                        section_dframe_thr_alert = section_dframe_day.where(
-                            (section_dframe_day.values >= data_thr_alert) &
-                            (section_dframe_day.values < data_thr_alarm)).dropna()
-
-                        # check not empty dataframe
-                        if not section_dframe_thr_alert.empty:
-
-                            '''
-                            # debug
-                            if section_tag == 'misa:misa':
-                                if 'discharge_simulated_001' in list(section_dframe_thr_alert.columns):
-                                    section_dframe_thr_alert['discharge_simulated_001']['2023-02-28 02:00:00'] = 52.71
-                            '''
-
-                            section_thr_alert_max = section_dframe_thr_alert.max(skipna=True, axis=1).max()
-
-                            log_stream.info(' --------> Threshold analysis ... ')
-                            log_stream.info('      :::: Discharge value: "' + str(section_thr_alert_max) +
-                                            '" Discharge Threshold: "' + str(data_thr_alert) + '"')
-
-                            section_thr_alert_idxmax_list, section_thr_alert_run_list = [], []
-                            idx_i, idx_j = np.where(section_dframe_thr_alert.values == section_thr_alert_max)
-                            for step_n, (step_i, step_j) in enumerate(zip(idx_i, idx_j)):
-                                section_thr_alert_idxmax = section_dframe_thr_alert.index[step_i]
-                                section_thr_alert_run = section_dframe_thr_alert.columns[step_j]
-
-                                section_thr_alert_idxmax_list.append(section_thr_alert_idxmax)
-                                section_thr_alert_run_list.append(section_thr_alert_run)
-
-                                log_stream.info('      :::: [' + str(step_n + 1) + '] Discharge Time: "'
-                                                + str(section_thr_alert_idxmax) +
-                                                '" Discharge Run: "' + section_thr_alert_run + '"')
-
-                            # section_thr_alert_run_str = sep_format.join(section_thr_alert_run_list)
-                            # section_thr_alert_idxmax_tmp = [elem.strftime(time_format)
-                            #                                 for elem in section_thr_alert_idxmax_list]
-                            # section_thr_alert_idxmax_str = sep_format.join(section_thr_alert_idxmax_tmp)
-
-                            # info thr end
-                            log_stream.info(' -------> Select alert value, time and run ... DONE')
-                        else:
-                            log_stream.info(' -------> Select alert value, time and run ... SKIPPED. '
-                                            'All values are less than the threshold')
-                    else:
-                        log_stream.info(' -------> Select alert value, time and run ... SKIPPED. '
-                                        'Threshold is undefined')
-
-                    # check thr alarm
-                    log_stream.info(' -------> Select alarm value, time and run ... ')
+                    if section_alert_max is not None and section_alert_idx[section_ts_id]:
+                        section_thr_alert_max = section_alert_max[section_ts_id]
+                        section_thr_alert_idxmax_list = [section_ts_index[step_i]
+                                                         for step_i, _ in section_alert_idx[section_ts_id]]
+                        section_thr_alert_run_list = [section_ts_runs[step_j]
+                                                      for _, step_j in section_alert_idx[section_ts_id]]
+
+                        log_stream.info(' ------> Time "' + str(section_ts_step) + '" :: Alert value: "' +
+                                        str(section_thr_alert_max) + '" Threshold: "' + str(data_thr_alert) +
+                                        '" Run(s): "' + ','.join(section_thr_alert_run_list) + '"')
+
+                    # get the alarm data selection
                     section_thr_alarm_max = None
                     section_thr_alarm_idxmax_list, section_thr_alarm_run_list = None, None
-                    # section_thr_alarm_idxmax_str, section_thr_alarm_run_str = None, None
-                    if data_thr_alarm is not None:
-
-                        # select dataframe based on threshold value(s)
-                        section_dframe_thr_alarm = section_dframe_day.where(
-                            section_dframe_day.values > data_thr_alarm).dropna()
-
-                        # check not empty dataframe
-                        if not section_dframe_thr_alarm.empty:
-                            section_thr_alarm_max = section_dframe_thr_alarm.max(skipna=True, axis=1).max()
-
-                            log_stream.info(' --------> Threshold analysis ... ')
-                            log_stream.info('      :::: Discharge value: "' + str(section_thr_alarm_max) +
-                                            '" Discharge Threshold: "' + str(data_thr_alarm) + '"')
-
-                            section_thr_alarm_idxmax_list, section_thr_alarm_run_list = [], []
-                            idx_i, idx_j = np.where(section_dframe_thr_alarm.values == section_thr_alarm_max)
-                            for step_n, (step_i, step_j) in enumerate(zip(idx_i, idx_j)):
-
-                                section_thr_alarm_idxmax = section_dframe_thr_alarm.index[step_i]
-                                section_thr_alarm_run = section_dframe_thr_alarm.columns[step_j]
+                    if section_alarm_max is not None and section_alarm_idx[section_ts_id]:
+                        section_thr_alarm_max = section_alarm_max[section_ts_id]
+                        section_thr_alarm_idxmax_list = [section_ts_index[step_i]
+                                                         for step_i, _ in section_alarm_idx[section_ts_id]]
+                        section_thr_alarm_run_list = [section_ts_runs[step_j]
+                                                      for _, step_j in section_alarm_idx[section_ts_id]]
 
-                                section_thr_alarm_idxmax_list.append(section_thr_alarm_idxmax)
-                                section_thr_alarm_run_list.append(section_thr_alarm_run)
-
-                                log_stream.info('      :::: [' + str(step_n + 1) + '] Discharge Time: "'
-                                                + str(section_thr_alarm_idxmax) +
-                                                '" Discharge Run: "' + section_thr_alarm_run + '"')
-
-                            # section_thr_alarm_run_str = sep_format.join(section_thr_alarm_run_list)
-                            # section_thr_alarm_idxmax_tmp = [elem.strftime(time_format)
-                            #                                 for elem in section_thr_alarm_idxmax_list]
-                            # section_thr_alarm_idxmax_str = sep_format.join(section_thr_alarm_idxmax_tmp)
-
-                            # info thr end
-                            log_stream.info(' -------> Select alarm value, time and run ... DONE')
-                        else:
-                            log_stream.info(' -------> Select alarm value, time and run ... SKIPPED. '
-                                            'All values are less than the threshold')
-                    else:
-                        log_stream.info(' -------> Select alarm value, time and run ... SKIPPED. '
-                                        'Threshold is undefined')
+                        log_stream.info(' ------> Time "' + str(section_ts_step) + '" :: Alarm value: "' +
+                                        str(section_thr_alarm_max) + '" Threshold: "' + str(data_thr_alarm) +
+                                        '" Run(s): "' + ','.join(section_thr_alarm_run_list) + '"')
 
                     # collect the alert and alarm data selection
+                    section_thr_collections[section_ts_step] = {}
                     section_thr_collections[section_ts_step][tag_discharge_max_alert_value] = section_thr_alert_max
                     section_thr_collections[section_ts_step][tag_discharge_max_alert_index] = section_thr_alert_idxmax_list
                     section_thr_collections[section_ts_step][tag_discharge_max_alert_run] = section_thr_alert_run_list
@@ -314,9 +289,6 @@ def analyze_discharge_ts(run_name, file_datasets, time_start=None, time_end=None
                         attrs_ts_collections = {tag_run_n: run_n_filtered, tag_run_expected: run_n_expected,
                                                 tag_section_n: section_n, tag_run_type: run_name}
 
-                    # info time end
-                    log_stream.info(' ------> Time "' + str(section_ts_step) + '" ... DONE')
-
                 # merge in a common object
                 analysis_datasets_section[section_tag] = section_thr_collections
 
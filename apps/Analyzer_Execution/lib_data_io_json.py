@@ -14,6 +14,8 @@ import time
 import json
 import difflib
 
+from collections import OrderedDict
+
 import numpy as np
 import pandas as pd
 
@@ -21,9 +23,26 @@ from lib_info_args import logger_name
 
 # Logging
 log_stream = logging.getLogger(logger_name)
+
+# Cache of hydrograph datasets (least recently used; key: file path, value: time modified, file size, datasets)
+file_hydrograph_cache = OrderedDict()
+file_hydrograph_cache_size = 256
 #######################################################################################
 
 
+# -------------------------------------------------------------------------------------
+# Method to define the size of the hydrograph cache (e.g. outlets x executions of a run)
+def define_file_hydrograph_cache(cache_size):
+
+    global file_hydrograph_cache_size
+    file_hydrograph_cache_size = max(int(cache_size), 1)
+
+    while file_hydrograph_cache.__len__() > file_hydrograph_cache_size:
+        file_hydrograph_cache.popitem(last=False)
+
+# -------------------------------------------------------------------------------------
+
+
 # -------------------------------------------------------------------------------------
 # Method to write file hydrograph
 def write_file_hydrograph_ts(file_name, file_dict_raw, file_indent=4, file_sep=','):
@@ -54,15 +73,15 @@ def write_file_hydrograph_ts(file_name, file_dict_raw, file_indent=4, file_sep='
 
 
 # -------------------------------------------------------------------------------------
-# Method to read file execution information
-def read_file_hydrograph_info(file_name,
-                              tag_time_access='time_access', tag_time_modified='time_modified',
-                              tag_time_create='time_create', tag_file_size='file_size'):
+# Method to organize file execution information (using a stat result)
+def organize_file_hydrograph_info(file_stat,
+                                  tag_time_access='time_access', tag_time_modified='time_modified',
+                                  tag_time_create='time_create', tag_file_size='file_size'):
 
-    file_time_access = pd.Timestamp(time.ctime(os.path.getatime(file_name)))
-    file_time_modified = pd.Timestamp(time.ctime(os.path.getmtime(file_name)))
-    file_time_create = pd.Timestamp(time.ctime(os.path.getctime(file_name)))
-    file_size = os.path.getsize(file_name)
+    file_time_access = pd.Timestamp(time.ctime(file_stat.st_atime))
+    file_time_modified = pd.Timestamp(time.ctime(file_stat.st_mtime))
+    file_time_create = pd.Timestamp(time.ctime(file_stat.st_ctime))
+    file_size = file_stat.st_size
 
     file_obj = {tag_time_access: file_time_access, tag_time_modified: file_time_modified,
                 tag_time_create: file_time_create, tag_file_size: file_size}
@@ -71,6 +90,43 @@ def read_file_hydrograph_info(file_name,
 # -------------------------------------------------------------------------------------
 
 
+# -------------------------------------------------------------------------------------
+# Method to read file hydrograph information and time-series (single stat and single parse)
+def read_file_hydrograph(file_name, file_sep=',', time_format='%Y-%m-%d %H:%M', file_mandatory=True, file_cache=True,
+                         file_stat=None):
+
+    # stat the file if not already available (e.g. from the folder index)
+    if file_stat is None:
+        try:
+            file_stat = os.stat(file_name)
+        except (FileNotFoundError, NotADirectoryError):
+            if file_mandatory:
+                log_stream.error(' ===> Error in reading hydrograph file ' + file_name)
+                raise IOError('File not found')
+            return None, None
+
+    file_info = organize_file_hydrograph_info(file_stat)
+
+    # datasets are memoized by path with time modified and size (changed files are always reloaded; the least
+    # recently used files are dropped when the cache is full)
+    file_version = (file_stat.st_mtime_ns, file_stat.st_size)
+    if file_cache and file_name in file_hydrograph_cache and file_hydrograph_cache[file_name][0] == file_version:
+        file_hydrograph_cache.move_to_end(file_name)
+        file_data = file_hydrograph_cache[file_name][1]
+    else:
+        with open(file_name) as file_handle:
+            file_data_raw = json.load(file_handle)
+        file_data = organize_file_hydrograph_ts(file_data_raw, file_sep=file_sep, time_format=time_format)
+        if file_cache:
+            file_hydrograph_cache[file_name] = (file_version, file_data)
+            file_hydrograph_cache.move_to_end(file_name)
+            while file_hydrograph_cache.__len__() > file_hydrograph_cache_size:
+                file_hydrograph_cache.popitem(last=False)
+
+    return file_info, file_data
+# -------------------------------------------------------------------------------------
+
+
 # -------------------------------------------------------------------------------------
 # Method to read file hydrograph
 def read_file_hydrograph_ts(file_name, file_sep=',',
@@ -80,7 +136,7 @@ def read_file_hydrograph_ts(file_name, file_sep=',',
                             tag_time_out='time_period',
                             tag_discharge_obs_out='discharge_observed',
                             tag_discharge_sim_out='discharge_simulated',
-                            tag_index='time_period'):
+                            tag_index='time_period', time_format='%Y-%m-%d %H:%M'):
 
     if os.path.exists(file_name):
         with open(file_name) as file_handle:
@@ -89,6 +145,27 @@ def read_file_hydrograph_ts(file_name, file_sep=',',
         log_stream.error(' ===> Error in reading hydrograph file ' + file_name)
         raise IOError('File not found')
 
+    file_data_df, file_data_attrs = organize_file_hydrograph_ts(
+        file_data, file_sep=file_sep,
+        tag_time_in=tag_time_in, tag_discharge_obs_in=tag_discharge_obs_in, tag_discharge_sim_in=tag_discharge_sim_in,
+        tag_time_out=tag_time_out, tag_discharge_obs_out=tag_discharge_obs_out,
+        tag_discharge_sim_out=tag_discharge_sim_out, tag_index=tag_index, time_format=time_format)
+
+    return file_data_df, file_data_attrs
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to organize file hydrograph time-series
+def organize_file_hydrograph_ts(file_data, file_sep=',',
+                                tag_time_in='time_period',
+                                tag_discharge_obs_in='time_series_discharge_observed',
+                                tag_discharge_sim_in='time_series_discharge_simulated',
+                                tag_time_out='time_period',
+                                tag_discharge_obs_out='discharge_observed',
+                                tag_discharge_sim_out='discharge_simulated',
+                                tag_index='time_period', time_format='%Y-%m-%d %H:%M'):
+
     keys_list = list(file_data.keys())
     tag_discharge_sim_in_select = []
     tag_discharge_sim_out_select = []
@@ -96,20 +173,14 @@ def read_file_hydrograph_ts(file_name, file_sep=',',
         if tag_discharge_sim_in in keys_step:
             tag_discharge_sim_in_select.append(keys_step)
 
-            tag_diff_tmp = [li for li in difflib.ndiff(keys_step, tag_discharge_sim_in) if li[0] != ' ']
-            tag_diff_element = ''.join([tag_step[1:].strip() for tag_step in tag_diff_tmp])
-            tag_diff_idx = keys_step.find(tag_diff_element)
-
-            if tag_discharge_sim_out.__len__() == tag_diff_idx:
-                tag_discharge_sim_out_step = tag_discharge_sim_out[:tag_diff_idx] + tag_diff_element
-            elif tag_discharge_sim_out.__len__() > tag_diff_idx:
-                tag_discharge_sim_out_step = tag_discharge_sim_out + tag_diff_element
-            elif tag_discharge_sim_out.__len__() < tag_diff_idx:
-                tag_discharge_sim_out_step = tag_discharge_sim_out + tag_diff_element
+            # get the ensemble suffix (e.g. "_001") from the key prefix; use difflib only for unexpected keys
+            if keys_step.startswith(tag_discharge_sim_in):
+                tag_diff_element = keys_step[tag_discharge_sim_in.__len__():]
             else:
-                log_stream.error(' ===> Error in create tags for outcome variable')
-                raise NotImplementedError('Case not implemented yet')
+                tag_diff_tmp = [li for li in difflib.ndiff(keys_step, tag_discharge_sim_in) if li[0] != ' ']
+                tag_diff_element = ''.join([tag_step[1:].strip() for tag_step in tag_diff_tmp])
 
+            tag_discharge_sim_out_step = tag_discharge_sim_out + tag_diff_element
             tag_discharge_sim_out_select.append(tag_discharge_sim_out_step)
 
     variable_list_in = [tag_time_in, tag_discharge_obs_in]
@@ -130,9 +201,9 @@ def read_file_hydrograph_ts(file_name, file_sep=',',
     for file_key, file_value_tmp in file_data_dict.items():
         file_list_tmp = file_value_tmp.split(file_sep)
         if file_key == tag_time_out:
-            file_list_converted = pd.DatetimeIndex(file_list_tmp)
+            file_list_converted = convert_time_series(file_list_tmp, time_format=time_format)
         else:
-            file_list_converted = list(map(float, file_list_tmp))
+            file_list_converted = np.array(file_list_tmp, dtype=np.float64)
         file_data_dict[file_key] = file_list_converted
 
     file_data_df = pd.DataFrame(data=file_data_dict)
@@ -143,6 +214,19 @@ def read_file_hydrograph_ts(file_name, file_sep=',',
 # -------------------------------------------------------------------------------------
 
 
+# -------------------------------------------------------------------------------------
+# Method to convert time series (using a fixed format and the generic parser as fallback)
+def convert_time_series(time_list, time_format='%Y-%m-%d %H:%M'):
+    if time_format is not None:
+        try:
+            return pd.DatetimeIndex(pd.to_datetime(time_list, format=time_format))
+        except (ValueError, TypeError):
+            log_stream.warning(' ===> Time series is not in the "' + time_format +
+                               '" format. Generic time parser will be used')
+    return pd.DatetimeIndex(time_list)
+# -------------------------------------------------------------------------------------
+
+
 # -------------------------------------------------------------------------------------
 # Method to read file settings
 def read_file_settings(file_name):
@@ -20,6 +20,8 @@ import numpy as np
 import pandas as pd
 
 from distutils.util import strtobool
+
+from lib_data_io_workspace import check_workspace, read_workspace, write_workspace
 # -------------------------------------------------------------------------------------
 
 
@@ -169,10 +171,15 @@ def create_filename_tmp(prefix='tmp_', suffix='.tiff', folder=None):
 
 
 # -------------------------------------------------------------------------------------
-# Method to read data obj
-def read_obj(filename):
+# Method to read data obj (workspace or pickle format; variable selected only if defined)
+def read_obj(filename, var_name=None):
     if os.path.exists(filename):
-        data = pickle.load(open(filename, "rb"))
+        if check_workspace(filename):
+            data = read_workspace(filename, var_name=var_name)
+        else:
+            data = pickle.load(open(filename, "rb"))
+            if var_name is not None:
+                data = data[var_name]
     else:
         data = None
     return data
@@ -180,10 +187,15 @@ def read_obj(filename):
 
 
 # -------------------------------------------------------------------------------------
-# Method to write data obj
-def write_obj(filename, data):
-    if os.path.exists(filename):
-        os.remove(filename)
-    with open(filename, 'wb') as handle:
-        pickle.dump(data, handle, protocol=pickle.HIGHEST_PROTOCOL)
+# Method to write data obj (workspace or pickle format)
+def write_obj(filename, data, file_format='workspace'):
+    if file_format == 'workspace':
+        write_workspace(filename, data)
+    elif file_format == 'pickle':
+        if os.path.exists(filename):
+            os.remove(filename)
+        with open(filename, 'wb') as handle:
+            pickle.dump(data, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    else:
+        raise NotImplementedError('Obj format "' + file_format + '" is not supported')
 # -------------------------------------------------------------------------------------
@@ -17,22 +17,27 @@ import rasterio
 import numpy as np
 import pandas as pd
 
+from osgeo import gdalconst
+
 from lib_data_io_tiff import read_file_tiff, write_file_tiff
 from lib_data_io_nc import read_file_nc
 from lib_data_io_binary import read_file_binary
 from lib_data_io_pickle import read_obj, write_obj
-from lib_data_io_gzip import unzip_filename
+from lib_data_io_gzip import unzip_filename, unzip_filename_memory
 
-from lib_data_analysis import compute_q2t
+from lib_data_analysis import compute_q2t, initialize_running_stats, update_running_stats, compute_max_time
 
 from lib_utils_zip import remove_zip_extension
-from lib_utils_system import fill_tags2string, make_folder, join_path
+from lib_utils_system import fill_tags2string, make_folder, join_path, exists_file, refresh_file_index
 
 from lib_info_args import zip_extension, logger_name, time_format_datasets, time_format_algorithm
 
 # Logging
 log_stream = logging.getLogger(logger_name)
 
+# static datasets cache (shared by the time steps of the process)
+obj_static_cache = {}
+
 # Debug
 # import matplotlib.pylab as plt
 ######################################################################################
@@ -50,6 +55,7 @@ class DriverDynamic:
                  flag_src='Q',
                  flag_anc_q='Q', flag_anc_t='T',
                  flag_dst_q_ref='TQ', flag_dst_q_max='TQ_MAX',
+                 flag_dst_q_max_time='TQ_MAX_TIME', flag_dst_q_count='TQ_COUNT',
                  flag_cleaning_dynamic_src=True, flag_cleaning_dynamic_anl=True, flag_cleaning_dynamic_dst=True):
 
         self.time_reference = time_reference
@@ -61,6 +67,8 @@ class DriverDynamic:
         self.flag_anc_t = flag_anc_t
         self.flag_dst_q_ref = flag_dst_q_ref
         self.flag_dst_q_max = flag_dst_q_max
+        self.flag_dst_q_max_time = flag_dst_q_max_time
+        self.flag_dst_q_count = flag_dst_q_count
 
         self.alg_static = alg_static
         self.alg_info = alg_info
@@ -73,6 +81,7 @@ class DriverDynamic:
         self.dset_compression_tag = 'compression'
         self.dset_ratio_factor_tag = 'ratio_factor'
         self.dset_sub_path_ref_tag = 'sub_path_ref'
+        self.dset_active_tag = 'active'
 
         self.obj_domain_name = self.alg_info['domains']
         self.obj_run_name = self.alg_info['run']
@@ -114,6 +123,23 @@ class DriverDynamic:
         self.dset_ratio_factor_dst_q_max = dst_dict[self.flag_dst_q_max][self.dset_ratio_factor_tag]
         self.dset_sub_path_dst_q_max = dst_dict[self.flag_dst_q_max][self.dset_sub_path_ref_tag]
 
+        # optional running statistics (time of the max and count of valid steps; saved if active)
+        self.dset_dst_stats = {}
+        for stats_name, stats_flag in zip(['argmax', 'count'], [self.flag_dst_q_max_time, self.flag_dst_q_count]):
+            if stats_flag in list(dst_dict.keys()):
+                stats_dict = dst_dict[stats_flag]
+                stats_active = True
+                if self.dset_active_tag in list(stats_dict.keys()):
+                    stats_active = stats_dict[self.dset_active_tag]
+                if not stats_active:
+                    continue
+                self.dset_dst_stats[stats_name] = {
+                    'flag': stats_flag,
+                    'file_path': join_path(stats_dict[self.folder_name_tag], stats_dict[self.file_name_tag]),
+                    'variable': stats_dict[self.dset_variable_tag], 'type': stats_dict[self.dset_type_tag],
+                    'compression': stats_dict[self.dset_compression_tag],
+                    'ratio_factor': stats_dict[self.dset_ratio_factor_tag]}
+
         self.folder_name_tmp = tmp_dict[self.folder_name_tag]
         self.file_name_tmp = tmp_dict[self.file_name_tag]
         self.clean_tmp = True
@@ -193,17 +219,23 @@ class DriverDynamic:
     # -------------------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------------------
-    # method to get obj static
+    # method to get obj static (grids mapped in memory, read once and cached)
     @staticmethod
     def get_obj_static(file_name, file_var_geo='geo', file_var_statistics='statistics'):
 
         if os.path.exists(file_name):
-            file_obj = read_obj(file_name)
+            file_stat = os.stat(file_name)
+            file_key = (file_name, file_var_geo, file_var_statistics, file_stat.st_mtime_ns, file_stat.st_size)
+
+            if file_key not in obj_static_cache:
+                file_obj = read_obj(file_name, file_mmap=True)
 
-            file_data_geo = file_obj[file_var_geo]
-            file_data_stats = file_obj[file_var_statistics]
+                file_data_geo = file_obj[file_var_geo]
+                file_data_stats = file_obj[file_var_statistics]
 
-            file_collections = {**file_data_geo, **file_data_stats}
+                obj_static_cache[file_key] = {**file_data_geo, **file_data_stats}
+
+            file_collections = obj_static_cache[file_key]
 
         else:
             log_stream.error(' ===> File  "' + file_name + '" is not found. ')
@@ -218,8 +250,10 @@ class DriverDynamic:
     def get_data_dynamic(self, file_path_def, dim_x=None, dim_y=None,
                          folder_name_tmp=None, clean_tmp=True):
 
-        if os.path.exists(file_path_def):
+        if exists_file(file_path_def):
 
+            # tmp file (decompressed or source file) or tmp buffer (decompressed in memory)
+            file_path_tmp, file_buffer_tmp = None, None
             if self.dset_compression_src:
 
                 if folder_name_tmp is None:
@@ -228,11 +262,15 @@ class DriverDynamic:
                     make_folder(folder_name_tmp)
 
                 if file_path_def.endswith(zip_extension):
-                    file_path_noext = remove_zip_extension(file_path_def)
-                    folder_name_noext, file_name_noext = os.path.split(file_path_noext)
-                    file_path_tmp = os.path.join(folder_name_tmp, file_name_noext)
+                    if self.dset_type_src == 'netcdf' or self.dset_type_src == 'binary':
+                        # decompress in memory (no tmp file)
+                        file_buffer_tmp = unzip_filename_memory(file_path_def)
+                    else:
+                        file_path_noext = remove_zip_extension(file_path_def)
+                        folder_name_noext, file_name_noext = os.path.split(file_path_noext)
+                        file_path_tmp = os.path.join(folder_name_tmp, file_name_noext)
 
-                    unzip_filename(file_path_def, file_path_tmp)
+                        unzip_filename(file_path_def, file_path_tmp)
 
                 else:
                     log_stream.error(' ===> File compression "' + zip_extension + '" is not supported')
@@ -243,11 +281,11 @@ class DriverDynamic:
 
             if self.dset_type_src == 'netcdf':
                 file_data = read_file_nc(
-                    file_path_tmp,
+                    file_buffer_tmp if file_buffer_tmp is not None else file_path_tmp,
                     var_name=self.dset_variable_src, var_ratio_factor=self.dset_ratio_factor_src)
             elif self.dset_type_src == 'binary':
                 file_data = read_file_binary(
-                    file_path_tmp,
+                    file_buffer_tmp if file_buffer_tmp is not None else file_path_tmp,
                     file_dim_x=dim_x, file_dim_y=dim_y, file_ratio_factor=self.dset_ratio_factor_src)
             elif self.dset_type_src == 'tiff' or self.dset_type_src == 'tif':
                 file_data, file_proj, file_geotrans = read_file_tiff(
@@ -275,7 +313,8 @@ class DriverDynamic:
     # method to save dynamic data
     @staticmethod
     def save_data_dynamic(file_name, file_data, file_variable, file_geo_x, file_geo_y, file_scale_factor=1,
-                          file_epsg_code='EPSG:4326', file_type='tiff', file_compression=False):
+                          file_epsg_code='EPSG:4326', file_type='tiff', file_compression=False,
+                          file_format=gdalconst.GDT_Float32):
 
         if file_compression:
             log_stream.error(' ===> File compression is not supported')
@@ -305,7 +344,7 @@ class DriverDynamic:
             write_file_tiff(file_name=file_name, file_data=file_data,
                             file_wide=file_data_width, file_high=file_data_height,
                             file_geotrans=file_data_transform, file_proj=file_epsg_code,
-                            file_metadata=file_variable)
+                            file_metadata=file_variable, file_format=file_format)
         else:
             # file format not supported
             log_stream.error(' ===> File type "' + file_type + '" is not supported. Only tiff format is allowed')
@@ -379,18 +418,33 @@ class DriverDynamic:
                 tags_filled={'domain_name': domain_name,
                              'destination_datetime': time_reference, 'destination_sub_path_time': time_sub_path})
 
+            file_path_dst_stats_def = {}
+            for stats_name, stats_fields in self.dset_dst_stats.items():
+                file_path_dst_stats_def[stats_name] = self.define_file_name(
+                    stats_fields['file_path'], tags_template=self.alg_template,
+                    tags_filled={'domain_name': domain_name,
+                                 'destination_datetime': time_reference, 'destination_sub_path_time': time_sub_path})
+
             if flag_cleaning_dynamic_dst:
                 if os.path.exists(file_path_dst_q_ref_def):
                     os.remove(file_path_dst_q_ref_def)
                 if os.path.exists(file_path_dst_q_max_def):
                     os.remove(file_path_dst_q_max_def)
+                for file_path_dst_stats_step in file_path_dst_stats_def.values():
+                    if os.path.exists(file_path_dst_stats_step):
+                        os.remove(file_path_dst_stats_step)
 
             # check file ancillary t
-            if (not os.path.exists(file_path_dst_q_ref_def)) or (not os.path.exists(file_path_dst_q_max_def)):
+            if (not os.path.exists(file_path_dst_q_ref_def)) or (not os.path.exists(file_path_dst_q_max_def)) or \
+                    (not all([os.path.exists(file_path) for file_path in file_path_dst_stats_def.values()])):
+
+                # initialize reference and running statistics (no time cube is allocated)
+                t_data_reference = np.zeros(shape=[static_data['dim_x'], static_data['dim_y']])
+                t_data_reference[:, :] = np.nan
+                t_data_stats = initialize_running_stats(
+                    static_data['dim_x'], static_data['dim_y'], stats_list=['max'] + list(file_path_dst_stats_def.keys()))
 
                 # iterate over time steps
-                t_data_collection = np.zeros(shape=[static_data['dim_x'], static_data['dim_y'], time_window.shape[0]])
-                t_data_collection[:, :, :] = np.nan
                 for time_id, time_step in enumerate(time_window):
 
                     # info time start
@@ -420,8 +474,10 @@ class DriverDynamic:
 
                         # compute q ref and q max
                         if t_data_step is not None:
-                            # store data
-                            t_data_collection[:, :, time_id] = t_data_step
+                            # store reference data and update running statistics
+                            if time_id == idx_reference:
+                                t_data_reference[:, :] = t_data_step
+                            update_running_stats(t_data_stats, t_data_step, time_id)
                             # info time end
                             log_stream.info(' ------> Time "' + time_step.strftime(time_format_algorithm) +
                                             '" ... DONE')
@@ -437,7 +493,6 @@ class DriverDynamic:
 
                 # save q ref information
                 log_stream.info(' ------> Save "' + self.flag_dst_q_ref + '" ... ')
-                t_data_reference = t_data_collection[:, :, idx_reference]
                 if np.isnan(t_data_reference).all():
                     log_stream.info(' ------> Save "' + self.flag_dst_q_ref + '" ... SKIPPED. All values are NaNs')
                 else:
@@ -451,7 +506,7 @@ class DriverDynamic:
 
                 # save q max information
                 log_stream.info(' ------> Save "' + self.flag_dst_q_max + '" ... ')
-                t_data_max = np.nanmax(t_data_collection, axis=2)
+                t_data_max = t_data_stats['max']
                 if np.isnan(t_data_reference).all():
                     log_stream.info(' ------> Save "' + self.flag_dst_q_max + '" ... SKIPPED. All values are NaNs')
                 else:
@@ -463,6 +518,32 @@ class DriverDynamic:
                         file_compression=self.dset_compression_dst_q_max)
                     log_stream.info(' ------> Save "' + self.flag_dst_q_max + '" ... DONE')
 
+                # save running statistics information (optional)
+                for stats_name, stats_fields in self.dset_dst_stats.items():
+                    log_stream.info(' ------> Save "' + stats_fields['flag'] + '" ... ')
+                    if np.isnan(t_data_reference).all():
+                        log_stream.info(' ------> Save "' + stats_fields['flag'] +
+                                        '" ... SKIPPED. All values are NaNs')
+                    else:
+                        if stats_name == 'argmax':
+                            # time of the max (time step of the window coded as "%Y%m%d%H%M"; float64 is exact)
+                            t_data_stats_step = compute_max_time(
+                                t_data_stats[stats_name], time_window, time_format=time_format_datasets)
+                            t_data_stats_format = gdalconst.GDT_Float64
+                            t_data_stats_metadata = {'description_field': stats_fields['variable'],
+                                                     'time_format': time_format_datasets}
+                        else:
+                            t_data_stats_step = t_data_stats[stats_name].astype(np.float32)
+                            t_data_stats_format = gdalconst.GDT_Float32
+                            t_data_stats_metadata = stats_fields['variable']
+                        self.save_data_dynamic(
+                            file_name=file_path_dst_stats_def[stats_name], file_data=t_data_stats_step,
+                            file_geo_x=static_data['geo_x'], file_geo_y=static_data['geo_y'],
+                            file_variable=t_data_stats_metadata, file_type=stats_fields['type'],
+                            file_scale_factor=stats_fields['ratio_factor'],
+                            file_compression=stats_fields['compression'], file_format=t_data_stats_format)
+                        log_stream.info(' ------> Save "' + stats_fields['flag'] + '" ... DONE')
+
                 # info domain end
                 log_stream.info(' -----> Domain "' + domain_name + '" ... DONE')
 
@@ -563,7 +644,7 @@ class DriverDynamic:
 
                             # compute t as a function q
                             t_data_step = compute_q2t(q_data_step, q_index, statistics_params, geo_area,
-                                                      debug_flag=self.flag_debug)
+                                                      no_data_t=np.nan, debug_flag=self.flag_debug)
 
                             # organize data collections
                             anl_data_collections = {self.flag_anc_t: t_data_step}
@@ -630,6 +711,9 @@ class DriverDynamic:
         # get flags
         flag_cleaning_dynamic_src = self.flag_cleaning_dynamic_src
 
+        # refresh the folder index (files of the runs can appear between the time steps)
+        refresh_file_index()
+
         # iterate over domain list
         src_file_collection = {}
         for domain_name in domain_list:
@@ -674,8 +758,8 @@ class DriverDynamic:
                     if os.path.exists(file_path_anc_q_def):
                         os.remove(file_path_anc_q_def)
 
-                # check file source
-                if os.path.exists(file_path_src_def):
+                # check file source (using the folder index)
+                if exists_file(file_path_src_def):
 
                     # check file ancillary
                     src_file_collection[domain_name][time_step] = {}
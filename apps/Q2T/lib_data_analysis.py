@@ -11,6 +11,7 @@ Version:       '1.0.0'
 import logging
 import math
 import numpy as np
+import pandas as pd
 import matplotlib.pylab as plt
 import warnings
 
@@ -28,20 +29,38 @@ log_stream = logging.getLogger(logger_name)
 # -------------------------------------------------------------------------------------
 # method to compute T(Q)
 def compute_q2t(q_data, q_index, statistics_params, geo_area,
-                no_data_t=-9999, max_value_t=500, debug_flag=0):
+                no_data_t=-9999, max_value_t=500, tile_size=1048576, debug_flag=0):
 
     shape, scale, location = statistics_params[0, 0], statistics_params[0, 1], statistics_params[0, 2]
 
-    kt = np.zeros(shape=[q_index.shape[0], q_index.shape[1]])
-    kt[:, :] = q_data/q_index
-    kt[kt < 0.0] = 0.0
-    P = genextreme.cdf(kt, -shape, location, scale)
+    # flatten datasets (views if possible)
+    q_data_1d, q_index_1d = np.ravel(q_data), np.ravel(q_index)
+    geo_area_1d = np.ravel(geo_area)
 
-    T = np.zeros(shape=[kt.shape[0], kt.shape[1]])
-    T[:, :] = 1.0 / (1.0 - P)
-    T[geo_area < 1.0] = np.nan
-    T[T == np.nan] = no_data_t
-    T[T > max_value_t] = max_value_t
+    # initialize T with no data (cells not computed or undefined)
+    T = np.zeros(shape=[q_index.shape[0], q_index.shape[1]], dtype=np.float32)
+    T[:, :] = no_data_t
+    T_1d = T.reshape(-1)
+
+    # iterate over tiles (only the cells with geo_area >= 1 are computed)
+    for tile_start in range(0, T_1d.shape[0], tile_size):
+        tile_end = min(tile_start + tile_size, T_1d.shape[0])
+
+        tile_idx = np.flatnonzero(~(geo_area_1d[tile_start:tile_end] < 1.0)) + tile_start
+        if tile_idx.shape[0] == 0:
+            continue
+
+        # compute kt = q / q_index (negative values are set to zero)
+        kt = np.asarray(q_data_1d[tile_idx], dtype=np.float32)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            np.divide(kt, np.asarray(q_index_1d[tile_idx], dtype=np.float32), out=kt)
+        kt[kt < 0.0] = 0.0
+
+        # compute T over the tile (fused clipping and no data)
+        tile_t = compute_gev_return_period(kt, shape, scale, location, max_value_t=max_value_t)
+        tile_t[np.isnan(tile_t)] = no_data_t
+
+        T_1d[tile_idx] = tile_t
 
     if debug_flag == 1:
         plt.figure(1)
@@ -61,6 +80,98 @@ def compute_q2t(q_data, q_index, statistics_params, geo_area,
 # -------------------------------------------------------------------------------------
 
 
+# -------------------------------------------------------------------------------------
+# method to compute T = 1 / (1 - P) using the closed form of the GEV cdf (in place of kt)
+def compute_gev_return_period(kt, shape, scale, location, max_value_t=500):
+
+    # P = exp(-z) with z = (1 + shape * y) ** (-1 / shape) [genextreme.cdf(kt, -shape, location, scale)]
+    # T = 1 / (1 - P) = -1 / expm1(-z) (stable when P is near to 1)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        z = np.subtract(kt, location, out=kt)
+        np.divide(z, scale, out=z)
+        if shape == 0:
+            np.negative(z, out=z)
+            np.exp(z, out=z)
+        else:
+            np.multiply(z, shape, out=z)
+            np.add(z, 1.0, out=z)
+            np.maximum(z, 0.0, out=z)
+            np.power(z, -1.0 / shape, out=z)
+        np.negative(z, out=z)
+        np.expm1(z, out=z)
+        np.negative(z, out=z)
+        np.reciprocal(z, out=z)
+
+    np.minimum(z, max_value_t, out=z)
+
+    return z
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# method to initialize running statistics (max, argmax and count of valid steps)
+def initialize_running_stats(dim_x, dim_y, stats_list=None):
+
+    if stats_list is None:
+        stats_list = ['max']
+
+    stats_obj = {}
+    for stats_name in stats_list:
+        if stats_name == 'max':
+            stats_obj[stats_name] = np.zeros(shape=[dim_x, dim_y])
+            stats_obj[stats_name][:, :] = np.nan
+        elif stats_name == 'argmax':
+            stats_obj[stats_name] = np.zeros(shape=[dim_x, dim_y], dtype=np.int32)
+            stats_obj[stats_name][:, :] = -1
+        elif stats_name == 'count':
+            stats_obj[stats_name] = np.zeros(shape=[dim_x, dim_y], dtype=np.int32)
+        else:
+            log_stream.error(' ===> Running statistics "' + stats_name + '" is not supported')
+            raise NotImplemented('Case not implemented yet')
+
+    # argmax is updated using the running max
+    if 'argmax' in list(stats_obj.keys()) and 'max' not in list(stats_obj.keys()):
+        stats_obj['max'] = np.zeros(shape=[dim_x, dim_y])
+        stats_obj['max'][:, :] = np.nan
+
+    return stats_obj
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# method to update running statistics with a time step (nan values are skipped)
+def update_running_stats(stats_obj, data_step, step_id):
+
+    data_valid = ~np.isnan(data_step)
+
+    if 'argmax' in list(stats_obj.keys()):
+        # first occurrence of the max value (as np.nanargmax)
+        data_greater = data_valid & ~(data_step <= stats_obj['max'])
+        stats_obj['argmax'][data_greater] = step_id
+    if 'max' in list(stats_obj.keys()):
+        np.fmax(stats_obj['max'], data_step, out=stats_obj['max'])
+    if 'count' in list(stats_obj.keys()):
+        stats_obj['count'] += data_valid
+
+    return stats_obj
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# method to compute the time of the max from the running argmax (time coded as "%Y%m%d%H%M"; nan if not defined)
+def compute_max_time(stats_argmax, time_window, time_format='%Y%m%d%H%M'):
+
+    time_codes = np.array([float(pd.Timestamp(time_step).strftime(time_format)) for time_step in time_window])
+
+    data_max_time = np.zeros(shape=stats_argmax.shape, dtype=np.float64)
+    data_max_time[:, :] = np.nan
+    data_valid = stats_argmax >= 0
+    data_max_time[data_valid] = time_codes[stats_argmax[data_valid]]
+
+    return data_max_time
+# -------------------------------------------------------------------------------------
+
+
 # -------------------------------------------------------------------------------------
 # method to organize geo parameters
 def organize_geo_parameters(obj_geo, obj_watermark=None, dim_km=0.1705, no_data=-9999):
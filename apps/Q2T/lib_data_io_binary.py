@@ -20,9 +20,13 @@ log_stream = logging.getLogger(logger_name)
 
 
 # -------------------------------------------------------------------------------------
-# Method to read file settings
+# Method to read file settings (file name or decompressed bytes)
 def read_file_binary(file_name, file_dim_x=None, file_dim_y=None, file_ratio_factor=1, file_type=np.int32):
-    if os.path.exists(file_name):
+    if isinstance(file_name, (bytes, bytearray)):
+        data_tmp = np.frombuffer(file_name, dtype=file_type)
+        data_map = np.reshape(data_tmp, (int(file_dim_x), int(file_dim_y)))
+        data_var = np.transpose(data_map.astype(float) / file_ratio_factor)
+    elif os.path.exists(file_name):
         data_tmp = np.fromfile(file_name, dtype=file_type)
         data_map = np.reshape(data_tmp, (int(file_dim_x), int(file_dim_y)))
         data_var = np.transpose(data_map.astype(float) / file_ratio_factor)
@@ -10,6 +10,7 @@ Version:       '1.0.0'
 # Library
 import logging
 import os
+import netCDF4
 import numpy as np
 import xarray as xr
 
@@ -21,9 +22,15 @@ log_stream = logging.getLogger(logger_name)
 
 
 # -------------------------------------------------------------------------------------
-# Method to read file settings
+# Method to read file settings (file name or decompressed bytes)
 def read_file_nc(file_name, var_name='Discharge', var_ratio_factor=1):
-    if os.path.exists(file_name):
+    if isinstance(file_name, (bytes, bytearray)):
+        file_handle = netCDF4.Dataset('memory.nc', mode='r', memory=file_name)
+        file_dset = xr.open_dataset(xr.backends.NetCDF4DataStore(file_handle), decode_times=False)
+        data_var = np.flipud(file_dset[var_name].values)
+        data_var = data_var / var_ratio_factor
+        file_dset.close()
+    elif os.path.exists(file_name):
         file_dset = xr.open_mfdataset(file_name, decode_times=False)
         data_var = np.flipud(file_dset[var_name].values)
         data_var = data_var / var_ratio_factor
@@ -98,6 +98,9 @@ def main():
 
     # ------------------------------------------------------------------------------------------------------------------
     # Driver and method of dynamic datasets
+    alg_parallel = None
+    if 'parallel' in list(data_settings['algorithm'].keys()):
+        alg_parallel = data_settings['algorithm']['parallel']
     driver_data_dynamic = DriverDynamic(
         time_reference=time_run,
         time_range=time_range,
@@ -110,7 +113,7 @@ def main():
         alg_template=data_settings['algorithm']['template'],
         flag_clean_dynamic_src=data_settings['algorithm']['flags']['clean_dynamic_source'],
         flag_clean_dynamic_dst=data_settings['algorithm']['flags']['clean_dynamic_destination'],
-
+        alg_parallel=alg_parallel
     )
     file_collection = driver_data_dynamic.organize_dynamic()
     driver_data_dynamic.dump_dynamic(file_collection)
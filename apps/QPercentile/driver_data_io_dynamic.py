@@ -12,28 +12,36 @@ Version:       '1.1.0'
 import logging
 import os
 from copy import deepcopy
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 
 import rasterio
 import numpy as np
 import xarray as xr
 
 from lib_data_io_tiff import write_file_tiff
-from lib_data_io_nc import read_file_nc
-from lib_data_io_binary import read_file_binary
+from lib_data_io_nc import read_file_nc, read_file_nc_select
+from lib_data_io_binary import read_file_binary, read_file_binary_select
 from lib_data_io_pickle import read_obj, write_obj
-from lib_data_io_gzip import unzip_filename
+from lib_data_io_gzip import unzip_filename, unzip_filename_memory
 
 from lib_data_analysis import compute_quantile
 
 from lib_utils_io import define_ensemble_list, create_darray
 from lib_utils_zip import remove_zip_extension, add_zip_extension
-from lib_utils_system import fill_tags2string, make_folder, join_path
+from lib_utils_system import fill_tags2string, make_folder, join_path, exists_file, refresh_file_index
 
 from lib_info_args import zip_extension, logger_name, time_format_datasets, time_format_algorithm
 
 # logging
 log_stream = logging.getLogger(logger_name)
 
+# static datasets cache (shared by the time steps of the process)
+obj_static_cache = {}
+# ensemble pools (created once for each process and reused by the domains and time steps)
+ensemble_pool_cache = {}
+# time worker settings (set once for each worker process by the time pool initializer)
+time_worker_settings = {}
+
 # debugging
 import matplotlib.pylab as plt
 # ----------------------------------------------------------------------------------------------------------------------
@@ -47,7 +55,7 @@ class DriverDynamic:
     # Initialize class
     def __init__(self, time_reference, time_range,
                  src_dict, anc_dict=None, dst_dict=None, tmp_dict=None,
-                 alg_static=None, alg_info=None, alg_template=None,
+                 alg_static=None, alg_info=None, alg_template=None, alg_parallel=None,
                  flag_cnet_data='channel_network', flag_idx_data='idx',
                  flag_src='Q', flag_anc='Q', flag_dst='Q',
                  flag_clean_dynamic_src=True, flag_clean_dynamic_dst=True):
@@ -72,6 +80,7 @@ class DriverDynamic:
         self.dset_variable_tag, self.dset_format_tag, self.dset_decimals_tag = 'variable', 'format', 'decimals'
         self.dset_compression_tag, self.dset_ratio_factor_tag = 'compression', 'ratio_factor'
         self.dset_sub_path_ref_tag = 'sub_path_ref'
+        self.dset_read_mode_tag = 'read_mode'
 
         # parameters info
         self.obj_domain_name = self.alg_info['domains']
@@ -80,6 +89,23 @@ class DriverDynamic:
         self.obj_ensemble = self.alg_info['ensemble']
         self.ensemble_n_min, self.ensemble_n_max = self.obj_ensemble['n_min'], self.obj_ensemble['n_max']
         self.ensemble_format = self.obj_ensemble['n_format']
+        self.ensemble_join = False
+        if 'join_data' in list(self.obj_ensemble.keys()):
+            self.ensemble_join = self.obj_ensemble['join_data']
+
+        # parallel info (ensemble mode: 'serial', 'thread' or 'process'; time steps in process mode)
+        self.ensemble_mode, self.ensemble_workers, self.time_workers = 'serial', 1, 1
+        if alg_parallel is not None:
+            if 'ensemble_mode' in list(alg_parallel.keys()):
+                self.ensemble_mode = alg_parallel['ensemble_mode']
+            if 'ensemble_workers' in list(alg_parallel.keys()):
+                self.ensemble_workers = alg_parallel['ensemble_workers']
+            if 'time_workers' in list(alg_parallel.keys()):
+                self.time_workers = alg_parallel['time_workers']
+        if self.time_workers != 1 and self.ensemble_mode == 'process':
+            log_stream.warning(' ===> Ensemble mode "process" is not allowed with time workers. '
+                               'Ensemble mode is set to "serial"')
+            self.ensemble_mode = 'serial'
 
         # define ensemble and quantile list
         self.ensemble_list = define_ensemble_list(self.ensemble_n_min, self.ensemble_n_max, self.ensemble_format)
@@ -98,6 +124,9 @@ class DriverDynamic:
         self.dset_compression_src = src_dict[self.dset_compression_tag]
         self.dset_ratio_factor_src = src_dict[self.dset_ratio_factor_tag]
         self.dset_sub_path_src = src_dict[self.dset_sub_path_ref_tag]
+        self.dset_read_mode_src = 'file'
+        if self.dset_read_mode_tag in list(src_dict.keys()):
+            self.dset_read_mode_src = src_dict[self.dset_read_mode_tag]
 
         # ancillary info
         folder_name_anc = anc_dict[self.folder_name_tag]
@@ -120,6 +149,13 @@ class DriverDynamic:
         self.file_name_tmp = tmp_dict[self.file_name_tag]
         self.clean_tmp = True
 
+        # src settings (passed to the ensemble workers instead of the driver object)
+        self.dset_settings_src = {
+            'variable': self.dset_variable_src, 'format': self.dset_format_src,
+            'compression': self.dset_compression_src, 'ratio_factor': self.dset_ratio_factor_src,
+            'read_mode': self.dset_read_mode_src,
+            'folder_name_tmp': self.folder_name_tmp, 'clean_tmp': self.clean_tmp}
+
         # flags info
         self.flag_clean_dynamic_src = flag_clean_dynamic_src
         self.flag_clean_dynamic_dst = flag_clean_dynamic_dst
@@ -160,8 +196,7 @@ class DriverDynamic:
     @staticmethod
     def get_obj_static(file_name, file_var_data='channel_network'):
         if os.path.exists(file_name):
-            file_obj = read_obj(file_name)
-            file_data = file_obj[file_var_data]
+            file_data = read_obj(file_name, var_name=file_var_data)
         else:
             log_stream.error(' ===> File  "' + file_name + '" is not found. ')
             raise RuntimeError('Static information must be defined for running the algorithm')
@@ -171,56 +206,89 @@ class DriverDynamic:
     # ------------------------------------------------------------------------------------------------------------------
 
     # ------------------------------------------------------------------------------------------------------------------
-    # method to get data dynamic
-    def get_data_dynamic(self, file_path_def, dim_x=None, dim_y=None,
-                         folder_name_tmp=None, clean_tmp=True):
+    # method to get obj static for a domain (grids mapped in memory, read once and cached)
+    def get_obj_static_domain(self, domain_name):
 
-        if os.path.exists(file_path_def):
+        # check static datasets
+        if domain_name in list(self.alg_static.keys()):
+            file_name = self.alg_static[domain_name]
+        else:
+            log_stream.error(
+                ' ===> Statistics information for domain "' + domain_name + '" are not available')
+            raise RuntimeError("Statistics information are mandatory for correctly running the algorithm")
 
-            if self.dset_compression_src:
+        if os.path.exists(file_name):
+            file_stat = os.stat(file_name)
+            file_key = (file_name, self.flag_cnet_data, self.flag_idx_data, file_stat.st_mtime_ns, file_stat.st_size)
+        else:
+            log_stream.error(' ===> File  "' + file_name + '" is not found. ')
+            raise RuntimeError('Static information must be defined for running the algorithm')
 
-                if folder_name_tmp is None:
-                    folder_name_tmp = '/tmp'
-                if not os.path.exists(folder_name_tmp):
-                    make_folder(folder_name_tmp)
+        # get static datasets
+        if file_key not in obj_static_cache:
+            geo_da = read_obj(file_name, var_name=self.flag_cnet_data, file_mmap=True)
+            geo_idx = read_obj(file_name, var_name=self.flag_idx_data, file_mmap=True)
+            geo_data = geo_da.values
+            geo_x, geo_y = geo_da['longitude'].values, geo_da['latitude'].values
+            obj_static_cache[file_key] = (geo_data, geo_x, geo_y, geo_idx)
 
-                if file_path_def.endswith(zip_extension):
-                    file_path_noext = remove_zip_extension(file_path_def)
-                    folder_name_noext, file_name_noext = os.path.split(file_path_noext)
-                    file_path_tmp = os.path.join(folder_name_tmp, file_name_noext)
+        return obj_static_cache[file_key]
 
-                    unzip_filename(file_path_def, file_path_tmp)
+    # ------------------------------------------------------------------------------------------------------------------
 
-                else:
-                    log_stream.error(' ===> File compression "' + zip_extension + '" is not supported')
-                    raise NotImplemented('Case not implemented yet')
+    # ------------------------------------------------------------------------------------------------------------------
+    # method to define ensemble filename
+    def define_file_ensemble(self, ensemble_name, domain_name, time_step, time_sub_path):
+        file_path_src_def = self.define_file_name(
+            self.file_path_src, tags_template=self.alg_template,
+            tags_filled={'domain_name': domain_name, 'ensemble_name': ensemble_name,
+                         'source_datetime': time_step, 'source_sub_path_time': time_sub_path})
+        return file_path_src_def
+    # ------------------------------------------------------------------------------------------------------------------
 
-            else:
-                file_path_tmp = deepcopy(file_path_def)
-
-            if self.dset_format_src == 'netcdf':
-                file_data = read_file_nc(
-                    file_path_tmp,
-                    var_name=self.dset_variable_src, var_ratio_factor=self.dset_ratio_factor_src)
-            elif self.dset_format_src == 'binary':
-                file_data = read_file_binary(
-                    file_path_tmp,
-                    file_dim_x=dim_x, file_dim_y=dim_y, file_ratio_factor=self.dset_ratio_factor_src)
-            else:
-                log_stream.error(' ===> File type "' + self.dset_format_src + '" is not supported')
-                raise NotImplemented('Case not implemented yet')
+    # ------------------------------------------------------------------------------------------------------------------
+    # method to organize ensemble data (columns are filled in place)
+    def organize_ensemble(self, ensemble_data, domain_name, time_step, time_sub_path, geo_data, geo_idx):
 
-            if file_path_tmp is not None:
-                if file_path_tmp != file_path_def:
-                    if clean_tmp:
-                        if os.path.exists(file_path_tmp):
-                            os.remove(file_path_tmp)
+        # get ensemble list and parallel settings
+        ensemble_list = self.ensemble_list
+        ensemble_mode, ensemble_workers = self.ensemble_mode, self.ensemble_workers
+        if ensemble_workers is None:
+            ensemble_workers = os.cpu_count()
+        ensemble_workers = max(1, min(ensemble_workers, len(ensemble_list)))
+
+        # define ensemble common args (the workers get the file path, the indexes and the src settings only)
+        ensemble_args = dict(geo_idx=geo_idx, dset_settings=self.dset_settings_src,
+                             dim_x=geo_data.shape[0], dim_y=geo_data.shape[1])
+
+        if ensemble_mode == 'serial' or ensemble_workers == 1:
+
+            # iterate over ensemble list (serial mode)
+            for ensemble_id, ensemble_name in enumerate(ensemble_list):
+                file_path_src_def = self.define_file_ensemble(ensemble_name, domain_name, time_step, time_sub_path)
+                ensemble_data[:, ensemble_id] = get_data_ensemble(
+                    file_path_src_def, ensemble_name=ensemble_name, **ensemble_args)
+
+        elif ensemble_mode == 'thread' or ensemble_mode == 'process':
+
+            # get ensemble pool (created at the first call and reused by the next domains and time steps)
+            ensemble_pool = get_ensemble_pool(ensemble_mode, ensemble_workers)
+
+            # iterate over ensemble list (thread or process mode)
+            ensemble_futures = {}
+            for ensemble_id, ensemble_name in enumerate(ensemble_list):
+                file_path_src_def = self.define_file_ensemble(ensemble_name, domain_name, time_step, time_sub_path)
+                ensemble_future = ensemble_pool.submit(
+                    get_data_ensemble, file_path_src_def, ensemble_name=ensemble_name, **ensemble_args)
+                ensemble_futures[ensemble_future] = ensemble_id
+            for ensemble_future in as_completed(ensemble_futures):
+                ensemble_data[:, ensemble_futures[ensemble_future]] = ensemble_future.result()
 
         else:
-            log_stream.warning(' ===> File  "' + file_path_def + '" is not found. ')
-            file_data = None
+            log_stream.error(' ===> Ensemble mode "' + ensemble_mode + '" is not supported')
+            raise NotImplemented('Case not implemented yet')
 
-        return file_data
+        return ensemble_data
 
     # ------------------------------------------------------------------------------------------------------------------
 
@@ -283,13 +351,44 @@ class DriverDynamic:
                         + self.time_reference.strftime(time_format_algorithm) + '] ... ')
 
         # get time info
-        time_reference = self.time_reference
         time_range = self.time_range
         # get domain
         domain_list = self.obj_domain_name
-        # get quantile and ensemble list
+
+        # iterate over domain list
+        for domain_name in domain_list:
+
+            # info domain start
+            log_stream.info(' -----> Domain "' + domain_name + '" ... ')
+
+            # check domain availability
+            if domain_name in list(file_collection.keys()):
+                file_collection_domain = file_collection[domain_name]
+            else:
+                log_stream.warning(' ===> Domain "' + domain_name +
+                                   '" is not available in the file collections')
+                file_collection_domain = None
+
+            # iterate over time steps (serial or parallel mode)
+            self.organize_time(self.dump_dynamic_step, domain_name, time_range,
+                               time_args={'file_collection_domain': file_collection_domain})
+
+            # info domain start
+            log_stream.info(' -----> Domain "' + domain_name + '" ... DONE')
+
+        # info end
+        log_stream.info(' ----> Dump dynamic datasets ['
+                        + self.time_reference.strftime(time_format_algorithm) + '] ... DONE')
+    # ------------------------------------------------------------------------------------------------------------------
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # method to dump dynamic data for a single time step
+    def dump_dynamic_step(self, domain_name, time_step, file_collection_domain=None):
+
+        # get time info
+        time_reference = self.time_reference
+        # get quantile list
         quantile_list = self.quantile_list
-        ensemble_list = self.ensemble_list
 
         # get sub path reference
         sub_path_ref = self.dset_sub_path_dst
@@ -297,157 +396,165 @@ class DriverDynamic:
         # get file name
         file_path_anc_raw = self.file_path_anc
         file_path_dst_raw = self.file_path_dst
-        # get static datasets
-        alg_static = self.alg_static
 
         # get flags
         flag_clean_dynamic_dst = self.flag_clean_dynamic_dst
 
-        # iterate over domain list
-        for domain_name in domain_list:
+        # info time start
+        log_stream.info(' ------> Time "' + time_step.strftime(time_format_algorithm) + '" ... ')
 
-            # info domain start
-            log_stream.info(' -----> Domain "' + domain_name + '" ... ')
-
-            # iterate over time steps
-            for time_step in time_range:
+        # choose sub path reference type
+        if sub_path_ref == 'sub_path_run':
+            time_sub_path = deepcopy(time_reference)
+        elif sub_path_ref == 'sub_path_time':
+            time_sub_path = deepcopy(time_step)
+        else:
+            log_stream.error(' ===> Reference sub_path "' + sub_path_ref + '" is not supported for src dataset')
+            raise NotImplemented('Case not implemented yet')
 
-                # info time start
-                log_stream.info(' ------> Time "' + time_step.strftime(time_format_algorithm) + '" ... ')
+        # define ancillary filename(s)
+        file_path_anc_def = self.define_file_name(
+            file_path_anc_raw, tags_template=self.alg_template,
+            tags_filled={'domain_name': domain_name,
+                         'ancillary_datetime': time_step, 'ancillary_sub_path_time': time_sub_path})
+        # define destination filename(s)
+        file_path_dst_def = self.define_file_name(
+            file_path_dst_raw, tags_template=self.alg_template,
+            tags_filled={'domain_name': domain_name,
+                         'destination_datetime': time_step, 'destination_sub_path_time': time_sub_path})
+
+        # remove destination file if required
+        if flag_clean_dynamic_dst:
+            if os.path.exists(file_path_dst_def):
+                os.remove(file_path_dst_def)
+
+        # check file ancillary availability
+        if not os.path.exists(file_path_dst_def):
+
+            # info get data start
+            log_stream.info(' -------> Get data ... ')
+
+            # get static datasets (cached for each domain)
+            geo_data, geo_x, geo_y, geo_idx = self.get_obj_static_domain(domain_name)
+
+            # check domain availability
+            if file_collection_domain is not None:
+                # check time step availability
+                if time_step in list(file_collection_domain.keys()):
+                    # get data
+                    quantile_dframe = self.get_obj_dynamic(file_collection_domain[time_step])
+                    # info get data end
+                    log_stream.info(' -------> Get data ... DONE')
 
-                # choose sub path reference type
-                if sub_path_ref == 'sub_path_run':
-                    time_sub_path = deepcopy(time_reference)
-                elif sub_path_ref == 'sub_path_time':
-                    time_sub_path = deepcopy(time_step)
                 else:
-                    log_stream.error(' ===> Reference sub_path "' + sub_path_ref + '" is not supported for src dataset')
-                    raise NotImplemented('Case not implemented yet')
-
-                # define ancillary filename(s)
-                file_path_anc_def = self.define_file_name(
-                    file_path_anc_raw, tags_template=self.alg_template,
-                    tags_filled={'domain_name': domain_name,
-                                 'ancillary_datetime': time_step, 'ancillary_sub_path_time': time_sub_path})
-                # define destination filename(s)
-                file_path_dst_def = self.define_file_name(
-                    file_path_dst_raw, tags_template=self.alg_template,
-                    tags_filled={'domain_name': domain_name,
-                                 'destination_datetime': time_step, 'destination_sub_path_time': time_sub_path})
-
-                # remove destination file if required
-                if flag_clean_dynamic_dst:
-                    if os.path.exists(file_path_dst_def):
-                        os.remove(file_path_dst_def)
-
-                # check file ancillary availability
-                if not os.path.exists(file_path_dst_def):
-
-                    # info get data start
-                    log_stream.info(' -------> Get data ... ')
-
-                    # check static datasets
-                    if domain_name in list(alg_static.keys()):
-                        geo_da = self.get_obj_static(alg_static[domain_name], file_var_data=self.flag_cnet_data)
-                        geo_data = geo_da.values
-                        geo_x, geo_y = geo_da['longitude'].values, geo_da['latitude'].values
-                        geo_idx = self.get_obj_static(alg_static[domain_name], file_var_data=self.flag_idx_data)
-                    else:
-                        log_stream.error(
-                            ' ===> Statistics information for domain "' + domain_name + '" are not available')
-                        raise RuntimeError("Statistics information are mandatory for correctly running the algorithm")
-
-                    # check domain availability
-                    if domain_name in list(file_collection.keys()):
-                        # check time step availability
-                        if time_step in list(file_collection[domain_name].keys()):
-                            # get data
-                            quantile_dframe = self.get_obj_dynamic(file_collection[domain_name][time_step])
-                            # info get data end
-                            log_stream.info(' -------> Get data ... DONE')
-
-                        else:
-                            # info get data end
-                            log_stream.warning(' ===> Time step "' + time_step.strftime(time_format_algorithm) +
-                                               '" is not available in the file collections')
-                            log_stream.info(' -------> Get data ... SKIPPED.')
-                            quantile_dframe = None
-                    else:
-                        log_stream.warning(' ===> Domain "' + domain_name +
-                                           '" is not available in the file collections')
-                        log_stream.info(' -------> Get data ... SKIPPED.')
-                        quantile_dframe = None
-
-                    # info transform data start
-                    log_stream.info(' -------> Transform data ... ')
-                    quantile_collections = None
-                    if quantile_dframe is not None:
-
-                        # iterate over datasets
-                        for quantile_name, quantile_obj in quantile_dframe.items():
-
-                            quantile_array = np.zeros_like(geo_data.flatten())
-                            quantile_array[:] = np.nan
-
-                            if quantile_name in quantile_list:
-
-                                quantile_index = quantile_obj.index
-                                quantile_values = quantile_obj.values
-                                quantile_array[quantile_index] = quantile_values
-                                quantile_data = np.reshape(quantile_array, [geo_data.shape[0], geo_data.shape[1]])
-
-                                if not isinstance(quantile_name, str):
-                                    quantile_name = str(quantile_name)
-
-                                # quantile_da = create_darray(quantile_data, geo_x, geo_y, name=quantile_name)
-
-                                if quantile_collections is None:
-                                    quantile_collections = {}
-                                quantile_collections[quantile_name] = quantile_data
-
-                        # info transform data end
-                        log_stream.info(' -------> Transform data ... DONE')
-
-                    else:
-                        # info transform data end
-                        log_stream.info(' -------> Transform data ... SKIPPED. Datasets are not available.')
-
-                    # info save data start
-                    log_stream.info(' -------> Save data ... ')
-                    if quantile_collections is not None:
-
-                        # save data
-                        self.save_data_dynamic(
-                            file_name=file_path_dst_def, file_data=quantile_collections,
-                            file_geo_x=geo_x, file_geo_y=geo_y,
-                            file_variable=self.dset_variable_dst, file_type=self.dset_format_dst,
-                            file_scale_factor=self.dset_ratio_factor_dst,
-                            file_compression=self.dset_compression_dst)
-
-                        # info save data end
-                        log_stream.info(' -------> Save data ... DONE')
-                    else:
-                        # info save data end
-                        log_stream.info(' -------> Save data ... SKIPPED. Datasets are not available.')
-
-                    # info time end
-                    log_stream.info(
-                        ' ------> Time "' + time_step.strftime(time_format_algorithm) +
-                        '" ... DONE.')
+                    # info get data end
+                    log_stream.warning(' ===> Time step "' + time_step.strftime(time_format_algorithm) +
+                                       '" is not available in the file collections')
+                    log_stream.info(' -------> Get data ... SKIPPED.')
+                    quantile_dframe = None
+            else:
+                log_stream.info(' -------> Get data ... SKIPPED.')
+                quantile_dframe = None
 
-                else:
+            # info transform data start
+            log_stream.info(' -------> Transform data ... ')
+            quantile_collections = None
+            if quantile_dframe is not None:
 
-                    # info time end
-                    log_stream.info(
-                        ' ------> Time "' + time_step.strftime(time_format_algorithm) +
-                        '" ... SKIPPED. Datasets are not available.')
+                # iterate over datasets
+                for quantile_name, quantile_obj in quantile_dframe.items():
 
-            # info domain start
-            log_stream.info(' -----> Domain "' + domain_name + '" ... DONE')
+                    quantile_array = np.zeros_like(geo_data.flatten())
+                    quantile_array[:] = np.nan
+
+                    if quantile_name in quantile_list:
+
+                        quantile_index = quantile_obj.index
+                        quantile_values = quantile_obj.values
+                        quantile_array[quantile_index] = quantile_values
+                        quantile_data = np.reshape(quantile_array, [geo_data.shape[0], geo_data.shape[1]])
+
+                        if not isinstance(quantile_name, str):
+                            quantile_name = str(quantile_name)
+
+                        # quantile_da = create_darray(quantile_data, geo_x, geo_y, name=quantile_name)
+
+                        if quantile_collections is None:
+                            quantile_collections = {}
+                        quantile_collections[quantile_name] = quantile_data
+
+                # info transform data end
+                log_stream.info(' -------> Transform data ... DONE')
+
+            else:
+                # info transform data end
+                log_stream.info(' -------> Transform data ... SKIPPED. Datasets are not available.')
+
+            # info save data start
+            log_stream.info(' -------> Save data ... ')
+            if quantile_collections is not None:
+
+                # save data
+                self.save_data_dynamic(
+                    file_name=file_path_dst_def, file_data=quantile_collections,
+                    file_geo_x=geo_x, file_geo_y=geo_y,
+                    file_variable=self.dset_variable_dst, file_type=self.dset_format_dst,
+                    file_scale_factor=self.dset_ratio_factor_dst,
+                    file_compression=self.dset_compression_dst)
+
+                # info save data end
+                log_stream.info(' -------> Save data ... DONE')
+            else:
+                # info save data end
+                log_stream.info(' -------> Save data ... SKIPPED. Datasets are not available.')
+
+            # info time end
+            log_stream.info(
+                ' ------> Time "' + time_step.strftime(time_format_algorithm) +
+                '" ... DONE.')
+
+        else:
+
+            # info time end
+            log_stream.info(
+                ' ------> Time "' + time_step.strftime(time_format_algorithm) +
+                '" ... SKIPPED. Datasets are not available.')
+
+        return file_path_dst_def
+    # ------------------------------------------------------------------------------------------------------------------
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # method to iterate over time steps (serial or parallel mode)
+    def organize_time(self, time_method, domain_name, time_range, time_args=None):
+
+        # get time workers
+        time_workers = self.time_workers
+        if time_workers is None:
+            time_workers = os.cpu_count()
+        time_workers = max(1, min(time_workers, len(time_range)))
+
+        if time_args is None:
+            time_args = {}
+
+        if time_workers == 1:
+
+            # iterate over time steps (serial mode)
+            time_results = [time_method(domain_name, time_step, **time_args) for time_step in time_range]
+
+        else:
+
+            # load static datasets before starting the workers (shared by the forked processes)
+            self.get_obj_static_domain(domain_name)
+
+            # iterate over time steps (process mode; the method and its args are shipped once for each worker,
+            # the tasks get the time step only)
+            with ProcessPoolExecutor(max_workers=time_workers, initializer=init_time_worker,
+                                     initargs=(time_method, domain_name, time_args)) as time_pool:
+                time_futures = [time_pool.submit(exec_time_worker, time_step) for time_step in time_range]
+                time_results = [time_future.result() for time_future in time_futures]
+
+        return time_results
 
-        # info end
-        log_stream.info(' ----> Dump dynamic datasets ['
-                        + self.time_reference.strftime(time_format_algorithm) + '] ... DONE')
     # ------------------------------------------------------------------------------------------------------------------
 
     # ------------------------------------------------------------------------------------------------------------------
@@ -459,10 +566,49 @@ class DriverDynamic:
                         + self.time_reference.strftime(time_format_algorithm) + '] ... ')
 
         # get time info
-        time_reference = self.time_reference
         time_range = self.time_range
         # get domain
         domain_list = self.obj_domain_name
+
+        # refresh the folder index (files of the ensembles can appear between the runs)
+        refresh_file_index()
+
+        # iterate over domain list
+        file_collection = {}
+        try:
+            for domain_name in domain_list:
+
+                # info domain start
+                log_stream.info(' -----> Domain "' + domain_name + '" ... ')
+
+                # iterate over time steps (serial or parallel mode)
+                file_list = self.organize_time(self.organize_dynamic_step, domain_name, time_range)
+
+                # organize file collection
+                file_collection[domain_name] = {}
+                for time_step, file_path_anc_def in zip(time_range, file_list):
+                    if file_path_anc_def is not None:
+                        file_collection[domain_name][time_step] = file_path_anc_def
+
+                # info domain end
+                log_stream.info(' -----> Domain "' + domain_name + '" ... DONE')
+        finally:
+            # close ensemble pools at the end of the run
+            close_ensemble_pool()
+
+        # info end
+        log_stream.info(' ----> Organize dynamic datasets ['
+                        + self.time_reference.strftime(time_format_algorithm) + '] ... DONE')
+
+        return file_collection
+    # ------------------------------------------------------------------------------------------------------------------
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # method to organize dynamic data for a single time step
+    def organize_dynamic_step(self, domain_name, time_step):
+
+        # get time info
+        time_reference = self.time_reference
         # get quantile and ensemble list
         quantile_list = self.quantile_list
         ensemble_list = self.ensemble_list
@@ -471,154 +617,267 @@ class DriverDynamic:
         sub_path_ref = self.dset_sub_path_src
 
         # get file name
-        file_path_src_raw = self.file_path_src
         file_path_anc_raw = self.file_path_anc
         file_path_dst_raw = self.file_path_dst
-        # get static datasets
-        alg_static = self.alg_static
 
         # get flags
         flag_clean_dynamic_src = self.flag_clean_dynamic_src
 
-        # iterate over domain list
-        file_collection = {}
-        for domain_name in domain_list:
+        # info time start
+        log_stream.info(' ------> Time "' + time_step.strftime(time_format_algorithm) + '" ... ')
 
-            # info domain start
-            log_stream.info(' -----> Domain "' + domain_name + '" ... ')
+        # choose sub path reference type
+        if sub_path_ref == 'sub_path_run':
+            time_sub_path = deepcopy(time_reference)
+        elif sub_path_ref == 'sub_path_time':
+            time_sub_path = deepcopy(time_step)
+        else:
+            log_stream.error(' ===> Reference sub_path "' + sub_path_ref + '" is not supported for src dataset')
+            raise NotImplemented('Case not implemented yet')
 
-            # iterate over time steps
-            file_collection[domain_name] = {}
-            for time_step in time_range:
+        # define ancillary filename(s)
+        file_path_anc_def = self.define_file_name(
+            file_path_anc_raw, tags_template=self.alg_template,
+            tags_filled={'domain_name': domain_name,
+                         'ancillary_datetime': time_step, 'ancillary_sub_path_time': time_sub_path})
+        # define destination filename(s)
+        file_path_dst_def = self.define_file_name(
+            file_path_dst_raw, tags_template=self.alg_template,
+            tags_filled={'domain_name': domain_name,
+                         'ancillary_datetime': time_step, 'ancillary_sub_path_time': time_sub_path})
+
+        if flag_clean_dynamic_src:
+            if os.path.exists(file_path_anc_def):
+                os.remove(file_path_anc_def)
+            if os.path.exists(file_path_dst_def):
+                os.remove(file_path_dst_def)
+
+        # check file ancillary availability
+        if not os.path.exists(file_path_anc_def):
+
+            # get static datasets (cached for each domain)
+            geo_data, geo_x, geo_y, geo_idx = self.get_obj_static_domain(domain_name)
+
+            # iterate over ensemble list (serial or parallel mode)
+            ensemble_data = np.zeros(shape=[geo_idx.shape[0], len(ensemble_list)])
+            ensemble_data[:, :] = np.nan
+            self.organize_ensemble(
+                ensemble_data, domain_name=domain_name,
+                time_step=time_step, time_sub_path=time_sub_path, geo_data=geo_data, geo_idx=geo_idx)
+
+            # compute quantile(s)
+            ensemble_quantiles = compute_quantile(
+                ensemble_data, ensemble_list=ensemble_list, geo_idx=geo_idx, quantile_list=quantile_list,
+                ensemble_join=self.ensemble_join)
+
+            # filter nan values (all values are nans)
+            ensemble_quantiles = ensemble_quantiles.dropna(how='all')
+
+            # check quantile availability
+            if not ensemble_quantiles.empty:
+
+                # write data collections
+                folder_name_anc, file_name_anc = os.path.split(file_path_anc_def)
+                make_folder(folder_name_anc)
+                write_obj(file_path_anc_def, ensemble_quantiles)
+
+                # info time end
+                log_stream.info(' ------> Time "' + time_step.strftime(time_format_algorithm) +
+                                '" ... DONE')
 
-                # info time start
-                log_stream.info(' ------> Time "' + time_step.strftime(time_format_algorithm) + '" ... ')
+            else:
+                # info time end
+                log_stream.info(' ------> Time "' + time_step.strftime(time_format_algorithm) +
+                                '" ... SKIPPED. '
+                                'Datasets are defined by nan values for all ensembles and quantiles.')
+                file_path_anc_def = None
 
-                # choose sub path reference type
-                if sub_path_ref == 'sub_path_run':
-                    time_sub_path = deepcopy(time_reference)
-                elif sub_path_ref == 'sub_path_time':
-                    time_sub_path = deepcopy(time_step)
-                else:
-                    log_stream.error(' ===> Reference sub_path "' + sub_path_ref + '" is not supported for src dataset')
-                    raise NotImplemented('Case not implemented yet')
-
-                # define ancillary filename(s)
-                file_path_anc_def = self.define_file_name(
-                    file_path_anc_raw, tags_template=self.alg_template,
-                    tags_filled={'domain_name': domain_name,
-                                 'ancillary_datetime': time_step, 'ancillary_sub_path_time': time_sub_path})
-                # define destination filename(s)
-                file_path_dst_def = self.define_file_name(
-                    file_path_dst_raw, tags_template=self.alg_template,
-                    tags_filled={'domain_name': domain_name,
-                                 'ancillary_datetime': time_step, 'ancillary_sub_path_time': time_sub_path})
-
-                if flag_clean_dynamic_src:
-                    if os.path.exists(file_path_anc_def):
-                        os.remove(file_path_anc_def)
-                    if os.path.exists(file_path_dst_def):
-                        os.remove(file_path_dst_def)
-
-                # check file ancillary availability
-                if not os.path.exists(file_path_anc_def):
-
-                    # check static datasets
-                    if domain_name in list(alg_static.keys()):
-                        geo_da = self.get_obj_static(alg_static[domain_name], file_var_data=self.flag_cnet_data)
-                        geo_data = geo_da.values
-                        geo_x, geo_y = geo_da['longitude'].values, geo_da['latitude'].values
-                        geo_idx = self.get_obj_static(alg_static[domain_name], file_var_data=self.flag_idx_data)
-                    else:
-                        log_stream.error(
-                            ' ===> Statistics information for domain "' + domain_name + '" are not available')
-                        raise RuntimeError("Statistics information are mandatory for correctly running the algorithm")
-
-                    # iterate over ensemble list
-                    ensemble_data = np.zeros(shape=[geo_idx.shape[0], len(ensemble_list)])
-                    ensemble_data[:, :] = np.nan
-                    for ensemble_id, ensemble_name in enumerate(ensemble_list):
-
-                        # info ensemble start
-                        log_stream.info(' -------> Ensemble "' + ensemble_name + '" ... ')
-
-                        # define src filename(s)
-                        file_path_src_def = self.define_file_name(
-                            file_path_src_raw, tags_template=self.alg_template,
-                            tags_filled={'domain_name': domain_name, 'ensemble_name': ensemble_name,
-                                         'source_datetime': time_step, 'source_sub_path_time': time_sub_path})
-
-                        # check file source
-                        if os.path.exists(file_path_src_def):
-
-                            # get source datasets
-                            src_data_2d = self.get_data_dynamic(
-                                file_path_src_def, dim_x=geo_data.shape[0], dim_y=geo_data.shape[1],
-                                folder_name_tmp=self.folder_name_tmp, clean_tmp=self.clean_tmp)
-
-                            # organize source datasets
-                            src_data_1d = src_data_2d.flatten()
-                            src_data_select = src_data_1d[geo_idx]
-                            src_data_select = np.round(src_data_select, decimals=1)
-
-                        else:
-                            # info domain end
-                            log_stream.warning(' ===> File "' + file_path_src_def + '" not found.')
-                            # no data available
-                            src_data_select = np.zeros(shape=[geo_idx.shape[0]])
-                            src_data_select[:] = np.nan
-
-                        # store data in the ensemble collection
-                        ensemble_data[:, ensemble_id] = src_data_select
-
-                        # info ensemble end
-                        log_stream.info(' -------> Ensemble "' + ensemble_name + '" ... DONE')
-
-                    # compute quantile(s)
-                    ensemble_quantiles = compute_quantile(
-                        ensemble_data, ensemble_list=ensemble_list, geo_idx=geo_idx, quantile_list=quantile_list)
-
-                    # filter nan values (all values are nans)
-                    ensemble_quantiles = ensemble_quantiles.dropna(how='all')
-
-                    # check quantile availability
-                    if not ensemble_quantiles.empty:
-
-                        # write data collections
-                        folder_name_anc, file_name_anc = os.path.split(file_path_anc_def)
-                        make_folder(folder_name_anc)
-                        write_obj(file_path_anc_def, ensemble_quantiles)
-
-                        # organize file collection
-                        file_collection[domain_name][time_step] = {}
-                        file_collection[domain_name][time_step] = file_path_anc_def
+        else:
+            # info time end
+            log_stream.info(' ------> Time "' + time_step.strftime(time_format_algorithm) +
+                            '" ... LOADED. Datasets previously created.')
 
-                        # info time end
-                        log_stream.info(' ------> Time "' + time_step.strftime(time_format_algorithm) +
-                                        '" ... DONE')
+        return file_path_anc_def
+    # ------------------------------------------------------------------------------------------------------------------
 
-                    else:
-                        # info time end
-                        log_stream.info(' ------> Time "' + time_step.strftime(time_format_algorithm) +
-                                        '" ... SKIPPED. '
-                                        'Datasets are defined by nan values for all ensembles and quantiles.')
+# ----------------------------------------------------------------------------------------------------------------------
 
-                else:
-                    # organize file collection
-                    file_collection[domain_name][time_step] = file_path_anc_def
 
-                    # info time end
-                    log_stream.info(' ------> Time "' + time_step.strftime(time_format_algorithm) +
-                                    '" ... LOADED. Datasets previously created.')
+# ----------------------------------------------------------------------------------------------------------------------
+# method to get data dynamic
+def get_data_dynamic(file_path_def, dset_settings, dim_x=None, dim_y=None,
+                     folder_name_tmp=None, clean_tmp=True, tag_tmp=None):
 
-            # info domain end
-            log_stream.info(' -----> Domain "' + domain_name + '" ... DONE')
+    if exists_file(file_path_def):
 
-        # info end
-        log_stream.info(' ----> Organize dynamic datasets ['
-                        + self.time_reference.strftime(time_format_algorithm) + '] ... DONE')
+        if dset_settings['compression']:
 
-        return file_collection
-    # ------------------------------------------------------------------------------------------------------------------
+            if folder_name_tmp is None:
+                folder_name_tmp = '/tmp'
+            if not os.path.exists(folder_name_tmp):
+                make_folder(folder_name_tmp)
+
+            if file_path_def.endswith(zip_extension):
+                # decompress in a tmp file ('file' read mode; the 'stream' read mode decompresses in memory)
+                file_path_noext = remove_zip_extension(file_path_def)
+                folder_name_noext, file_name_noext = os.path.split(file_path_noext)
+                if tag_tmp is not None:
+                    file_name_noext = tag_tmp + '_' + file_name_noext
+                file_path_tmp = os.path.join(folder_name_tmp, file_name_noext)
+
+                unzip_filename(file_path_def, file_path_tmp)
+
+            else:
+                log_stream.error(' ===> File compression "' + zip_extension + '" is not supported')
+                raise NotImplemented('Case not implemented yet')
+
+        else:
+            file_path_tmp = deepcopy(file_path_def)
+
+        if dset_settings['format'] == 'netcdf':
+            file_data = read_file_nc(
+                file_path_tmp,
+                var_name=dset_settings['variable'], var_ratio_factor=dset_settings['ratio_factor'])
+        elif dset_settings['format'] == 'binary':
+            file_data = read_file_binary(
+                file_path_tmp,
+                file_dim_x=dim_x, file_dim_y=dim_y, file_ratio_factor=dset_settings['ratio_factor'])
+        else:
+            log_stream.error(' ===> File type "' + dset_settings['format'] + '" is not supported')
+            raise NotImplemented('Case not implemented yet')
+
+        if file_path_tmp is not None:
+            if file_path_tmp != file_path_def:
+                if clean_tmp:
+                    if os.path.exists(file_path_tmp):
+                        os.remove(file_path_tmp)
+
+    else:
+        log_stream.warning(' ===> File  "' + file_path_def + '" is not found. ')
+        file_data = None
 
+    return file_data
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to get data dynamic selecting the cells only (no tmp file and no full grid copies)
+def get_data_dynamic_select(file_path_def, geo_idx, dset_settings, dim_x=None, dim_y=None):
+
+    if exists_file(file_path_def):
+
+        if dset_settings['compression']:
+            if file_path_def.endswith(zip_extension):
+                file_obj = unzip_filename_memory(file_path_def)
+            else:
+                log_stream.error(' ===> File compression "' + zip_extension + '" is not supported')
+                raise NotImplemented('Case not implemented yet')
+        else:
+            file_obj = deepcopy(file_path_def)
+
+        if dset_settings['format'] == 'netcdf':
+            file_data = read_file_nc_select(
+                file_obj, geo_idx,
+                var_name=dset_settings['variable'], var_ratio_factor=dset_settings['ratio_factor'])
+        elif dset_settings['format'] == 'binary':
+            file_data = read_file_binary_select(
+                file_obj, geo_idx,
+                file_dim_x=dim_x, file_dim_y=dim_y, file_ratio_factor=dset_settings['ratio_factor'])
+        else:
+            log_stream.error(' ===> File type "' + dset_settings['format'] + '" is not supported')
+            raise NotImplemented('Case not implemented yet')
+
+    else:
+        log_stream.warning(' ===> File  "' + file_path_def + '" is not found. ')
+        file_data = None
+
+    return file_data
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to get ensemble data (selected cells only)
+def get_data_ensemble(file_path_src_def, geo_idx, dset_settings, dim_x=None, dim_y=None, ensemble_name=None):
+
+    # info ensemble start
+    log_stream.info(' -------> Ensemble "' + str(ensemble_name) + '" ... ')
+
+    # check file source (using the folder index)
+    if exists_file(file_path_src_def):
+
+        # check read mode
+        if dset_settings['read_mode'] == 'stream':
+
+            # get source datasets (selected cells only)
+            src_data_select = get_data_dynamic_select(
+                file_path_src_def, geo_idx, dset_settings, dim_x=dim_x, dim_y=dim_y)
+
+        elif dset_settings['read_mode'] == 'file':
+
+            # get source datasets (tmp file is tagged by ensemble to avoid collisions between workers)
+            src_data_2d = get_data_dynamic(
+                file_path_src_def, dset_settings, dim_x=dim_x, dim_y=dim_y,
+                folder_name_tmp=dset_settings['folder_name_tmp'], clean_tmp=dset_settings['clean_tmp'],
+                tag_tmp=ensemble_name)
+
+            # organize source datasets
+            src_data_1d = src_data_2d.flatten()
+            src_data_select = src_data_1d[geo_idx]
+
+        else:
+            log_stream.error(' ===> Read mode "' + dset_settings['read_mode'] + '" is not supported')
+            raise NotImplemented('Case not implemented yet')
+
+        src_data_select = np.round(src_data_select, decimals=1)
+
+    else:
+        # info domain end
+        log_stream.warning(' ===> File "' + file_path_src_def + '" not found.')
+        # no data available
+        src_data_select = np.zeros(shape=[geo_idx.shape[0]])
+        src_data_select[:] = np.nan
+
+    # info ensemble end
+    log_stream.info(' -------> Ensemble "' + str(ensemble_name) + '" ... DONE')
+
+    return src_data_select
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to get the ensemble pool of the process (created once and reused)
+def get_ensemble_pool(ensemble_mode, ensemble_workers):
+    pool_key = (os.getpid(), ensemble_mode, ensemble_workers)
+    if pool_key not in ensemble_pool_cache:
+        if ensemble_mode == 'thread':
+            ensemble_pool_cache[pool_key] = ThreadPoolExecutor(max_workers=ensemble_workers)
+        elif ensemble_mode == 'process':
+            ensemble_pool_cache[pool_key] = ProcessPoolExecutor(max_workers=ensemble_workers)
+        else:
+            log_stream.error(' ===> Ensemble mode "' + ensemble_mode + '" is not supported')
+            raise NotImplemented('Case not implemented yet')
+    return ensemble_pool_cache[pool_key]
+# ----------------------------------------------------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to close the ensemble pool(s) of the process
+def close_ensemble_pool():
+    for pool_key in list(ensemble_pool_cache.keys()):
+        if pool_key[0] == os.getpid():
+            ensemble_pool_cache.pop(pool_key).shutdown(wait=True)
+# ----------------------------------------------------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to initialize the time worker (called once for each worker process)
+def init_time_worker(time_method, domain_name, time_args):
+    time_worker_settings['method'] = time_method
+    time_worker_settings['domain_name'] = domain_name
+    time_worker_settings['args'] = time_args
+# ----------------------------------------------------------------------------------------------------------------------
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to execute the time worker for a single time step
+def exec_time_worker(time_step):
+    return time_worker_settings['method'](
+        time_worker_settings['domain_name'], time_step, **time_worker_settings['args'])
 # ----------------------------------------------------------------------------------------------------------------------
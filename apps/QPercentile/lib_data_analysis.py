@@ -11,6 +11,9 @@ Version:       '1.0.0'
 import logging
 import warnings
 
+import numpy as np
+import pandas as pd
+
 from lib_utils_io import create_dframe
 from lib_info_args import logger_name
 
@@ -23,21 +26,64 @@ log_stream = logging.getLogger(logger_name)
 
 # ----------------------------------------------------------------------------------------------------------------------
 # method to compute quantile(s)
-def compute_quantile(ensemble_data, ensemble_list=None, geo_idx=None, quantile_list=0.8):
+def compute_quantile(ensemble_data, ensemble_list=None, geo_idx=None, quantile_list=0.8,
+                     ensemble_join=False, chunk_size=100000, data_type=np.float32):
 
     if isinstance(quantile_list, (int, float)):
         quantile_list = [quantile_list]
 
-    # create data frame data
-    ensemble_dframe_raw = create_dframe(
-        data_values=ensemble_data, data_index=geo_idx,
-        column_name=ensemble_list, index_name='index')
+    # compute quantiles over the ensemble axis (by chunks of cells)
+    cell_n = ensemble_data.shape[0]
+    quantile_data = np.zeros(shape=[cell_n, len(quantile_list)], dtype=data_type)
+    for chunk_start in range(0, cell_n, chunk_size):
+        chunk_end = min(chunk_start + chunk_size, cell_n)
+        quantile_data[chunk_start:chunk_end, :] = compute_nanquantile(
+            ensemble_data[chunk_start:chunk_end, :], quantile_list)
 
     # create data frame quantiles
-    ensemble_dframe_quantile = ensemble_dframe_raw.quantile(quantile_list, axis=1, numeric_only=True).T
-    # join data frames
-    ensemble_dframe_quantile = ensemble_dframe_quantile.join(ensemble_dframe_raw)
+    ensemble_dframe_quantile = pd.DataFrame(quantile_data, index=geo_idx, columns=quantile_list)
+    ensemble_dframe_quantile.index.name = 'index'
+
+    # join data frames (raw ensemble values are optional)
+    if ensemble_join:
+        ensemble_dframe_raw = create_dframe(
+            data_values=ensemble_data, data_index=geo_idx,
+            column_name=ensemble_list, index_name='index')
+        ensemble_dframe_quantile = ensemble_dframe_quantile.join(ensemble_dframe_raw)
 
     return ensemble_dframe_quantile
 
 # ----------------------------------------------------------------------------------------------------------------------
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# method to compute quantile(s) along the last axis ignoring nans (same "linear" method of np.nanquantile)
+def compute_nanquantile(data_values, quantile_list):
+
+    # sort values (nans are moved at the end) and count the finite values
+    data_sorted = np.sort(data_values, axis=1)
+    data_n = np.sum(~np.isnan(data_values), axis=1)
+
+    quantile_values = np.zeros(shape=[data_values.shape[0], len(quantile_list)], dtype=np.float64)
+    for quantile_id, quantile_step in enumerate(quantile_list):
+
+        # compute virtual index, bounds and weight
+        quantile_pos = quantile_step * (np.maximum(data_n, 1) - 1)
+        quantile_lo = np.floor(quantile_pos).astype(int)
+        quantile_hi = np.minimum(quantile_lo + 1, np.maximum(data_n, 1) - 1)
+        quantile_w = quantile_pos - quantile_lo
+
+        value_lo = np.take_along_axis(data_sorted, quantile_lo[:, np.newaxis], axis=1)[:, 0]
+        value_hi = np.take_along_axis(data_sorted, quantile_hi[:, np.newaxis], axis=1)[:, 0]
+
+        # linear interpolation (using the numpy lerp formulation)
+        value_diff = value_hi - value_lo
+        quantile_step_values = np.where(
+            quantile_w >= 0.5, value_hi - value_diff * (1 - quantile_w), value_lo + value_diff * quantile_w)
+        quantile_step_values[data_n == 0] = np.nan
+
+        quantile_values[:, quantile_id] = quantile_step_values
+
+    return quantile_values
+
+# ----------------------------------------------------------------------------------------------------------------------
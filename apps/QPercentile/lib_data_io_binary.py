@@ -20,9 +20,13 @@ log_stream = logging.getLogger(logger_name)
 
 
 # -------------------------------------------------------------------------------------
-# Method to read file settings
+# Method to read file settings (file name or decompressed bytes)
 def read_file_binary(file_name, file_dim_x=None, file_dim_y=None, file_ratio_factor=1, file_type=np.int32):
-    if os.path.exists(file_name):
+    if isinstance(file_name, (bytes, bytearray)):
+        data_tmp = np.frombuffer(file_name, dtype=file_type)
+        data_map = np.reshape(data_tmp, (int(file_dim_x), int(file_dim_y)))
+        data_var = np.transpose(data_map.astype(float) / file_ratio_factor)
+    elif os.path.exists(file_name):
         data_tmp = np.fromfile(file_name, dtype=file_type)
         data_map = np.reshape(data_tmp, (int(file_dim_x), int(file_dim_y)))
         data_var = np.transpose(data_map.astype(float) / file_ratio_factor)
@@ -31,3 +35,28 @@ def read_file_binary(file_name, file_dim_x=None, file_dim_y=None, file_ratio_fac
         raise IOError('File not found')
     return data_var
 # -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to read file binary selecting the cells only (file name or decompressed bytes)
+def read_file_binary_select(file_obj, file_idx, file_dim_x=None, file_dim_y=None, file_ratio_factor=1,
+                            file_type=np.int32):
+
+    # map file (memmap) or bytes without materializing the grid
+    if isinstance(file_obj, (bytes, bytearray)):
+        data_raw = np.frombuffer(file_obj, dtype=file_type)
+    elif os.path.exists(file_obj):
+        data_raw = np.memmap(file_obj, dtype=file_type, mode='r')
+    else:
+        log_stream.error(' ===> Error in reading settings file "' + file_obj + '"')
+        raise IOError('File not found')
+
+    # select cells using the index of the transposed grid (the grid is never transposed)
+    dim_x, dim_y = int(file_dim_x), int(file_dim_y)
+    data_idx = (file_idx % dim_x) * dim_y + file_idx // dim_x
+    data_var = data_raw[data_idx].astype(float) / file_ratio_factor
+
+    del data_raw
+
+    return data_var
+# -------------------------------------------------------------------------------------
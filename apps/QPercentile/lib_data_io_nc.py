@@ -10,25 +10,110 @@ Version:       '1.0.0'
 # Library
 import logging
 import os
+import threading
+import netCDF4
 import numpy as np
-import xarray as xr
 
 from lib_info_args import logger_name
 
 # Logging
 log_stream = logging.getLogger(logger_name)
+
+# lock for netcdf/hdf5 library (not thread-safe; held only for the library calls that open and read the file,
+# the values are decoded, flipped and selected outside the lock)
+file_nc_lock = threading.Lock()
 #######################################################################################
 
 
 # -------------------------------------------------------------------------------------
-# Method to read file settings
+# Method to read the raw values and the attributes of a variable (file name or decompressed bytes)
+# (with the cells index, only the cells are returned; the index is defined on the grid flipped along the
+# first dimension and, for 2d variables, the cells are read in the bounding box of their rows and columns)
+def read_var_nc(file_obj, var_name, file_idx=None):
+
+    # read raw values and attributes (serialized between threads)
+    with file_nc_lock:
+        if isinstance(file_obj, (bytes, bytearray)):
+            file_handle = netCDF4.Dataset('memory.nc', mode='r', memory=file_obj)
+        else:
+            file_handle = netCDF4.Dataset(file_obj, mode='r')
+        try:
+            file_var = file_handle.variables[var_name]
+            file_var.set_auto_maskandscale(False)
+            var_attrs = {var_attr: file_var.getncattr(var_attr) for var_attr in file_var.ncattrs()}
+            var_shape = file_var.shape
+            if file_idx is not None and var_shape.__len__() == 2:
+                var_rows = var_shape[0] - 1 - file_idx // var_shape[1]
+                var_cols = file_idx % var_shape[1]
+                row_min, row_max = int(np.min(var_rows)), int(np.max(var_rows))
+                col_min, col_max = int(np.min(var_cols)), int(np.max(var_cols))
+                var_raw = file_var[row_min:row_max + 1, col_min:col_max + 1]
+            else:
+                var_raw = file_var[...]
+        finally:
+            file_handle.close()
+
+    # select the cells
+    if file_idx is not None:
+        if var_shape.__len__() == 2:
+            var_raw = var_raw[var_rows - row_min, var_cols - col_min]
+        else:
+            var_rest = int(np.prod(var_shape[1:]))
+            var_idx = (var_shape[0] - 1 - file_idx // var_rest) * var_rest + file_idx % var_rest
+            var_raw = var_raw.reshape(-1)[var_idx]
+
+    return var_raw, var_attrs
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to decode the raw values of a variable (fill and missing values to nan, scale factor and offset)
+def decode_var_nc(var_raw, var_attrs):
+    var_fill = [var_attrs[var_attr] for var_attr in ['_FillValue', 'missing_value'] if var_attr in var_attrs]
+    var_scale, var_offset = var_attrs.get('scale_factor', None), var_attrs.get('add_offset', None)
+    if not var_fill and var_scale is None and var_offset is None:
+        return var_raw
+    var_values = var_raw.astype(np.result_type(var_raw.dtype, np.float32))
+    for var_fill_value in var_fill:
+        var_values[np.isin(var_raw, np.asarray(var_fill_value, dtype=var_raw.dtype))] = np.nan
+    if var_scale is not None:
+        var_values = var_values * var_scale
+    if var_offset is not None:
+        var_values = var_values + var_offset
+    return var_values
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to read file settings (file name or decompressed bytes)
 def read_file_nc(file_name, var_name='Discharge', var_ratio_factor=1):
-    if os.path.exists(file_name):
-        file_dset = xr.open_mfdataset(file_name, decode_times=False)
-        data_var = np.flipud(file_dset[var_name].values)
+    if isinstance(file_name, (bytes, bytearray)) or os.path.exists(file_name):
+        var_raw, var_attrs = read_var_nc(file_name, var_name)
+        data_var = np.flipud(decode_var_nc(var_raw, var_attrs))
         data_var = data_var / var_ratio_factor
     else:
         log_stream.warning(' ===> File "' + file_name + '" not found')
         data_var = None
     return data_var
 # -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to read file netcdf selecting the cells only (file name or decompressed bytes)
+# (the cells are read from the variable in the bounding box of the selected rows and columns, the grid is
+# never decoded, flipped or flattened; for networks covering the whole domain the box is close to the full grid)
+def read_file_nc_select(file_obj, file_idx, var_name='Discharge', var_ratio_factor=1):
+
+    # check file availability
+    if not isinstance(file_obj, (bytes, bytearray)) and not os.path.exists(file_obj):
+        log_stream.warning(' ===> File "' + file_obj + '" not found')
+        return None
+
+    # read raw values of the cells from memory or from file
+    var_raw, var_attrs = read_var_nc(file_obj, var_name, file_idx=file_idx)
+
+    # decode the cells (fill and missing values to nan)
+    data_var = decode_var_nc(var_raw, var_attrs) / var_ratio_factor
+
+    return data_var
+# -------------------------------------------------------------------------------------
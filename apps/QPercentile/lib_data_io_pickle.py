@@ -13,6 +13,7 @@ import os
 import pickle
 
 from lib_info_args import logger_name
+from lib_data_io_workspace import check_workspace, read_workspace, write_workspace
 
 # Logging
 log_stream = logging.getLogger(logger_name)
@@ -20,10 +21,16 @@ log_stream = logging.getLogger(logger_name)
 
 
 # -------------------------------------------------------------------------------------
-# Method to read data obj
-def read_obj(file_name):
+# Method to read data obj (workspace or pickle format; variable selected only if defined; workspace arrays
+# mapped in memory if requested)
+def read_obj(file_name, var_name=None, file_mmap=False):
     if os.path.exists(file_name):
-        data = pickle.load(open(file_name, "rb"))
+        if check_workspace(file_name):
+            data = read_workspace(file_name, var_name=var_name, file_mmap=file_mmap)
+        else:
+            data = pickle.load(open(file_name, "rb"))
+            if var_name is not None:
+                data = data[var_name]
     else:
         data = None
     return data
@@ -31,11 +38,17 @@ def read_obj(file_name):
 
 
 # -------------------------------------------------------------------------------------
-# Method to write data obj
-def write_obj(file_name, data):
-    if os.path.exists(file_name):
-        os.remove(file_name)
-    with open(file_name, 'wb') as handle:
-        pickle.dump(data, handle, protocol=pickle.HIGHEST_PROTOCOL)
+# Method to write data obj (workspace or pickle format)
+def write_obj(file_name, data, file_format='workspace'):
+    if file_format == 'workspace':
+        write_workspace(file_name, data)
+    elif file_format == 'pickle':
+        if os.path.exists(file_name):
+            os.remove(file_name)
+        with open(file_name, 'wb') as handle:
+            pickle.dump(data, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    else:
+        log_stream.error(' ===> Obj format "' + file_format + '" is not supported')
+        raise NotImplementedError('Case not implemented yet')
 # -------------------------------------------------------------------------------------
 
@@ -9,6 +9,7 @@ Version:       '1.0.0'
 # -------------------------------------------------------------------------------------
 # Library
 import os
+import re
 import logging
 
 from copy import deepcopy
@@ -18,6 +19,13 @@ from lib_info_args import logger_name
 
 # Logging
 log_stream = logging.getLogger(logger_name)
+
+# Template(s) compiled and datetime string(s) (cached for the run)
+tags2string_compiled = {}
+tags2string_datetime = {}
+tags2string_datetime_max = 100000
+# Folder index of the available file(s) (cached for the run)
+file_index = {}
 # -------------------------------------------------------------------------------------
 
 
@@ -32,7 +40,69 @@ def slice_list(source, step):
 # Method to make folder
 def make_folder(path_folder):
     if not os.path.exists(path_folder):
-        os.makedirs(path_folder)
+        os.makedirs(path_folder, exist_ok=True)
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to list a folder once (file name -> directory entry) and keep it for the run
+def index_folder(folder_name, refresh=False):
+
+    folder_name = os.path.abspath(folder_name)
+    if refresh or (folder_name not in file_index):
+        folder_entries = {}
+        try:
+            with os.scandir(folder_name) as folder_handle:
+                for folder_entry in folder_handle:
+                    folder_entries[folder_entry.name] = folder_entry
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            pass
+        file_index[folder_name] = folder_entries
+
+    return file_index[folder_name]
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to get the stat of a file using the folder index (None if the file is not available)
+def stat_file(file_path, refresh=False):
+
+    folder_name, file_name = os.path.split(os.path.abspath(file_path))
+    folder_entry = index_folder(folder_name, refresh=refresh).get(file_name, None)
+
+    if folder_entry is not None:
+        try:
+            if folder_entry.is_file():
+                return folder_entry.stat()
+        except (FileNotFoundError, PermissionError):
+            pass
+    return None
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to check if a file is available using the folder index
+def exists_file(file_path, refresh=False):
+
+    folder_name, file_name = os.path.split(os.path.abspath(file_path))
+    folder_entry = index_folder(folder_name, refresh=refresh).get(file_name, None)
+
+    if folder_entry is not None:
+        try:
+            return folder_entry.is_file()
+        except PermissionError:
+            pass
+    return False
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to refresh the folder index (all the folders or the folder of the given path)
+def refresh_file_index(folder_name=None):
+    if folder_name is None:
+        file_index.clear()
+    else:
+        file_index.pop(os.path.abspath(folder_name), None)
 # -------------------------------------------------------------------------------------
 
 
@@ -63,8 +133,140 @@ def join_path(folder_name, file_name):
 
 
 # -------------------------------------------------------------------------------------
-# Method to add format(s) string (path or filename)
-def fill_tags2string(string_raw, tags_format=None, tags_filling=None, tags_template='[TMPL_TAG_{:}]'):
+# Method to add format(s) string (path or filename) using the compiled template(s)
+def fill_tags2string(string_raw, tags_format=None, tags_filling=None):
+
+    string_compiled = compile_tags2string(string_raw, tags_format)
+
+    if string_compiled['mode'] == 'raw':
+        return string_raw
+    elif string_compiled['mode'] == 'replace':
+        return replace_tags2string(string_raw, tags_format, tags_filling)
+    else:
+        return render_tags2string(string_compiled, tags_filling)
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to compile a string in literal and tag segments (parsed once and cached)
+def compile_tags2string(string_raw, tags_format=None):
+
+    try:
+        string_key = (string_raw, tuple(tags_format.items()))
+        if string_key in tags2string_compiled:
+            return tags2string_compiled[string_key]
+    except TypeError:
+        string_key = None
+
+    string_mode, string_segments, string_tags = 'raw', [], []
+    if string_raw is not None:
+        for tag in list(tags_format.keys()):
+            if tag in string_raw:
+                string_mode = 'compiled'
+                break
+
+    if string_mode == 'compiled':
+
+        for tag_key, tag_format in tags_format.items():
+            if (tag_format is not None) and ('{' + tag_key + '}' in string_raw):
+                string_tags.append((tag_key, tag_format))
+
+        if string_tags:
+            string_pattern = re.compile('(' + '|'.join(
+                [re.escape('{' + tag_key + '}') for tag_key, tag_format in
+                 sorted(string_tags, key=lambda tag: len(tag[0]), reverse=True)]) + ')')
+            string_tags_idx = {'{' + tag_key + '}': tag_id for tag_id, (tag_key, tag_format) in enumerate(string_tags)}
+            for string_part in string_pattern.split(string_raw):
+                if string_part in string_tags_idx:
+                    string_segments.append(string_tags_idx[string_part])
+                elif string_part:
+                    string_segments.append(string_part)
+
+            # the replace passes are kept if the tag keys overlap each other or the literal segments
+            string_literals = [string_part for string_part in string_segments if isinstance(string_part, str)]
+            for tag_id, (tag_key, tag_format) in enumerate(string_tags):
+                tag_text = tag_key
+                if '{' in tag_text or any([tag_text in string_part for string_part in string_literals]):
+                    string_mode = 'replace'
+                for tag_id_other, (tag_key_other, tag_format_other) in enumerate(string_tags):
+                    tag_text_other = tag_key_other
+                    if (tag_id != tag_id_other) and (tag_text in tag_text_other):
+                        string_mode = 'replace'
+        else:
+            string_mode = 'replace'
+
+    string_compiled = {'mode': string_mode, 'segments': string_segments, 'tags': string_tags}
+    if string_key is not None:
+        tags2string_compiled[string_key] = string_compiled
+
+    return string_compiled
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to render a compiled string (list values are rendered at once in a list of strings)
+def render_tags2string(string_compiled, tags_filling=None):
+
+    string_segments, string_tags = string_compiled['segments'], string_compiled['tags']
+
+    dim_max = 1
+    for tags_filling_values_tmp in tags_filling.values():
+        if isinstance(tags_filling_values_tmp, list):
+            dim_tmp = tags_filling_values_tmp.__len__()
+            if dim_tmp > dim_max:
+                dim_max = dim_tmp
+
+    tag_values = []
+    for tag_key, tag_format in string_tags:
+        if tag_key in list(tags_filling.keys()):
+            tag_filling = tags_filling[tag_key]
+            if isinstance(tag_filling, list):
+                tag_values.append([format_tag2string(tag_key, tag_format, tag_filling[string_id])
+                                   for string_id in range(dim_max)])
+            else:
+                tag_values.append([format_tag2string(tag_key, tag_format, tag_filling)] * dim_max)
+        else:
+            tag_values.append(['{' + tag_key + '}'] * dim_max)
+
+    string_filled_out = []
+    for string_id in range(dim_max):
+        string_filled_step = ''.join([string_part if isinstance(string_part, str) else
+                                      tag_values[string_part][string_id] for string_part in string_segments])
+        string_filled_out.append(string_filled_step.replace('//', '/'))
+
+    if dim_max == 1:
+        string_filled_out = string_filled_out[0]
+
+    return string_filled_out
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to format a tag value
+def format_tag2string(tag_key, tag_format, tag_value):
+    if isinstance(tag_value, datetime):
+        return format_datetime2string(tag_value, tag_format)
+    if isinstance(tag_value, (float, int)):
+        return tag_key.format(tag_value)
+    return tag_value
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to format a datetime (cached for the run)
+def format_datetime2string(time_value, time_format):
+    time_key = (time_value, time_format)
+    if time_key not in tags2string_datetime:
+        if tags2string_datetime.__len__() >= tags2string_datetime_max:
+            tags2string_datetime.clear()
+        tags2string_datetime[time_key] = time_value.strftime(time_format)
+    return tags2string_datetime[time_key]
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to add format(s) string (path or filename) using the replace passes
+def replace_tags2string(string_raw, tags_format=None, tags_filling=None, tags_template='[TMPL_TAG_{:}]'):
 
     apply_tags = False
     if string_raw is not None:
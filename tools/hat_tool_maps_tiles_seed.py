@@ -0,0 +1,101 @@
+"""
+HAT Analysis Tool - Maps background tiles cache seeding
+
+__date__ = '20261018'
+__version__ = '1.0.0'
+__author__ =
+        'Fabio Delogu (fabio.delogu@cimafoundation.org)',
+
+__library__ = 'HAT'
+
+General command line:
+python3 hat_tool_maps_tiles_seed.py -cache_folder /path/to/tiles -extent lon_w lon_e lat_s lat_n -zoom 8
+    [-cache_size 512] [-provider osm] [-log_file hat_tool_maps_tiles_seed.txt]
+
+Version(s):
+20261018 (1.0.0) --> Beta release (fill the tiles cache used by the maps publisher for a domain bounding box)
+"""
+# -------------------------------------------------------------------------------------
+
+# -------------------------------------------------------------------------------------
+# Complete library
+import logging
+import os
+import sys
+import time
+from argparse import ArgumentParser
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'apps', 'Analyzer_Datasets', 'maps'))
+import lib_img_tiles as cimgt_custom
+from lib_utils_logging import set_logging_file
+from lib_info_args import logger_name
+# -------------------------------------------------------------------------------------
+
+# -------------------------------------------------------------------------------------
+# Algorithm information
+alg_name = 'HAT ANALYSIS TOOL - MAPS TILES SEED'
+alg_version = '1.0.0'
+alg_release = '2026-10-18'
+# Algorithm logging
+alg_logger_file = 'hat_tool_maps_tiles_seed.txt'
+# Algorithm parameter(s)
+tiles_provider = {'osm': cimgt_custom.OSM}
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Script Main
+def main():
+
+    # get algorithm settings
+    cache_folder, cache_size, extent, zoom_list, provider, logger_file = get_args()
+
+    # set logging
+    set_logging_file(logger_name=logger_name, logger_file=logger_file)
+    log_stream = logging.getLogger(logger_name)
+
+    # info algorithm
+    log_stream.info(' ==> ' + alg_name + ' (Version: ' + alg_version + ' Release_Date: ' + alg_release + ')')
+    log_stream.info(' ==> Provider: "' + provider + '" -- Extent: ' + str(extent) + ' -- Zoom: ' + str(zoom_list))
+    start_time = time.time()
+
+    if provider not in list(tiles_provider.keys()):
+        log_stream.error(' ===> Tiles provider "' + provider + '" is not supported')
+        raise NotImplementedError('Case not implemented yet')
+
+    # seed tiles cache (size in MB)
+    if cache_size is not None:
+        cache_size = int(cache_size * 1024 * 1024)
+    map_background = tiles_provider[provider](cache_folder=cache_folder, cache_size_max=cache_size)
+    tiles_counts = map_background.seed_cache(extent, zoom_list)
+
+    log_stream.info(' ===> Tiles cached: ' + str(tiles_counts['cached']) +
+                    ' -- downloaded: ' + str(tiles_counts['downloaded']) +
+                    ' -- failed: ' + str(tiles_counts['failed']))
+    log_stream.info(' ==> TIME ELAPSED: ' + str(round(time.time() - start_time, 1)) + ' seconds')
+
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to get script argument(s)
+def get_args():
+    parser_handle = ArgumentParser()
+    parser_handle.add_argument('-cache_folder', action="store", dest="cache_folder", required=True)
+    parser_handle.add_argument('-cache_size', action="store", dest="cache_size", type=float, default=None)
+    parser_handle.add_argument('-extent', action="store", dest="extent", type=float, nargs=4, required=True)
+    parser_handle.add_argument('-zoom', action="store", dest="zoom", type=int, nargs='+', default=[8])
+    parser_handle.add_argument('-provider', action="store", dest="provider", default='osm')
+    parser_handle.add_argument('-log_file', action="store", dest="log_file", default=alg_logger_file)
+    parser_values = parser_handle.parse_args()
+
+    return (parser_values.cache_folder, parser_values.cache_size,
+            parser_values.extent, parser_values.zoom, parser_values.provider, parser_values.log_file)
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Call script from external library
+if __name__ == "__main__":
+    main()
+# -------------------------------------------------------------------------------------
@@ -0,0 +1,152 @@
+"""
+HAT Analysis Tool - Q2T return period benchmark
+
+__date__ = '20261018'
+__version__ = '1.0.0'
+__author__ =
+        'Fabio Delogu (fabio.delogu@cimafoundation.org)',
+
+__library__ = 'HAT'
+
+General command line:
+python3 hat_tool_q2t_benchmark.py -grid_size 2000 -repeat 3 [-log_file hat_tool_q2t_benchmark.txt]
+
+Version(s):
+20261018 (1.0.0) --> Beta release (compare compute_q2t with the previous genextreme based method)
+"""
+# -------------------------------------------------------------------------------------
+
+# -------------------------------------------------------------------------------------
+# Complete library
+import logging
+import os
+import sys
+import time
+from argparse import ArgumentParser
+
+import numpy as np
+from scipy.stats import genextreme
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'apps', 'Q2T'))
+# logging library of the publishers (appended to keep the Q2T modules first)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             '..', 'apps', 'Analyzer_Datasets', 'time_series'))
+from lib_data_analysis import compute_q2t
+from lib_utils_logging import set_logging_file
+from lib_info_args import logger_name
+# -------------------------------------------------------------------------------------
+
+# -------------------------------------------------------------------------------------
+# Algorithm information
+alg_name = 'HAT ANALYSIS TOOL - Q2T BENCHMARK'
+alg_version = '1.0.0'
+alg_release = '2026-10-18'
+# Algorithm logging
+alg_logger_file = 'hat_tool_q2t_benchmark.txt'
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Script Main
+def main():
+
+    # get algorithm settings
+    grid_size, repeat, seed, logger_file = get_args()
+
+    # set logging
+    set_logging_file(logger_name=logger_name, logger_file=logger_file)
+    log_stream = logging.getLogger(logger_name)
+
+    # info algorithm
+    log_stream.info(' ==> ' + alg_name + ' (Version: ' + alg_version + ' Release_Date: ' + alg_release + ')')
+    log_stream.info(' ==> Grid: ' + str(grid_size) + 'x' + str(grid_size) + ' -- Repeat: ' + str(repeat))
+
+    # create synthetic datasets
+    q_data, q_index, statistics_params, geo_area = create_synthetic_data(grid_size, seed=seed)
+
+    # run methods
+    time_ref, t_ref = run_method(compute_q2t_reference, q_data, q_index, statistics_params, geo_area, repeat)
+    time_new, t_new = run_method(compute_q2t, q_data, q_index, statistics_params, geo_area, repeat,
+                                 no_data_t=np.nan)
+
+    # check results
+    nan_match = np.array_equal(np.isnan(t_ref), np.isnan(t_new))
+    diff_max = np.nanmax(np.abs(t_ref - t_new) / np.maximum(np.abs(t_ref), 1.0))
+
+    log_stream.info(' ===> Reference (genextreme): ' + '{:.3f}'.format(time_ref) + ' [s]')
+    log_stream.info(' ===> Kernel (closed form): ' + '{:.3f}'.format(time_new) + ' [s]')
+    log_stream.info(' ===> Speed-up: ' + '{:.1f}'.format(time_ref / time_new) + 'x')
+    log_stream.info(' ===> NaN mask match: ' + str(nan_match) +
+                    ' -- Max relative difference: ' + '{:.2e}'.format(diff_max))
+
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to run a method and get the best time
+def run_method(fx_method, q_data, q_index, statistics_params, geo_area, repeat, **kwargs):
+    time_best, t_data = None, None
+    for i in range(repeat):
+        time_start = time.perf_counter()
+        t_data = fx_method(q_data, q_index, statistics_params, geo_area, **kwargs)
+        time_elapsed = time.perf_counter() - time_start
+        if time_best is None or time_elapsed < time_best:
+            time_best = time_elapsed
+    return time_best, t_data
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to compute T(Q) using genextreme over the whole grid (previous method)
+def compute_q2t_reference(q_data, q_index, statistics_params, geo_area, no_data_t=-9999, max_value_t=500):
+
+    shape, scale, location = statistics_params[0, 0], statistics_params[0, 1], statistics_params[0, 2]
+
+    kt = np.zeros(shape=[q_index.shape[0], q_index.shape[1]])
+    kt[:, :] = q_data/q_index
+    kt[kt < 0.0] = 0.0
+    P = genextreme.cdf(kt, -shape, location, scale)
+
+    T = np.zeros(shape=[kt.shape[0], kt.shape[1]])
+    T[:, :] = 1.0 / (1.0 - P)
+    T[geo_area < 1.0] = np.nan
+    T[T > max_value_t] = max_value_t
+
+    return T
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to create synthetic datasets
+def create_synthetic_data(grid_size, seed=1):
+
+    generator = np.random.default_rng(seed)
+
+    q_index = generator.uniform(0.5, 150.0, size=(grid_size, grid_size))
+    q_data = q_index * generator.gamma(1.5, 0.8, size=(grid_size, grid_size))
+    geo_area = generator.uniform(0.0, 4.0, size=(grid_size, grid_size))
+    statistics_params = np.array([[0.12, 0.35, 0.85]])
+
+    return q_data, q_index, statistics_params, geo_area
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to get script argument(s)
+def get_args():
+    parser_handle = ArgumentParser()
+    parser_handle.add_argument('-grid_size', action="store", dest="grid_size", type=int, default=2000)
+    parser_handle.add_argument('-repeat', action="store", dest="repeat", type=int, default=3)
+    parser_handle.add_argument('-seed', action="store", dest="seed", type=int, default=1)
+    parser_handle.add_argument('-log_file', action="store", dest="log_file", default=alg_logger_file)
+    parser_values = parser_handle.parse_args()
+
+    return parser_values.grid_size, parser_values.repeat, parser_values.seed, parser_values.log_file
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Call script from external library
+if __name__ == "__main__":
+    main()
+# -------------------------------------------------------------------------------------
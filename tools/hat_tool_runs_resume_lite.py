@@ -48,6 +48,8 @@ alg_version = '1.3.0'
 alg_release = '2023-08-31'
 # Algorithm parameter(s)
 time_format = '%Y%m%d%H%M'
+# Folder index of the available file(s) (cached for the run)
+file_index = {}
 
 
 # -------------------------------------------------------------------------------------
@@ -509,17 +511,18 @@ def public_online_gdrive(url,api_key, models_check, runs_check, time_run):
 # -------------------------------------------------------------------------------------
 # Function to check the run END lockfile
 def check_run_state(start_lock_file, end_lock_file):
-    if os.path.isfile(start_lock_file) and os.path.isfile(end_lock_file):
+    start_lock_stat, end_lock_stat = stat_file(start_lock_file), stat_file(end_lock_file)
+    if start_lock_stat is not None and end_lock_stat is not None:
         out_string = "Has run"
-        time_start = datetime.utcfromtimestamp(os.stat(start_lock_file).st_mtime).strftime("%Y-%m-%d %H:%M")
-        time_end_value = datetime.utcfromtimestamp(os.stat(end_lock_file).st_mtime)
+        time_start = datetime.utcfromtimestamp(start_lock_stat.st_mtime).strftime("%Y-%m-%d %H:%M")
+        time_end_value = datetime.utcfromtimestamp(end_lock_stat.st_mtime)
         time_end = time_end_value.strftime("%Y-%m-%d %H:%M")
-    elif os.path.isfile(start_lock_file) and not os.path.isfile(end_lock_file):
+    elif start_lock_stat is not None and end_lock_stat is None:
         out_string = "Is running"
-        time_start = datetime.utcfromtimestamp(os.stat(start_lock_file).st_mtime).strftime("%Y-%m-%d %H:%M")
+        time_start = datetime.utcfromtimestamp(start_lock_stat.st_mtime).strftime("%Y-%m-%d %H:%M")
         time_end = " "
         time_end_value = None
-    elif not os.path.isfile(start_lock_file) and not os.path.isfile(end_lock_file):
+    elif start_lock_stat is None and end_lock_stat is None:
         out_string = "Has not run"
         time_start = " "
         time_end = " "
@@ -561,9 +564,9 @@ def check_run_condition(time_end_value, eta_value):
 # -------------------------------------------------------------------------------------
 # Function to check the contitional probabilistic runs
 def check_conditional_probabilistic_runs(active_lock, notactive_lock):
-    if os.path.isfile(active_lock) and not os.path.isfile(notactive_lock):
+    if exists_file(active_lock) and not exists_file(notactive_lock):
         status = "active"
-    elif os.path.isfile(notactive_lock) and not os.path.isfile(active_lock):
+    elif exists_file(notactive_lock) and not exists_file(active_lock):
         status = "not active"
     else:
         status = "unknown"
@@ -572,6 +575,55 @@ def check_conditional_probabilistic_runs(active_lock, notactive_lock):
 # -------------------------------------------------------------------------------------
 # -------------------------------------------------------------------------------------
 
+# -------------------------------------------------------------------------------------
+# Function to list a folder once (file name -> directory entry) and keep it for the run
+def index_folder(folder_name, refresh=False):
+
+    folder_name = os.path.abspath(folder_name)
+    if refresh or (folder_name not in file_index):
+        folder_entries = {}
+        try:
+            with os.scandir(folder_name) as folder_handle:
+                for folder_entry in folder_handle:
+                    folder_entries[folder_entry.name] = folder_entry
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            pass
+        file_index[folder_name] = folder_entries
+
+    return file_index[folder_name]
+# -------------------------------------------------------------------------------------
+
+# -------------------------------------------------------------------------------------
+# Function to get the stat of a file using the folder index (None if the file is not available)
+def stat_file(file_path, refresh=False):
+
+    folder_name, file_name = os.path.split(os.path.abspath(file_path))
+    folder_entry = index_folder(folder_name, refresh=refresh).get(file_name, None)
+
+    if folder_entry is not None:
+        try:
+            if folder_entry.is_file():
+                return folder_entry.stat()
+        except (FileNotFoundError, PermissionError):
+            pass
+    return None
+# -------------------------------------------------------------------------------------
+
+# -------------------------------------------------------------------------------------
+# Function to check if a file is available using the folder index
+def exists_file(file_path, refresh=False):
+
+    folder_name, file_name = os.path.split(os.path.abspath(file_path))
+    folder_entry = index_folder(folder_name, refresh=refresh).get(file_name, None)
+
+    if folder_entry is not None:
+        try:
+            return folder_entry.is_file()
+        except PermissionError:
+            pass
+    return False
+# -------------------------------------------------------------------------------------
+
 # -------------------------------------------------------------------------------------
 # Function to fill a time template
 def fill_time_template(empty_template, time_now):
@@ -590,7 +642,7 @@ def check_last_realtime_model(file_template, empty_template, length_check=24, fr
     for time_check in time_to_check:
         filled_template = fill_time_template(empty_template, time_check)
         file_now = file_template.format(**filled_template)
-        if os.path.isfile(file_now):
+        if exists_file(file_now):
             last_available = time_check
             break
 
@@ -610,8 +662,9 @@ def check_last_realtime_model(file_template, empty_template, length_check=24, fr
 def check_forecast_availability(file_now, eta_value):
     time_now_utc = datetime.now() #(timezone.utc)
 
-    if os.path.isfile(file_now):
-        last_mod = os.path.getmtime(file_now)
+    file_stat = stat_file(file_now)
+    if file_stat is not None:
+        last_mod = file_stat.st_mtime
         out_string = "OK! Model is available at " + datetime.utcfromtimestamp(last_mod).strftime("%Y-%m-%d %H:%M")
     else:
         if eta_value is None:
@@ -0,0 +1,136 @@
+"""
+HAT Analysis Tool - Section drainage area check
+
+__date__ = '20261018'
+__version__ = '1.0.0'
+__author__ =
+        'Fabio Delogu (fabio.delogu@cimafoundation.org)',
+
+__library__ = 'HAT'
+
+General command line:
+python3 hat_tool_section_area_check.py -settings_file hat_runpublisher_hmc_timeseries_example.json
+    [-workers 1] [-tolerance 0.1]
+
+Version(s):
+20261018 (1.0.0) --> Beta release (compare the flow accumulation areas with the pysheds catchment areas)
+"""
+# -------------------------------------------------------------------------------------
+
+# -------------------------------------------------------------------------------------
+# Complete library
+import logging
+import os
+import sys
+import time
+import json
+from argparse import ArgumentParser
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'apps', 'Analyzer_Datasets', 'time_series'))
+from lib_data_geo_ascii import read_data_grid
+from lib_data_geo_shapefile import read_data_section
+from lib_utils_geo import compute_section_area, compute_section_area_accumulation
+from driver_data_io_static import DriverStatic
+from lib_utils_logging import set_logging_file
+from lib_info_args import logger_name
+# -------------------------------------------------------------------------------------
+
+# -------------------------------------------------------------------------------------
+# Algorithm information
+alg_name = 'HAT ANALYSIS TOOL - SECTION AREA CHECK'
+alg_version = '1.0.0'
+alg_release = '2026-10-18'
+# Algorithm logging
+alg_logger_file = 'hat_tool_section_area_check.txt'
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Script Main
+def main():
+
+    # get algorithm settings
+    settings_file, workers, tolerance = get_args()
+
+    with open(settings_file) as file_handle:
+        data_settings = json.load(file_handle)
+
+    # set logging (in the log folder of the settings file)
+    set_logging_file(
+        logger_name=logger_name,
+        logger_file=os.path.join(data_settings['log']['folder_name'], alg_logger_file))
+    log_stream = logging.getLogger(logger_name)
+
+    # info algorithm
+    log_stream.info(' ==> ' + alg_name + ' (Version: ' + alg_version + ' Release_Date: ' + alg_release + ')')
+
+    # get static file paths
+    driver_data_static = DriverStatic(
+        src_dict=data_settings['data']['static']['source'],
+        dst_dict=data_settings['data']['static']['destination'],
+        alg_info=data_settings['algorithm']['info'],
+        alg_template=data_settings['algorithm']['template'],
+        flag_cleaning_static=False)
+
+    # read static datasets
+    da_terrain = read_data_grid(driver_data_static.file_path_terrain_src,
+                                var_limit_min=0, var_limit_max=None, output_format='data_array')
+    da_flow_directions = read_data_grid(driver_data_static.file_path_flow_directions_src,
+                                        var_limit_min=0, var_limit_max=9, output_format='data_array')
+    df_section = read_data_section(driver_data_static.file_path_section_src,
+                                   file_filter=driver_data_static.file_filter_section_src)
+
+    # compute section areas
+    time_start = time.perf_counter()
+    df_section_catchment = compute_section_area(
+        da_flow_directions, terrain_da=da_terrain, section_dframe=df_section.copy(),
+        section_workers=workers)
+    time_catchment = time.perf_counter() - time_start
+
+    time_start = time.perf_counter()
+    df_section_accumulation = compute_section_area_accumulation(
+        da_flow_directions, terrain_da=da_terrain, section_dframe=df_section.copy())
+    time_accumulation = time.perf_counter() - time_start
+
+    # check section areas
+    area_catchment = df_section_catchment['section_drainage_area_cmp'].values
+    area_accumulation = df_section_accumulation['section_drainage_area_cmp'].values
+    area_diff = np.abs(area_catchment - area_accumulation)
+
+    for section_id, (section_domain, section_name) in enumerate(
+            zip(df_section['section_domain'].values, df_section['section_name'].values)):
+        if area_diff[section_id] > tolerance:
+            log_stream.warning(' ===> Section "' + section_domain + ':' + section_name + '" -- Catchment: ' +
+                               str(area_catchment[section_id]) +
+                               ' -- Accumulation: ' + str(area_accumulation[section_id]))
+
+    log_stream.info(' ===> Sections: ' + str(df_section.shape[0]) +
+                    ' -- Mismatch (> ' + str(tolerance) + '): ' + str(int(np.sum(area_diff > tolerance))) +
+                    ' -- Max difference: ' + str(np.nanmax(area_diff)))
+    log_stream.info(' ===> Catchment: ' + '{:.3f}'.format(time_catchment) + ' [s]' +
+                    ' -- Accumulation: ' + '{:.3f}'.format(time_accumulation) + ' [s]')
+
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Method to get script argument(s)
+def get_args():
+    parser_handle = ArgumentParser()
+    parser_handle.add_argument('-settings_file', action="store", dest="settings_file", required=True)
+    parser_handle.add_argument('-workers', action="store", dest="workers", type=int, default=1)
+    parser_handle.add_argument('-tolerance', action="store", dest="tolerance", type=float, default=0.1)
+    parser_values = parser_handle.parse_args()
+
+    return parser_values.settings_file, parser_values.workers, parser_values.tolerance
+# -------------------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------------------
+# Call script from external library
+if __name__ == "__main__":
+    main()
+# -------------------------------------------------------------------------------------